@@ -0,0 +1,265 @@
+"""
+Statistical analytics over the task x model results matrix (analytics.json)
+
+The leaderboard reports point success rates. This module precomputes their
+uncertainty, so the frontend never resamples anything itself:
+
+- models: success rate with a bootstrap confidence interval, overall and per
+  domain (site)
+- pairs: for every pair of models, the rate difference with a paired
+  bootstrap interval and p-value, and an exact McNemar test on the tasks both
+  models scored (with Holm-adjusted p-values across all pairs)
+
+The bootstrap resamples tasks (rows of the matrix) with replacement. One
+resample is a vector of per-task draw counts, so the successes and totals
+of every model in a resample come out of a matrix product: counts
+[resamples, tasks] @ [passed | scored] [tasks, 2 * models]. Rows are
+grouped by domain and each group is multiplied separately, which gives
+the per-domain sums for the cost of the overall ones. Resamples are
+computed in chunks of BOOTSTRAP_CHUNK, optionally over a process pool.
+Every chunk has its own seed derived from BOOTSTRAP_SEED, so the output
+does not depend on the number of workers.
+
+Only scored results (pass or fail) enter the rates and tests; a result
+without a usable success flag is treated like a missing one. A model with
+no scored results gets null rates and no significant pairs.
+
+normalize_data.py writes analytics.json on every run; it can also be
+rebuilt from the tasks.json, results.json and heatmap_data.json already in
+the output directory:
+    python scripts/analytics.py --resamples 10000 --workers 4
+
+Tests: python -m unittest scripts/test_analytics.py
+"""
+
+import argparse
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from results_matrix import ResultsMatrix
+
+ANALYTICS_FILE = "analytics.json"
+OUTPUT_DIR = Path("web/public/data")
+ANALYTICS_VERSION = 1
+BOOTSTRAP_RESAMPLES = 10000
+BOOTSTRAP_CHUNK = 250
+BOOTSTRAP_SEED = 0
+CONFIDENCE = 95
+ALPHA = 0.05
+
+# Columns and group bounds of the worker processes (see _init_worker)
+_columns = None
+_bounds = None
+
+def _init_worker(columns, bounds):
+    global _columns, _bounds
+    _columns, _bounds = columns, bounds
+
+def resample_sums(columns, bounds, size, seed):
+    """Per-group column sums of `size` bootstrap resamples of the rows.
+
+    Rows [bounds[g], bounds[g + 1]) form group g. Returns an array of shape
+    [size, groups, columns].
+    """
+    n = columns.shape[0]
+    rng = np.random.default_rng(seed)
+    draws = rng.integers(0, n, size=(size, n), dtype=np.int32)
+    # Draw counts per (resample, row), via one bincount over offset indices
+    offsets = (np.arange(size) * n)[:, None]
+    counts = np.bincount((draws + offsets).ravel(), minlength=size * n).reshape(size, n).astype(np.float32)
+    return np.stack([counts[:, start:end] @ columns[start:end] for start, end in zip(bounds, bounds[1:])], axis=1)
+
+def _resample_chunk(job):
+    size, seed = job
+    return resample_sums(_columns, _bounds, size, seed)
+
+def bootstrap_sums(columns, bounds, resamples=BOOTSTRAP_RESAMPLES, seed=BOOTSTRAP_SEED, workers=1):
+    """[resamples, groups, columns] sums over task resamples, optionally in parallel"""
+    sizes = [min(BOOTSTRAP_CHUNK, resamples - start) for start in range(0, resamples, BOOTSTRAP_CHUNK)]
+    jobs = list(zip(sizes, np.random.SeedSequence(seed).spawn(len(sizes))))
+    if workers <= 1 or len(jobs) <= 1:
+        chunks = [resample_sums(columns, bounds, size, chunk_seed) for size, chunk_seed in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(columns, bounds)) as pool:
+            chunks = list(pool.map(_resample_chunk, jobs))
+    return np.concatenate(chunks)
+
+def percent_rates(successes, totals):
+    """successes / totals * 100, NaN where totals is 0"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(totals > 0, successes / totals * 100, np.nan)
+
+def interval(samples):
+    """Central CONFIDENCE% percentile interval of each column (NaNs ignored)"""
+    tail = (100 - CONFIDENCE) / 2
+    lo = np.full(samples.shape[1], np.nan)
+    hi = np.full(samples.shape[1], np.nan)
+    finite = np.isfinite(samples)
+    # np.percentile is vectorized; nanpercentile only for columns with NaNs
+    complete = finite.all(axis=0)
+    partial = finite.any(axis=0) & ~complete
+    if complete.any():
+        lo[complete], hi[complete] = np.percentile(samples[:, complete], [tail, 100 - tail], axis=0)
+    if partial.any():
+        lo[partial], hi[partial] = np.nanpercentile(samples[:, partial], [tail, 100 - tail], axis=0)
+    return lo, hi
+
+def round_rate(value):
+    return None if not np.isfinite(value) else round(float(value), 1)
+
+def round_p(value):
+    """p-values to 3 significant digits"""
+    return None if not np.isfinite(value) else float(f"{value:.3g}")
+
+def mcnemar_p(only_a, only_b):
+    """Exact two-sided McNemar p-values for arrays of discordant pair counts"""
+    n = only_a + only_b
+    k = np.minimum(only_a, only_b)
+    log_factorial = np.concatenate([[0.0], np.cumsum(np.log(np.arange(1, int(n.max(initial=0)) + 1)))])
+    p = np.ones(len(n))
+    for i in np.flatnonzero(n):
+        ks = np.arange(k[i] + 1)
+        log_pmf = log_factorial[n[i]] - log_factorial[ks] - log_factorial[n[i] - ks] - n[i] * math.log(2)
+        p[i] = min(1.0, 2 * np.exp(log_pmf).sum())
+    return p
+
+def holm(p_values):
+    """Holm-Bonferroni adjusted p-values"""
+    order = np.argsort(p_values, kind='stable')
+    m = len(p_values)
+    adjusted = np.empty(m)
+    running = 0.0
+    for rank, i in enumerate(order):
+        running = max(running, min(1.0, (m - rank) * p_values[i]))
+        adjusted[i] = running
+    return adjusted
+
+def build_analytics(results_matrix, resamples=BOOTSTRAP_RESAMPLES, seed=BOOTSTRAP_SEED, workers=1):
+    """Build analytics.json from a ResultsMatrix"""
+    model_ids = results_matrix.model_ids
+    sites = results_matrix.sites
+    m, n_sites = len(model_ids), len(sites)
+
+    passed = results_matrix.passed
+    scored = results_matrix.scored
+
+    # Rows grouped by site code: group 0 holds the rows outside the suite
+    # (code -1, possibly empty), group g + 1 the rows of site g
+    codes = results_matrix.site_codes
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(-1, n_sites + 1)).tolist()
+    columns = np.hstack([passed, scored])[order].astype(np.float32)
+
+    observed = np.stack([columns[start:end].sum(axis=0) for start, end in zip(bounds, bounds[1:])])
+    sums = bootstrap_sums(columns, bounds, resamples, seed, workers)
+    # Sites: [groups, models]; overall: summed over all groups
+    obs_site_successes, obs_site_totals = observed[1:, :m], observed[1:, m:]
+    obs_successes, obs_totals = observed[:, :m].sum(axis=0), observed[:, m:].sum(axis=0)
+    site_rates = percent_rates(sums[:, 1:, :m], sums[:, 1:, m:]).reshape(resamples, n_sites * m)
+    rates = percent_rates(sums[:, :, :m].sum(axis=1), sums[:, :, m:].sum(axis=1))
+
+    rate_lo, rate_hi = interval(rates)
+    site_lo, site_hi = interval(site_rates)
+    obs_rates = percent_rates(obs_successes, obs_totals)
+
+    models = []
+    for j, model_id in enumerate(model_ids):
+        domains = {}
+        for g, site in enumerate(sites):
+            cell = g * m + j
+            total = int(obs_site_totals[g, j])
+            if total == 0:
+                continue
+            success = int(obs_site_successes[g, j])
+            domains[site] = {
+                "success": success,
+                "total": total,
+                "rate": round(success / total * 100, 1),
+                "ci": [round_rate(site_lo[cell]), round_rate(site_hi[cell])],
+            }
+        models.append({
+            "id": model_id,
+            "successes": int(obs_successes[j]),
+            "total": int(obs_totals[j]),
+            "rate": round_rate(obs_rates[j]),
+            "ci": [round_rate(rate_lo[j]), round_rate(rate_hi[j])],
+            "domains": domains,
+        })
+
+    # McNemar: discordant tasks of every pair from one product,
+    # only_a[i, j] = tasks model i passes and model j failed
+    failed = (scored & ~passed).astype(np.float32)
+    only_a = (passed.astype(np.float32).T @ failed).astype(np.int64)
+    pairs_i, pairs_j = np.triu_indices(m, k=1)
+    discordant_a, discordant_b = only_a[pairs_i, pairs_j], only_a[pairs_j, pairs_i]
+    p_mcnemar = mcnemar_p(discordant_a, discordant_b)
+    p_holm = holm(p_mcnemar)
+
+    pairs = []
+    for i in range(m):
+        # Paired bootstrap: both rates come from the same task resample
+        diffs = rates[:, [i]] - rates[:, i + 1:]
+        diff_lo, diff_hi = interval(diffs)
+        # Two-sided, with the (count + 1) / (resamples + 1) estimate so p is never 0
+        finite = np.isfinite(diffs).sum(axis=0)
+        with np.errstate(invalid='ignore'):
+            tail = np.minimum((diffs <= 0).sum(axis=0), (diffs >= 0).sum(axis=0))
+        p_bootstrap = np.where(finite > 0, np.minimum(1.0, 2 * (tail + 1) / (finite + 1)), np.nan)
+        for offset, j in enumerate(range(i + 1, m)):
+            pair = len(pairs)
+            pairs.append({
+                "a": model_ids[i],
+                "b": model_ids[j],
+                "rate_diff": round_rate(obs_rates[i] - obs_rates[j]),
+                "ci": [round_rate(diff_lo[offset]), round_rate(diff_hi[offset])],
+                "bootstrap_p": round_p(p_bootstrap[offset]),
+                "a_only": int(discordant_a[pair]),
+                "b_only": int(discordant_b[pair]),
+                "mcnemar_p": round_p(p_mcnemar[pair]),
+                "mcnemar_p_holm": round_p(p_holm[pair]),
+                "significant": bool(p_holm[pair] < ALPHA),
+            })
+
+    return {
+        "version": ANALYTICS_VERSION,
+        "resamples": resamples,
+        "confidence": CONFIDENCE,
+        "alpha": ALPHA,
+        "seed": seed,
+        "models": models,
+        "pairs": pairs,
+    }
+
+def write_analytics(output_dir, analytics):
+    with open(output_dir / ANALYTICS_FILE, 'w') as f:
+        json.dump(analytics, f, indent=2)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild analytics.json from the artifacts of a full run")
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR, help="Directory with the artifacts")
+    parser.add_argument("--resamples", type=int, default=BOOTSTRAP_RESAMPLES, help="Bootstrap resamples")
+    parser.add_argument("--workers", type=int, default=1, help="Bootstrap processes (0 = one per CPU)")
+    args = parser.parse_args(argv)
+    if args.resamples < 1:
+        parser.error("--resamples must be at least 1")
+
+    with open(args.output_dir / "tasks.json", 'r') as f:
+        tasks = json.load(f)
+    with open(args.output_dir / "results.json", 'r') as f:
+        results = json.load(f)
+    with open(args.output_dir / "heatmap_data.json", 'r') as f:
+        heatmap_data = json.load(f)
+    results_matrix = ResultsMatrix.from_artifacts(tasks, results, heatmap_data)
+    analytics = build_analytics(results_matrix, args.resamples, workers=args.workers or os.cpu_count() or 1)
+    write_analytics(args.output_dir, analytics)
+    significant = sum(pair['significant'] for pair in analytics['pairs'])
+    print(f"✓ Wrote {args.output_dir / ANALYTICS_FILE}: {len(analytics['models'])} models, "
+          f"{len(analytics['pairs'])} pairs ({significant} significant at {ALPHA})")
+
+if __name__ == "__main__":
+    main()
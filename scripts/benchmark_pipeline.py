@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Benchmark harness for the normalization pipeline
+
+Runs the stages of normalize_data.py against a trajectory tree and reports
+wall time, throughput and peak RSS for each one. Without --root a synthetic
+tree is generated first (see synth_trajectories.py) and removed afterwards.
+
+Stages:
+- load_tasks: read test.raw.json into a TaskIndex
+- list_jobs: walk the trajectory directories
+- extract: parse every trajectory file (cold, no extraction cache)
+- extract_warm: the same jobs against a populated cache (with --cache)
+- collect: fold job results into {model_id: {task_id: success}}
+- build_entries: tasks.json / results.json / models.json records
+- aggregate: results matrix, leaderboard, task difficulty and heatmap
+- analytics: bootstrap intervals and pairwise tests (analytics.json, not written)
+- clusters: task / model similarity orders (clusters.json, not written)
+- search_index: search_index.json
+- write: serialize every standard artifact to a scratch directory
+
+Peak RSS is per stage where the kernel allows resetting the high-water
+mark (Linux), otherwise it is the process high-water mark so far. Worker
+processes are reported separately as children_peak_rss_mb.
+
+Reports can be written with --json and compared with --compare; the exit
+status is 1 when any stage is slower than the baseline by more than
+--threshold.
+
+Usage:
+    python scripts/benchmark_pipeline.py
+    python scripts/benchmark_pipeline.py --tasks 10000 --agents 200 --workers 0
+    python scripts/benchmark_pipeline.py --root /tmp/synth --repeat 3 --json bench.json
+    python scripts/benchmark_pipeline.py --root /tmp/synth --compare bench.json
+    python scripts/benchmark_pipeline.py --root /tmp/synth --stream   # streaming writers
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from analytics import build_analytics
+from clustering import build_clusters
+from extraction_cache import ExtractionCache
+from normalize_data import (
+    MODEL_FORMATS, MODEL_NAME_MAP, build_heatmap_data, build_leaderboard,
+    build_model_entries, build_result_entries, build_task_difficulty, build_task_entries,
+    collect_model_jobs, collect_results, iter_result_entries, iter_task_difficulty,
+    iter_task_entries, list_extraction_jobs, run_extraction_jobs, write_outputs,
+)
+from profiling import StageTimer, environment, maxrss_mb
+from results_matrix import ResultsMatrix
+from search_index import build_search_index
+from synth_trajectories import AGENTS_FILE, add_generator_args, generate, generator_options
+from task_index import TaskIndex
+
+REPORT_VERSION = 1
+
+def synthetic_model_jobs(trajectories_dir, layout):
+    """(model_id, dir_path, jobs) for the agents of a synthetic tree"""
+    model_jobs = []
+    for agent in layout:
+        dir_path = trajectories_dir / agent["dir"]
+        # Synthetic formats are named after the model that uses them
+        jobs = list_extraction_jobs(dir_path, MODEL_FORMATS[agent["format"]])
+        model_jobs.append((agent["model_id"], dir_path, jobs))
+    return model_jobs
+
+def load_layout(data_dir):
+    """Agents of a synthetic tree, or None for a real one"""
+    layout_file = data_dir / AGENTS_FILE
+    if not layout_file.exists():
+        return None
+    with open(layout_file) as f:
+        return json.load(f)
+
+def list_jobs(data_dir, layout):
+    if layout is None:
+        return collect_model_jobs(data_dir / "trajectories")
+    return synthetic_model_jobs(data_dir / "trajectories", layout)
+
+def load_leaderboard(data_dir):
+    with open(data_dir / "leaderboard.json") as f:
+        return json.load(f)['leaderboard']
+
+def aggregate(models, all_results, task_index, stream=False):
+    results_matrix = ResultsMatrix.build(all_results, task_index)
+    leaderboard = build_leaderboard(models, all_results, results_matrix)
+    if stream:
+        task_difficulty = iter_task_difficulty(task_index, results_matrix)
+    else:
+        task_difficulty = build_task_difficulty(task_index, results_matrix)
+    heatmap_data = build_heatmap_data(all_results, task_index, results_matrix, stream)
+    return results_matrix, leaderboard, task_difficulty, heatmap_data
+
+def run_pipeline(timer, data_dir, out_dir, workers, cache_file=None, stream=False, ndjson=False):
+    """One timed pass over every stage; returns dataset counters"""
+    task_index = timer.run("load_tasks", TaskIndex.load, data_dir / "test.raw.json")
+    leaderboard_entries = load_leaderboard(data_dir)
+    layout = load_layout(data_dir)
+    # Synthetic agents all get leaderboard entries, so aggregates cover every agent
+    name_map = MODEL_NAME_MAP if layout is None else {agent["model_id"]: agent["name"] for agent in layout}
+
+    model_jobs = timer.run("list_jobs", list_jobs, data_dir, layout)
+    jobs = [job for _, _, model in model_jobs for job in model]
+
+    job_results = timer.run("extract", run_extraction_jobs, jobs, workers)
+    if cache_file is not None:
+        cache = ExtractionCache(cache_file)
+        run_extraction_jobs(jobs, workers, cache)
+        cache.save()
+        cache = ExtractionCache.load(cache_file)
+        timer.run("extract_warm", run_extraction_jobs, jobs, workers, cache)
+
+    all_results, _ = timer.run("collect", collect_results, model_jobs, job_results)
+
+    def build_entries():
+        models = build_model_entries(leaderboard_entries, all_results, name_map)
+        if stream:
+            # Generated while writing, so their cost moves to the write stage
+            return models, iter_task_entries(task_index), iter_result_entries(all_results)
+        return models, build_task_entries(task_index), build_result_entries(all_results)
+    models, tasks, results = timer.run("build_entries", build_entries)
+
+    results_matrix, leaderboard, task_difficulty, heatmap_data = timer.run(
+        "aggregate", aggregate, models, all_results, task_index, stream
+    )
+    timer.run("analytics", build_analytics, results_matrix, workers=workers)
+    timer.run("clusters", build_clusters, results_matrix, heatmap_data['model_ids'])
+    search_index = timer.run("search_index", build_search_index, task_index.tasks)
+    timer.run(
+        "write", write_outputs, out_dir, models, tasks, results, leaderboard,
+        task_difficulty, heatmap_data, search_index, ndjson,
+    )
+
+    return {
+        "tasks": len(task_index),
+        "models": len(model_jobs),
+        "files": len(jobs),
+        "bytes": sum(os.path.getsize(job[0]) for job in jobs),
+        "results": sum(len(task_results) for task_results in all_results.values()),
+    }
+
+def build_report(timer, dataset, args, workers):
+    stages = {}
+    for name, entry in timer.stages.items():
+        runs = entry["runs"]
+        stage = {
+            "seconds": min(runs),
+            "median_seconds": statistics.median(runs),
+            "runs": runs,
+            "peak_rss_mb": entry["peak_rss_mb"],
+        }
+        if name.startswith("extract"):
+            stage["files_per_sec"] = dataset["files"] / stage["seconds"] if stage["seconds"] else None
+            stage["mb_per_sec"] = dataset["bytes"] / 1024 / 1024 / stage["seconds"] if stage["seconds"] else None
+        stages[name] = stage
+
+    return {
+        "version": REPORT_VERSION,
+        **environment(),
+        "workers": workers,
+        "repeat": args.repeat,
+        "per_stage_rss": timer.per_stage_rss,
+        "dataset": dataset,
+        "stages": stages,
+        "total_seconds": sum(stage["seconds"] for stage in stages.values()),
+        "children_peak_rss_mb": maxrss_mb(children=True),
+    }
+
+def format_mb(value):
+    return "-" if value is None else f"{value:.1f}"
+
+def print_report(report):
+    dataset = report["dataset"]
+    print(f"\n   Dataset: {dataset['tasks']} tasks, {dataset['models']} models, "
+          f"{dataset['files']} files ({dataset['bytes'] / 1024 / 1024:.1f} MB), {dataset['results']} results")
+    print(f"   Workers: {report['workers']}, best of {report['repeat']} run(s)\n")
+    print(f"     {'stage':15} {'seconds':>9} {'median':>9} {'files/s':>10} {'MB/s':>8} {'peak RSS MB':>12}")
+    for name, stage in report["stages"].items():
+        files_per_sec = stage.get("files_per_sec")
+        mb_per_sec = stage.get("mb_per_sec")
+        print(f"     {name:15} {stage['seconds']:9.3f} {stage['median_seconds']:9.3f} "
+              f"{'-' if files_per_sec is None else f'{files_per_sec:.0f}':>10} "
+              f"{'-' if mb_per_sec is None else f'{mb_per_sec:.1f}':>8} "
+              f"{format_mb(stage['peak_rss_mb']):>12}")
+    print(f"     {'total':15} {report['total_seconds']:9.3f}")
+    print(f"\n   Worker peak RSS: {format_mb(report['children_peak_rss_mb'])} MB")
+    if not report["per_stage_rss"]:
+        print("   (peak RSS is cumulative: the kernel does not allow resetting it per stage)")
+
+def compare_reports(report, baseline, threshold):
+    """Print per-stage changes against a baseline; returns the regressed stages"""
+    regressed = []
+    print(f"\n   Compared with baseline (threshold {threshold:.0%}):")
+    for name, stage in report["stages"].items():
+        old = baseline["stages"].get(name)
+        if old is None or not old["seconds"]:
+            print(f"     {name:15} (not in baseline)")
+            continue
+        change = stage["seconds"] / old["seconds"] - 1
+        flag = ""
+        if change > threshold:
+            flag = "  ← regression"
+            regressed.append(name)
+        elif change < -threshold:
+            flag = "  ← faster"
+        print(f"     {name:15} {old['seconds']:9.3f} → {stage['seconds']:9.3f} ({change:+.1%}){flag}")
+    if baseline.get("dataset") != report["dataset"]:
+        print("   Note: baseline was measured on a different dataset")
+    return regressed
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the normalization pipeline stage by stage")
+    parser.add_argument(
+        "--root", type=Path,
+        help="Existing tree containing data/ (default: generate a synthetic one)",
+    )
+    parser.add_argument("--keep", action="store_true", help="Keep the generated tree and outputs")
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="Number of extraction processes (default: 1 = serial, 0 = one per CPU)",
+    )
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per stage; the best is reported")
+    parser.add_argument("--cache", action="store_true", help="Also time extraction against a warm cache")
+    parser.add_argument("--stream", action="store_true", help="Generate and write artifacts record by record")
+    parser.add_argument("--ndjson", action="store_true", help="Stream results, task difficulty and heatmap as NDJSON")
+    parser.add_argument("--json", type=Path, help="Write the report to this file")
+    parser.add_argument("--compare", type=Path, help="Baseline report to compare against")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1,
+        help="Relative slowdown counted as a regression (default: 0.1)",
+    )
+    add_generator_args(parser.add_argument_group("synthetic data (without --root)"))
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    workers = args.workers or os.cpu_count() or 1
+    scratch = Path(tempfile.mkdtemp(prefix="webarena-bench-"))
+
+    print("=" * 100)
+    print("NORMALIZATION PIPELINE BENCHMARK")
+    print("=" * 100)
+
+    try:
+        root = args.root
+        if root is None:
+            root = scratch / "tree"
+            start = time.perf_counter()
+            summary = generate(root, **generator_options(args))
+            print(f"\n   ✓ Generated {summary['trajectories']} trajectories for {summary['agents']} agents "
+                  f"× {summary['tasks']} tasks ({summary['bytes'] / 1024 / 1024:.1f} MB) "
+                  f"in {time.perf_counter() - start:.1f}s")
+
+        timer = StageTimer(collect_garbage=True)
+        for i in range(args.repeat):
+            cache_file = scratch / f"cache_{i}.json" if args.cache else None
+            dataset = run_pipeline(
+                timer, root / "data", scratch / "out", workers, cache_file,
+                args.stream or args.ndjson, args.ndjson,
+            )
+
+        report = build_report(timer, dataset, args, workers)
+        print_report(report)
+
+        if args.json:
+            with open(args.json, 'w') as f:
+                json.dump(report, f, indent=2)
+            print(f"\n   ✓ Wrote report to {args.json}")
+
+        regressed = []
+        if args.compare:
+            with open(args.compare) as f:
+                regressed = compare_reports(report, json.load(f), args.threshold)
+    finally:
+        if args.keep:
+            print(f"\n   Kept scratch directory {scratch}")
+        else:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    if regressed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Unified multi-benchmark store (web/public/data/benchmarks.json)
+
+Ingests every leaderboard in data/ - the WebArena sheet export and the
+VisualWebArena, OSWorld and EconWebArena documents, each with its own
+schema - into one normalized dataset:
+
+- benchmarks: metadata and per-benchmark aggregates (models, best and best
+  open model, human baseline and gap, mean / median success rate)
+- models: one record per model across all benchmarks, with organization
+  details from web/public/data/model-llm-mapping.json
+- entries: one row per leaderboard entry, ordered by benchmark then rank
+- index: entry positions by benchmark and by model
+- scores: best success rate per model and benchmark (the cross-benchmark join)
+- comparisons: models shared by each pair of benchmarks, with their rates
+  and the Spearman rank correlation between the two leaderboards
+
+Model identity: a name is first resolved to its canonical name through
+model_names.MODEL_ALIASES (known naming differences between leaderboards),
+then matched on the key of model_names.name_key(), which ignores case,
+spacing and punctuation.
+
+normalize_data.py writes the store on every run; it can also be rebuilt on
+its own, e.g. after fetching leaderboards:
+    python scripts/benchmark_store.py
+"""
+
+import argparse
+import json
+import re
+import statistics
+from itertools import combinations
+from pathlib import Path
+
+from model_names import canonical_name, name_key
+
+STORE_FILE = "benchmarks.json"
+STORE_VERSION = 1
+DATA_DIR = Path("data")
+OUTPUT_DIR = Path("web/public/data")
+MAPPING_FILE = OUTPUT_DIR / "model-llm-mapping.json"
+
+# Benchmark id -> leaderboard file (in data/) and its schema
+BENCHMARKS = {
+    "webarena": {"file": "leaderboard.json", "schema": "sheet"},
+    "visualwebarena": {"file": "visualwebarena_leaderboard.json", "schema": "document"},
+    "osworld": {"file": "osworld_leaderboard.json", "schema": "document"},
+    "econwebarena": {"file": "econwebarena_leaderboard.json", "schema": "document"},
+}
+
+# The WebArena sheet carries no benchmark metadata of its own
+WEBARENA_METADATA = {
+    "name": "WebArena",
+    "description": "A Realistic Web Environment for Building Autonomous Agents",
+    "total_tasks": 812,
+}
+
+# "Open?" column of the sheet
+OPEN_MARKS = {'✓': True, '✔': True, '✗': False}
+
+def model_slug(name):
+    return re.sub(r'[^0-9a-z]+', '-', name.casefold()).strip('-')
+
+def parse_rate(value):
+    """Success rate as a float, or None if the cell is not a number"""
+    if isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def sheet_entries(document):
+    """Entries of the WebArena sheet export (data/leaderboard.json).
+
+    Rows without a model name or a numeric success rate (notes and the
+    shifted subset / human rows at the bottom of the sheet) are skipped.
+    Returns (entries, skipped rows).
+    """
+    entries = []
+    skipped = 0
+    for row in document['leaderboard']:
+        name = row.get('Model')
+        rate = parse_rate(row.get('Success Rate (%)'))
+        if not isinstance(name, str) or not name.strip() or rate is None:
+            skipped += 1
+            continue
+        size = row.get('Model Size (billion)')
+        entries.append({
+            "name": name.strip(),
+            "success_rate": rate,
+            "date": row.get('a'),
+            "open": OPEN_MARKS.get(row.get('Open?')),
+            "organization": None,
+            "size_b": None if size in (None, '-') else str(size),
+            "note": row.get('Note'),
+            "is_human": False,
+        })
+    return entries, skipped
+
+def document_entries(document):
+    """Entries of a {"benchmark", ..., "leaderboard": [{"model", "success_rate", ...}]}
+    document; returns (entries, skipped rows)"""
+    entries = []
+    skipped = 0
+    for row in document['leaderboard']:
+        name = row.get('model')
+        rate = parse_rate(row.get('success_rate'))
+        if not isinstance(name, str) or not name.strip() or rate is None:
+            skipped += 1
+            continue
+        size = row.get('model_size')
+        entries.append({
+            "name": name.strip(),
+            "success_rate": rate,
+            "date": row.get('date'),
+            "open": row.get('open'),
+            "organization": row.get('organization'),
+            "size_b": None if size is None else str(size),
+            "note": row.get('note'),
+            "is_human": bool(row.get('isHuman')),
+        })
+    return entries, skipped
+
+def sheet_metadata(document):
+    updated = document.get('last_updated')
+    return dict(WEBARENA_METADATA, updated=updated[:10] if updated else None, details={})
+
+def document_metadata(document):
+    details = {key: value for key, value in document.items()
+               if key not in ("benchmark", "description", "total_tasks", "updated", "leaderboard")}
+    return {
+        "name": document.get('benchmark'),
+        "description": document.get('description'),
+        "total_tasks": document.get('total_tasks'),
+        "updated": document.get('updated'),
+        "details": details,  # environments, applications, domains, ...
+    }
+
+SCHEMAS = {
+    "sheet": (sheet_metadata, sheet_entries),
+    "document": (document_metadata, document_entries),
+}
+
+def load_benchmarks(data_dir=DATA_DIR, benchmarks=BENCHMARKS):
+    """{benchmark_id: (metadata, entries, skipped)} for every leaderboard file
+    that exists, in BENCHMARKS order"""
+    loaded = {}
+    for benchmark_id, config in benchmarks.items():
+        path = data_dir / config["file"]
+        if not path.exists():
+            continue
+        with open(path, 'r') as f:
+            document = json.load(f)
+        metadata_fn, entries_fn = SCHEMAS[config["schema"]]
+        entries, skipped = entries_fn(document)
+        loaded[benchmark_id] = (metadata_fn(document), entries, skipped)
+    return loaded
+
+def load_mapping(path=MAPPING_FILE):
+    """Organization details by model name (model-llm-mapping.json), or {}"""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except OSError:
+        return {}
+
+def rank_entries(entries):
+    """Competition ranks (1, 2, 2, 4) by success rate; human baselines get None"""
+    rates = sorted((e['success_rate'] for e in entries if not e['is_human']), reverse=True)
+    first_position = {}
+    for position, rate in enumerate(rates):
+        first_position.setdefault(rate, position + 1)
+    for entry in entries:
+        entry['rank'] = None if entry['is_human'] else first_position[entry['success_rate']]
+
+def average_ranks(values):
+    """Ranks of values (1 = smallest), ties sharing their average rank"""
+    order = sorted(range(len(values)), key=values.__getitem__)
+    ranks = [0.0] * len(values)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2 + 1
+        i = j + 1
+    return ranks
+
+def spearman(xs, ys):
+    """Spearman rank correlation, or None for fewer than 3 pairs or no variance"""
+    if len(xs) < 3:
+        return None
+    rx, ry = average_ranks(xs), average_ranks(ys)
+    mean_x, mean_y = statistics.fmean(rx), statistics.fmean(ry)
+    cov = sum((a - mean_x) * (b - mean_y) for a, b in zip(rx, ry))
+    var_x = sum((a - mean_x) ** 2 for a in rx)
+    var_y = sum((b - mean_y) ** 2 for b in ry)
+    if var_x == 0 or var_y == 0:
+        return None
+    return round(cov / (var_x * var_y) ** 0.5, 3)
+
+def benchmark_aggregates(entries):
+    """Per-benchmark summary over ranked entries (see rank_entries())"""
+    agents = sorted((e for e in entries if not e['is_human']), key=lambda e: e['rank'])
+    rates = [e['success_rate'] for e in agents]
+    humans = [e['success_rate'] for e in entries if e['is_human']]
+    best = agents[0] if agents else None
+    best_open = next((e for e in agents if e['open']), None)
+    human = max(humans) if humans else None
+    return {
+        "models": len(agents),
+        "open_models": sum(1 for e in agents if e['open']),
+        "best": None if best is None else {"model": best['model'], "success_rate": best['success_rate']},
+        "best_open": None if best_open is None else {
+            "model": best_open['model'], "success_rate": best_open['success_rate'],
+        },
+        "human": human,
+        "gap_to_human": round(human - best['success_rate'], 2) if human is not None and best else None,
+        "mean": round(statistics.fmean(rates), 2) if rates else None,
+        "median": round(statistics.median(rates), 2) if rates else None,
+    }
+
+def build_benchmark_store(loaded, mapping=None, trajectory_models=None):
+    """Build the store from load_benchmarks() output.
+
+    mapping is model-llm-mapping.json; trajectory_models maps WebArena
+    leaderboard names to the model ids of models.json, so models with
+    trajectories can be joined to the per-task data.
+    """
+    mapping = mapping or {}
+    trajectory_models = trajectory_models or {}
+    mapping_by_key = {name_key(name): info for name, info in mapping.items()}
+
+    models = {}
+    ids_by_key = {}
+    entries = []
+    benchmarks = []
+    for benchmark_id, (metadata, benchmark_entries, skipped) in loaded.items():
+        rank_entries(benchmark_entries)
+        for entry in sorted(benchmark_entries, key=lambda e: (e['rank'] is not None, e['rank'] or 0)):
+            canonical = canonical_name(entry['name'])
+            key = name_key(canonical)
+            model_id = ids_by_key.setdefault(key, model_slug(canonical) or key)
+            model = models.get(model_id)
+            if model is None:
+                model = models[model_id] = {
+                    "id": model_id,
+                    "name": canonical,
+                    "aliases": [],
+                    "organization": None,
+                    "organization_type": None,
+                    "llm": None,
+                    "open": None,
+                    "is_human": entry['is_human'],
+                    "trajectory_model_id": None,
+                    "benchmarks": [],
+                }
+            if entry['name'] != model['name'] and entry['name'] not in model['aliases']:
+                model['aliases'].append(entry['name'])
+            if benchmark_id not in model['benchmarks']:
+                model['benchmarks'].append(benchmark_id)
+            info = mapping_by_key.get(name_key(entry['name'])) or mapping_by_key.get(key)
+            if info is not None and model['organization_type'] is None:
+                model['organization'] = info.get('organization')
+                model['organization_type'] = info.get('organizationType')
+                model['llm'] = info.get('llm')
+            if model['organization'] is None:
+                model['organization'] = entry['organization']
+            if model['open'] is None:
+                model['open'] = entry['open']
+            if benchmark_id == "webarena" and entry['name'] in trajectory_models:
+                model['trajectory_model_id'] = trajectory_models[entry['name']]
+
+            entries.append({
+                "benchmark": benchmark_id,
+                "model": model_id,
+                "name": entry['name'],
+                "rank": entry['rank'],
+                "success_rate": entry['success_rate'],
+                "date": entry['date'],
+                "open": entry['open'],
+                "size_b": entry['size_b'],
+                "note": entry['note'],
+                "is_human": entry['is_human'],
+            })
+
+        benchmark_rows = [e for e in entries if e['benchmark'] == benchmark_id]
+        benchmarks.append(dict(
+            {"id": benchmark_id}, **metadata,
+            skipped_rows=skipped,
+            aggregates=benchmark_aggregates(benchmark_rows),
+        ))
+
+    index = {"by_benchmark": {}, "by_model": {}}
+    scores = {}
+    for position, entry in enumerate(entries):
+        index["by_benchmark"].setdefault(entry['benchmark'], []).append(position)
+        index["by_model"].setdefault(entry['model'], []).append(position)
+        # Entries are in rank order, so the first one per benchmark is the best
+        scores.setdefault(entry['model'], {}).setdefault(entry['benchmark'], entry['success_rate'])
+
+    comparisons = []
+    for a, b in combinations([benchmark['id'] for benchmark in benchmarks], 2):
+        shared = [model_id for model_id, model in models.items()
+                  if not model['is_human'] and a in scores[model_id] and b in scores[model_id]]
+        comparisons.append({
+            "benchmarks": [a, b],
+            "models": [{"model": model_id, a: scores[model_id][a], b: scores[model_id][b]}
+                       for model_id in shared],
+            "spearman": spearman([scores[m][a] for m in shared], [scores[m][b] for m in shared]),
+        })
+
+    return {
+        "version": STORE_VERSION,
+        "benchmarks": benchmarks,
+        "models": list(models.values()),
+        "entries": entries,
+        "index": index,
+        "scores": scores,
+        "comparisons": comparisons,
+    }
+
+def write_benchmark_store(output_dir, store):
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with open(output_dir / STORE_FILE, 'w') as f:
+        json.dump(store, f, indent=2)
+
+def trajectory_models_from(models):
+    """WebArena leaderboard name -> model id, from models.json entries"""
+    return {model['name']: model['id'] for model in models}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the unified multi-benchmark store")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR, help="Directory with the leaderboard files")
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR, help="Where to write benchmarks.json")
+    args = parser.parse_args(argv)
+
+    models_file = args.output_dir / "models.json"
+    trajectory_models = {}
+    if models_file.exists():
+        with open(models_file, 'r') as f:
+            trajectory_models = trajectory_models_from(json.load(f))
+
+    store = build_benchmark_store(load_benchmarks(args.data_dir), load_mapping(), trajectory_models)
+    write_benchmark_store(args.output_dir, store)
+    print(f"✓ Wrote {args.output_dir / STORE_FILE}: {len(store['benchmarks'])} benchmarks, "
+          f"{len(store['models'])} models, {len(store['entries'])} entries")
+    for benchmark in store['benchmarks']:
+        if benchmark['skipped_rows']:
+            print(f"   {benchmark['id']}: skipped {benchmark['skipped_rows']} rows without a numeric success rate")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+"""
+Task and model similarity with hierarchical clustering orders (clusters.json)
+
+The heatmap lists tasks in id order, which scatters tasks that fail the same
+way. This module precomputes, for the rows and columns of heatmap_data.json:
+
+- task_order: tasks ordered by solve pattern (average-linkage hierarchical
+  clustering), with task_clusters labelling the flat clusters obtained by
+  cutting the tree at CLUSTER_DISTANCE
+- template_order: the same order, grouped by intent_template_id; template
+  groups are ordered by the mean position of their tasks in task_order
+- task_neighbors: the NEIGHBORS most similar tasks of every task
+- model_order plus model-model similarity: Jaccard of the sets of passed
+  tasks and Hamming (disagreement rate), both over the tasks the two models
+  scored
+
+Tasks are compared by Hamming distance: the share of models, among those
+with a scored result for both tasks, that pass one task but not the other.
+Shared failures count as agreement, which is what groups failure clusters
+together. Models are clustered by the same distance over tasks. Results
+without a usable success flag are left out like missing ones.
+
+Success vectors are packed into uint64 bitsets (one bit per model for tasks,
+one bit per task for models), so a distance is a few XOR / AND and popcount
+operations per word. Tasks with identical results are clustered once, as a
+single weighted item. When there are more than MAX_CLUSTER_ITEMS distinct
+patterns, the most frequent ones are clustered and every other pattern is
+placed next to its nearest clustered pattern.
+
+normalize_data.py writes clusters.json (minified) on every run; it can also
+be rebuilt from the tasks.json, results.json and heatmap_data.json in the
+output directory:
+    python scripts/clustering.py
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+
+from compact_export import dump_minified
+from results_matrix import FAIL, PASS, ResultsMatrix
+
+CLUSTERS_FILE = "clusters.json"
+OUTPUT_DIR = Path("web/public/data")
+CLUSTERS_VERSION = 1
+CLUSTER_DISTANCE = 0.15
+MAX_CLUSTER_ITEMS = 4096
+NEIGHBORS = 5
+SIMILARITY_SCALE = 1000
+BLOCK_ELEMENTS = 1 << 22
+
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+def popcount(words):
+    """Set bits of every element of a uint64 array"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words)
+    return _POPCOUNT[words.view(np.uint8)].reshape(*words.shape, 8).sum(axis=-1)
+
+def pack_rows(mask):
+    """Pack each row of a bool matrix into uint64 words"""
+    n, bits = mask.shape
+    words = max(1, (bits + 63) // 64)
+    packed = np.zeros((n, words * 8), dtype=np.uint8)
+    packed[:, :(bits + 7) // 8] = np.packbits(mask, axis=1)
+    return packed.view(np.uint64)
+
+def hamming_counts(a_pass, a_present, b_pass, b_present):
+    """(disagreements, compared) between every row of a and every row of b"""
+    shape = (len(a_pass), len(b_pass))
+    differ = np.zeros(shape, dtype=np.int32)
+    compared = np.zeros(shape, dtype=np.int32)
+    # One word at a time keeps the temporaries two-dimensional
+    for w in range(a_pass.shape[1]):
+        both = np.bitwise_and.outer(a_present[:, w], b_present[:, w])
+        differ += popcount(np.bitwise_xor.outer(a_pass[:, w], b_pass[:, w]) & both)
+        compared += popcount(both)
+    return differ, compared
+
+def hamming_distances(a_pass, a_present, b_pass, b_present):
+    """Disagreement rate between rows of a and b (1 where nothing is compared)"""
+    differ, compared = hamming_counts(a_pass, a_present, b_pass, b_present)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(compared > 0, differ / compared, 1.0)
+
+def blocks(n_rows, n_cols, words):
+    """Row ranges whose pairwise temporaries stay around BLOCK_ELEMENTS"""
+    size = max(1, BLOCK_ELEMENTS // max(1, n_cols * words))
+    return [(start, min(start + size, n_rows)) for start in range(0, n_rows, size)]
+
+def average_linkage(distances, weights):
+    """Average-linkage (UPGMA) merges by the nearest-neighbor chain algorithm.
+
+    Items are 0..p-1 with the given weights; merge k creates cluster p + k.
+    Returns a list of (cluster, cluster, distance).
+    """
+    p = len(distances)
+    d = np.array(distances, dtype=np.float64)
+    np.fill_diagonal(d, np.inf)
+    size = np.array(weights, dtype=np.float64)
+    cluster = list(range(p))   # cluster id held by each slot
+    alive = np.ones(p, dtype=bool)
+    merges = []
+    chain = []
+    while len(merges) < p - 1:
+        if not chain:
+            chain.append(int(np.argmax(alive)))
+        while True:
+            a = chain[-1]
+            b = int(np.argmin(d[a]))
+            # Prefer the previous chain element on ties, so the chain ends
+            if len(chain) > 1 and d[a, chain[-2]] <= d[a, b]:
+                b = chain[-2]
+            if len(chain) > 1 and b == chain[-2]:
+                break
+            chain.append(b)
+        a, b = chain.pop(), chain.pop()
+        a, b = min(a, b), max(a, b)
+        merges.append((cluster[a], cluster[b], float(d[a, b])))
+
+        # Lance-Williams update for average linkage; slot a holds the merge
+        row = (size[a] * d[a] + size[b] * d[b]) / (size[a] + size[b])
+        d[a], d[:, a] = row, row
+        d[a, a] = np.inf
+        d[b], d[:, b] = np.inf, np.inf
+        size[a] += size[b]
+        alive[b] = False
+        cluster[a] = p + len(merges) - 1
+    return merges
+
+def leaf_order(p, merges):
+    """Leaves in dendrogram order; at every node the subtree holding the
+    lower item comes first"""
+    if p == 0:
+        return []
+    children = {p + k: (a, b) for k, (a, b, _) in enumerate(merges)}
+    lowest = list(range(p)) + [0] * len(merges)
+    for k, (a, b, _) in enumerate(merges):
+        lowest[p + k] = min(lowest[a], lowest[b])
+    roots = sorted(set(range(p + len(merges))) - {c for pair in children.values() for c in pair},
+                   key=lowest.__getitem__)
+    order = []
+    stack = list(reversed(roots))
+    while stack:
+        node = stack.pop()
+        if node < p:
+            order.append(node)
+        else:
+            first, second = sorted(children[node], key=lowest.__getitem__)
+            stack.extend([second, first])
+    return order
+
+def flat_clusters(p, merges, order, cut=CLUSTER_DISTANCE):
+    """Cluster label of every item when the tree is cut at `cut`, numbered in
+    leaf order"""
+    parent = list(range(p + len(merges)))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for k, (a, b, distance) in enumerate(merges):
+        if distance <= cut:
+            parent[find(a)] = p + k
+            parent[find(b)] = p + k
+    labels = [0] * p
+    numbers = {}
+    for item in order:
+        labels[item] = numbers.setdefault(find(item), len(numbers))
+    return labels
+
+def unique_patterns(pass_bits, present_bits):
+    """Distinct rows in order of first occurrence: (first row of each,
+    pattern of every row, rows per pattern)"""
+    _, first, inverse, counts = np.unique(
+        np.hstack([pass_bits, present_bits]), axis=0,
+        return_index=True, return_inverse=True, return_counts=True,
+    )
+    by_first = np.argsort(first, kind='stable')
+    rank = np.empty(len(first), dtype=np.int64)
+    rank[by_first] = np.arange(len(first))
+    return first[by_first], rank[inverse.ravel()], counts[by_first]
+
+def cluster_rows(pass_bits, present_bits, max_items=MAX_CLUSTER_ITEMS):
+    """(row order, cluster label per row) for rows of packed success vectors"""
+    n = len(pass_bits)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    first, pattern_of, counts = unique_patterns(pass_bits, present_bits)
+    p = len(first)
+
+    # Cluster the max_items most frequent patterns (all of them if few enough)
+    if p > max_items:
+        frequent = np.sort(np.lexsort((np.arange(p), -counts))[:max_items])
+    else:
+        frequent = np.arange(p)
+    rep_pass, rep_present = pass_bits[first[frequent]], present_bits[first[frequent]]
+
+    # Nearest clustered pattern of every pattern (itself when clustered)
+    nearest = np.empty(p, dtype=np.int64)
+    pattern_pass, pattern_present = pass_bits[first], present_bits[first]
+    for start, end in blocks(p, len(frequent), pass_bits.shape[1]):
+        distances = hamming_distances(pattern_pass[start:end], pattern_present[start:end], rep_pass, rep_present)
+        nearest[start:end] = np.argmin(distances, axis=1)
+    nearest[frequent] = np.arange(len(frequent))
+    weights = np.bincount(nearest, weights=counts, minlength=len(frequent))
+
+    distances = np.empty((len(frequent), len(frequent)))
+    for start, end in blocks(len(frequent), len(frequent), pass_bits.shape[1]):
+        distances[start:end] = hamming_distances(rep_pass[start:end], rep_present[start:end], rep_pass, rep_present)
+    merges = average_linkage(distances, weights)
+    order = leaf_order(len(frequent), merges)
+    labels = np.array(flat_clusters(len(frequent), merges, order), dtype=np.int64)
+
+    position = np.empty(len(frequent), dtype=np.int64)
+    position[order] = np.arange(len(order))
+    item_of_row = nearest[pattern_of]
+    # Leaf position, then pattern (first occurrence), then row
+    row_order = np.lexsort((np.arange(n), pattern_of, position[item_of_row]))
+    return row_order, labels[item_of_row]
+
+def nearest_rows(pass_bits, present_bits, k=NEIGHBORS):
+    """(neighbors, scaled similarities), each [rows, k]: the k most similar
+    other rows, most similar first, lower row first on ties"""
+    n = len(pass_bits)
+    k = min(k, max(0, n - 1))
+    neighbors = np.zeros((n, k), dtype=np.int64)
+    similarity = np.zeros((n, k), dtype=np.int64)
+    if k == 0:
+        return neighbors, similarity
+    tiebreak = np.arange(n - 1, -1, -1, dtype=np.int64)
+    for start, end in blocks(n, n, pass_bits.shape[1]):
+        distances = hamming_distances(pass_bits[start:end], present_bits[start:end], pass_bits, present_bits)
+        scaled = np.rint((1 - distances) * SIMILARITY_SCALE).astype(np.int64)
+        # One integer key orders by similarity, then by lower row
+        keys = scaled * n + tiebreak
+        keys[np.arange(end - start), np.arange(start, end)] = -1
+        top = np.argpartition(-keys, k - 1, axis=1)[:, :k]
+        top = np.take_along_axis(top, np.argsort(-np.take_along_axis(keys, top, axis=1), axis=1), axis=1)
+        neighbors[start:end] = top
+        similarity[start:end] = np.take_along_axis(scaled, top, axis=1)
+    return neighbors, similarity
+
+def model_similarity(pass_bits, present_bits):
+    """(jaccard, hamming) matrices between models over the tasks both attempted"""
+    both = present_bits[:, None, :] & present_bits[None, :, :]
+    inter = popcount(pass_bits[:, None, :] & pass_bits[None, :, :]).sum(axis=-1, dtype=np.int64)
+    union = popcount((pass_bits[:, None, :] | pass_bits[None, :, :]) & both).sum(axis=-1, dtype=np.int64)
+    differ, compared = hamming_counts(pass_bits, present_bits, pass_bits, present_bits)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        jaccard = np.where(union > 0, inter / union, np.nan)
+        hamming = np.where(compared > 0, differ / compared, np.nan)
+    return jaccard, hamming
+
+def rounded_matrix(matrix):
+    return [[None if np.isnan(x) else round(float(x), 3) for x in row] for row in matrix]
+
+def template_groups(order, template_codes, templates):
+    """Rows grouped by template, groups by the mean position of their rows in
+    order; returns (row order, template ids, group sizes)"""
+    position = np.empty(len(order), dtype=np.int64)
+    position[order] = np.arange(len(order))
+    sizes = np.bincount(template_codes, minlength=len(templates))
+    mean = np.bincount(template_codes, weights=position, minlength=len(templates)) / np.maximum(sizes, 1)
+    groups = [g for g in np.lexsort((np.arange(len(templates)), mean)) if sizes[g]]
+    rank = np.empty(len(templates), dtype=np.int64)
+    rank[groups] = np.arange(len(groups))
+    rows = np.lexsort((position, rank[template_codes]))
+    return rows, [templates[g] for g in groups], [int(sizes[g]) for g in groups]
+
+def build_clusters(results_matrix, model_ids):
+    """Build clusters.json for the heatmap: rows are the suite tasks (in
+    heatmap_data.json order), columns model_ids"""
+    suite = results_matrix.suite_size
+    cols = [results_matrix.model_ids.index(model_id) for model_id in model_ids]
+    values = results_matrix.values[:suite][:, cols]
+    passed = values == PASS
+    present = passed | (values == FAIL)  # scored; unscored results count as missing
+
+    task_pass, task_present = pack_rows(passed), pack_rows(present)
+    task_order, task_labels = cluster_rows(task_pass, task_present)
+    template_order, template_ids, template_sizes = template_groups(
+        task_order, results_matrix.template_codes[:suite], results_matrix.templates
+    )
+    neighbors, neighbor_similarity = nearest_rows(task_pass, task_present)
+
+    model_pass, model_present = pack_rows(passed.T), pack_rows(present.T)
+    jaccard, hamming = model_similarity(model_pass, model_present)
+    distances = np.nan_to_num(hamming, nan=1.0)
+    np.fill_diagonal(distances, 0.0)
+    model_order = leaf_order(len(model_ids), average_linkage(distances, np.ones(len(model_ids))))
+
+    return {
+        "version": CLUSTERS_VERSION,
+        "task_ids": results_matrix.task_ids[:suite],
+        "model_ids": list(model_ids),
+        "cluster_distance": CLUSTER_DISTANCE,
+        "task_order": task_order.tolist(),
+        "task_clusters": task_labels.tolist(),
+        "template_order": template_order.tolist(),
+        "template_ids": template_ids,
+        "template_sizes": template_sizes,
+        "neighbors": neighbors.shape[1],
+        "similarity_scale": SIMILARITY_SCALE,
+        "task_neighbors": neighbors.ravel().tolist(),
+        "task_neighbor_similarity": neighbor_similarity.ravel().tolist(),
+        "model_order": model_order,
+        "model_jaccard": rounded_matrix(jaccard),
+        "model_hamming": rounded_matrix(hamming),
+    }
+
+def write_clusters(output_dir, clusters):
+    dump_minified(clusters, output_dir / CLUSTERS_FILE)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild clusters.json from the artifacts of a full run")
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR, help="Directory with the artifacts")
+    args = parser.parse_args(argv)
+
+    with open(args.output_dir / "tasks.json", 'r') as f:
+        tasks = json.load(f)
+    with open(args.output_dir / "results.json", 'r') as f:
+        results = json.load(f)
+    with open(args.output_dir / "heatmap_data.json", 'r') as f:
+        heatmap_data = json.load(f)
+    results_matrix = ResultsMatrix.from_artifacts(tasks, results, heatmap_data)
+    clusters = build_clusters(results_matrix, heatmap_data['model_ids'])
+    write_clusters(args.output_dir, clusters)
+    print(f"✓ Wrote {args.output_dir / CLUSTERS_FILE}: {len(clusters['task_order'])} tasks in "
+          f"{max(clusters['task_clusters'], default=-1) + 1} clusters, {len(clusters['template_ids'])} templates")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Compact exports of the normalized data for the web frontend
+
+Writes, next to the regular JSON artifacts:
+- results_matrix.bin: every task x model cell as a 2-bit code, 4 cells per
+  byte, row-major (task rows, model columns), low bits first
+- results_matrix.json: minified row/column id tables for the .bin file
+- <name>.min.json: minified copies of every JSON artifact
+
+Cell codes match CELL_* in web/lib/compact-data.ts.
+"""
+
+import json
+
+import numpy as np
+
+from results_matrix import FAIL, MISSING, PASS, UNSCORED
+
+MATRIX_FILE = "results_matrix.bin"
+MATRIX_META_FILE = "results_matrix.json"
+COMPACT_VERSION = 1
+
+# 2-bit cell codes
+CELL_MISSING = 0
+CELL_FAIL = 1
+CELL_PASS = 2
+CELL_UNSCORED = 3
+
+def dump_minified(obj, path):
+    """Write obj as JSON without whitespace"""
+    with open(path, 'w') as f:
+        json.dump(obj, f, separators=(',', ':'))
+
+def pack_cells(values):
+    """Pack an int8 outcome matrix into 2-bit cells, 4 per byte"""
+    codes = np.zeros(values.shape, dtype=np.uint8)
+    codes[values == MISSING] = CELL_MISSING
+    codes[values == FAIL] = CELL_FAIL
+    codes[values == PASS] = CELL_PASS
+    codes[values == UNSCORED] = CELL_UNSCORED
+
+    flat = codes.ravel()
+    flat = np.concatenate([flat, np.zeros(-len(flat) % 4, dtype=np.uint8)])
+    return flat[0::4] | flat[1::4] << 2 | flat[2::4] << 4 | flat[3::4] << 6
+
+def write_compact_artifacts(output_dir, results_matrix, model_ids, artifacts):
+    """Write the packed matrix, its id tables and minified copies of artifacts.
+
+    model_ids sets the column order of the packed matrix. artifacts maps
+    JSON file names (e.g. "tasks.json") to the objects written there.
+    Returns the list of file names written.
+    """
+    cols = [results_matrix.model_ids.index(model_id) for model_id in model_ids]
+    packed = pack_cells(results_matrix.values[:, cols])
+    (output_dir / MATRIX_FILE).write_bytes(packed.tobytes())
+
+    dump_minified({
+        "version": COMPACT_VERSION,
+        "file": MATRIX_FILE,
+        "rows": len(results_matrix.task_ids),
+        "cols": len(model_ids),
+        "suite_size": results_matrix.suite_size,
+        "task_ids": results_matrix.task_ids,
+        "model_ids": list(model_ids),
+    }, output_dir / MATRIX_META_FILE)
+
+    written = [MATRIX_FILE, MATRIX_META_FILE]
+    for name, obj in artifacts.items():
+        min_name = name[:-len(".json")] + ".min.json"
+        dump_minified(obj, output_dir / min_name)
+        written.append(min_name)
+    return written
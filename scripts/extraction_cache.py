@@ -0,0 +1,141 @@
+"""
+Persistent extraction cache for normalize_data.py
+
+Each trajectory file's extraction record (detected format, extracted
+(task_id, success) pairs and parse failures) is stored in a JSON
+manifest, keyed by path and validated against the file's size, mtime
+and SHA-256 content hash. An entry is also tied to a fingerprint of the
+extractor source code, so editing the extractors invalidates every file
+they produced.
+
+Manifest layout:
+    {
+      "version": 3,
+      "files": {
+        "data/trajectories/deepsky_trajectories/0.json": {
+          "size": 1234,
+          "mtime_ns": 1700000000000000000,
+          "sha256": "ab12...",
+          "extractor": "cd34...",
+          "format": "deepsky",
+          "pairs": [[0, true]],
+          "failures": 0,
+          "error": null
+        }
+      }
+    }
+"""
+
+import hashlib
+import inspect
+import json
+import os
+from pathlib import Path
+
+MANIFEST_VERSION = 3
+HASH_CHUNK_SIZE = 1 << 20
+
+def file_digest(path):
+    """SHA-256 hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def file_signature(path):
+    """Size, mtime and content hash of a file, stat'd before hashing"""
+    stat = os.stat(path)
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": file_digest(path),
+    }
+
+_fingerprints = {}
+
+def extractor_fingerprint(*fns):
+    """Hash of the source code of the functions (or modules) that produce a file's pairs"""
+    key = tuple(fns)
+    if key not in _fingerprints:
+        digest = hashlib.sha256()
+        for fn in fns:
+            digest.update(getattr(fn, '__qualname__', fn.__name__).encode())
+            digest.update(inspect.getsource(fn).encode())
+        _fingerprints[key] = digest.hexdigest()
+    return _fingerprints[key]
+
+class ExtractionCache:
+    """Manifest of previously extracted trajectory files"""
+
+    def __init__(self, path, entries=None):
+        self.path = Path(path)
+        self.entries = entries or {}
+        self.seen = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, path):
+        """Load a manifest, starting empty if it is missing or unreadable"""
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+            if data.get('version') == MANIFEST_VERSION:
+                return cls(path, data.get('files', {}))
+        except (OSError, ValueError):
+            pass
+        return cls(path)
+
+    def lookup(self, path, fingerprint):
+        """Return the cached extraction record for a file, or None if it must be re-parsed"""
+        key = str(path)
+        entry = self.entries.get(key)
+        if entry is None or entry.get('extractor') != fingerprint:
+            self.misses += 1
+            return None
+
+        stat = os.stat(path)
+        if stat.st_size != entry['size']:
+            self.misses += 1
+            return None
+
+        if stat.st_mtime_ns != entry['mtime_ns']:
+            # Touched but possibly unchanged: fall back to the content hash
+            if file_digest(path) != entry['sha256']:
+                self.misses += 1
+                return None
+            entry = dict(entry, mtime_ns=stat.st_mtime_ns)
+
+        self.seen[key] = entry
+        self.hits += 1
+        return {
+            "format": entry['format'],
+            "pairs": [tuple(pair) for pair in entry['pairs']],
+            "failures": entry['failures'],
+            "error": entry['error'],
+            "bytes": entry['size'],
+            "seconds": 0.0,
+            "cached": True,
+        }
+
+    def store(self, path, fingerprint, signature, record):
+        """Record a file's extraction record with its file_signature()"""
+        self.seen[str(path)] = dict(
+            signature,
+            extractor=fingerprint,
+            format=record["format"],
+            pairs=[list(pair) for pair in record["pairs"]],
+            failures=record["failures"],
+            error=record["error"],
+        )
+
+    def save(self, prune=True):
+        """Atomically write the manifest, keeping only files seen this run
+        (prune=False also keeps the loaded entries, for partial runs)"""
+        files = self.seen if prune else {**self.entries, **self.seen}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({"version": MANIFEST_VERSION, "files": files}, f)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,324 @@
+"""
+Trajectory format registry for normalize_data.py
+
+Each trajectory format registers its extractor together with a cheap
+sniffing predicate over the first SNIFF_BYTES of a file. detect_format()
+reads that head once and dispatches to the first format whose suffix and
+predicate match, so no file is fully parsed just to find out what it is.
+
+The model's declared format (a hint from MODEL_FORMATS in normalize_data.py)
+is kept unless it positively fails: the suffix is wrong, or the sniffer
+missed after seeing everything it looks at (the whole file, or the whole
+first line of a JSONL file). A key that merely falls beyond the head is not
+a failure. Only then are the other formats tried in registration order; if
+none matches, the declared format is still used. Files of models without
+one are reported as unrecognized instead of being guessed at.
+
+Extractors raise on malformed input; the file readers count those
+failures (per line for JSONL) and keep the filename fallback for task ids.
+
+Adding a format:
+    @register_format("myagent", json_object_with("episode", "reward"))
+    def extract_results_myagent(file_path):
+        ...
+        return task_id, success
+"""
+
+import json
+import os
+import re
+
+from json_scan import load_trajectory_fields
+
+SNIFF_BYTES = 4096
+MAX_ERROR_LENGTH = 200
+TRAJECTORY_SUFFIXES = ('.json', '.jsonl')
+
+class TrajectoryFormat:
+    """A registered format: how to recognise its files and extract them"""
+
+    def __init__(self, name, sniff, extract, line_based, suffixes):
+        self.name = name
+        self.sniff = sniff
+        self.extract = extract  # takes a line if line_based, else a path
+        self.line_based = line_based
+        self.suffixes = suffixes
+
+    def matches(self, path, head):
+        return path.suffix in self.suffixes and self.sniff(head)
+
+    def rejects(self, path, head, complete):
+        """Whether a file is positively not in this format; complete says
+        whether head is the whole file"""
+        if path.suffix not in self.suffixes:
+            return True
+        if self.sniff(head):
+            return False
+        return complete or (self.line_based and '\n' in head)
+
+FORMATS = {}
+
+def register_format(name, sniff, line_based=False, suffixes=('.json',)):
+    """Decorator registering an extractor for a trajectory format"""
+    def decorator(fn):
+        if name in FORMATS:
+            raise ValueError(f"Trajectory format {name!r} is already registered")
+        FORMATS[name] = TrajectoryFormat(name, sniff, fn, line_based, tuple(suffixes))
+        return fn
+    return decorator
+
+def json_object_with(*keys, first_line=False):
+    """Sniffer for a JSON object whose head mentions every key"""
+    patterns = [re.compile(rf'"{re.escape(key)}"\s*:') for key in keys]
+
+    def sniff(head):
+        if first_line:
+            head = head.split('\n', 1)[0]
+        return head.startswith('{') and all(pattern.search(head) for pattern in patterns)
+    return sniff
+
+def json_array(head):
+    return head.startswith('[')
+
+def extract_task_id_from_filename(filename):
+    """Extract task ID from various filename formats"""
+    patterns = [
+        r'^(\d+)\.json',
+        r'task_(\d+)',
+        r'webarena_(\d+)',
+        r'task_summary_flat_(\d+)',
+    ]
+    for pattern in patterns:
+        match = re.search(pattern, filename)
+        if match:
+            return int(match.group(1))
+    return None
+
+# JSONL formats (one record per line)
+
+@register_format("jace", json_object_with("task_id", "result", first_line=True),
+                 line_based=True, suffixes=('.jsonl', ''))
+def extract_results_jace(line):
+    """Extract from Jace JSONL format"""
+    data = json.loads(line)
+    return data.get('task_id'), data.get('result', {}).get('success')
+
+@register_format("gui_hybrid", json_object_with("task_id", "correct", first_line=True),
+                 line_based=True, suffixes=('.jsonl', ''))
+def extract_results_gui_hybrid(line):
+    """Extract from GUI Hybrid JSONL format"""
+    data = json.loads(line)
+    return data.get('task_id'), data.get('correct')
+
+# JSON formats (one task per file)
+
+@register_format("step", json_object_with("trajectory"))
+def extract_results_step(file_path):
+    """Extract from SteP format (also used by AgentOccam) - has trajectory with success info"""
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        data = load_trajectory_fields(f)  # Streams past screenshots/trees
+    task_id = data.get('id')
+    trajectory = data.get('trajectory', [])
+    if trajectory and len(trajectory) > 0:
+        last_step = trajectory[-1]
+        success = last_step.get('success')
+        return task_id, success
+    return None, None
+
+@register_format("narada", json_object_with("score"))
+def extract_results_narada(file_path):
+    """Extract from Narada format - has score field (1.0 = success, 0.0 = failure)"""
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        data = load_trajectory_fields(f)
+    # Extract task ID from filename
+    task_id = extract_task_id_from_filename(file_path.name)
+    score = data.get('score')
+    if score is not None:
+        success = score >= 0.5  # Score of 1.0 means success, 0.0 means failure
+        return task_id, success
+    return None, None
+
+@register_format("deepsky", json_object_with("task_id"))
+def extract_results_deepsky(file_path):
+    """Extract from DeepSky format"""
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        data = load_trajectory_fields(f)
+    return data.get('task_id'), data.get('success')
+
+@register_format("trajectory_only", json_array)
+def extract_results_trajectory_only(file_path):
+    """Extract from trajectory-only formats without success data
+    (IBM CUGA, OpenAI Operator, ScribeAgent, Learn-by-Interact)"""
+    # Task ID can still be extracted from the filename for tracking
+    return extract_task_id_from_filename(file_path.name), None
+
+def describe_error(exc):
+    """Short one-line description of a parse failure"""
+    return f"{type(exc).__name__}: {exc}"[:MAX_ERROR_LENGTH]
+
+def extract_jsonl_file(file_path, line_fn):
+    """Extract every (task_id, success) pair from a JSONL file.
+
+    Returns (pairs, failures, first_error); lines that fail to parse are
+    counted and skipped.
+    """
+    pairs = []
+    failures = 0
+    first_error = None
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                task_id, success = line_fn(line)
+            except Exception as e:
+                failures += 1
+                first_error = first_error or describe_error(e)
+                continue
+            if task_id is not None:
+                pairs.append((task_id, success))
+    return pairs, failures, first_error
+
+def extract_json_file(file_path, extraction_fn):
+    """Extract the (task_id, success) pair from a single trajectory file.
+
+    Returns (pairs, failures, first_error) like extract_jsonl_file().
+    """
+    failures = 0
+    first_error = None
+    try:
+        task_id, success = extraction_fn(file_path)
+    except Exception as e:
+        task_id, success = None, None
+        failures = 1
+        first_error = describe_error(e)
+    if task_id is None:
+        # Fallback to filename
+        task_id = extract_task_id_from_filename(file_path.name)
+    if task_id is None:
+        return [], failures, first_error
+    return [(task_id, success)], failures, first_error
+
+def read_head(path):
+    """The first SNIFF_BYTES of a file without leading whitespace, and
+    whether that is the whole file"""
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        head = f.read(SNIFF_BYTES)
+    return head.lstrip(), len(head) < SNIFF_BYTES
+
+def detect_format(path, hint=None):
+    """The TrajectoryFormat of a file, or None if it is not recognised.
+
+    The hinted (declared) format wins unless it positively rejects the file;
+    then the first registered match, falling back to the hint itself.
+    """
+    head, complete = read_head(path)
+    declared = FORMATS.get(hint)
+    if declared is not None and not declared.rejects(path, head, complete):
+        return declared
+    for fmt in FORMATS.values():
+        if fmt.matches(path, head):
+            return fmt
+    return declared
+
+def extract_file(path, hint=None):
+    """Detect a file's format and extract it.
+
+    Returns (format_name, pairs, failures, first_error); format_name is None
+    for unrecognized files.
+    """
+    fmt = detect_format(path, hint)
+    if fmt is None:
+        return None, [], 0, None
+    if fmt.line_based:
+        return (fmt.name, *extract_jsonl_file(path, fmt.extract))
+    return (fmt.name, *extract_json_file(path, fmt.extract))
+
+# Step records (for trajectory_store.py)
+
+# Fields holding a record's step list, tried in order
+STEP_KEYS = ('trajectory', 'steps', 'actions', 'history', 'messages', 'log')
+
+def record_steps(record):
+    """The steps of a trajectory record: the record itself if it is a list,
+    else its first list-valued STEP_KEYS field, else [record]"""
+    if isinstance(record, list):
+        return record
+    if isinstance(record, dict):
+        for key in STEP_KEYS:
+            if isinstance(record.get(key), list):
+                return record[key]
+    return [record]
+
+def extract_file_steps(path, hint=None):
+    """Detect a file's format and read the full step list of each task.
+
+    Returns (format_name, [(task_id, steps)], failures, first_error), with
+    the task ids extract_file() reports for the same file.
+    """
+    fmt = detect_format(path, hint)
+    if fmt is None:
+        return None, [], 0, None
+
+    tasks = []
+    failures = 0
+    first_error = None
+    if fmt.line_based:
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    task_id, _ = fmt.extract(line)
+                    steps = record_steps(json.loads(line))
+                except Exception as e:
+                    failures += 1
+                    first_error = first_error or describe_error(e)
+                    continue
+                if task_id is not None:
+                    tasks.append((task_id, steps))
+        return fmt.name, tasks, failures, first_error
+
+    try:
+        task_id, _ = fmt.extract(path)
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            steps = record_steps(json.load(f))
+    except Exception as e:
+        return fmt.name, [], 1, describe_error(e)
+    if task_id is None:
+        task_id = extract_task_id_from_filename(path.name)
+    if task_id is not None:
+        tasks.append((task_id, steps))
+    return fmt.name, tasks, failures, first_error
+
+def _scan_files(dir_path, suffixes):
+    with os.scandir(dir_path) as entries:
+        return [dir_path / entry.name for entry in entries
+                if entry.is_file() and entry.name.endswith(suffixes)
+                and not entry.name.startswith('.')]
+
+def file_suffixes(hint=None):
+    """File suffixes to list for a declared format (any trajectory suffix
+    without one)"""
+    fmt = FORMATS.get(hint)
+    if fmt is None:
+        return TRAJECTORY_SUFFIXES
+    return tuple(suffix for suffix in fmt.suffixes if suffix)
+
+def list_trajectory_files(path, hint=None):
+    """Trajectory files of one model: the path itself if it is a file,
+    otherwise its files with the declared format's suffixes, or those of its
+    subdirectories"""
+    if path.is_file():
+        return [path]
+    if not path.is_dir():
+        return []
+
+    suffixes = file_suffixes(hint)
+    files = _scan_files(path, suffixes)
+    if not files:
+        # Check subdirectories
+        for subdir in path.iterdir():
+            if subdir.is_dir():
+                files.extend(_scan_files(subdir, suffixes))
+    return files
@@ -1,48 +1,378 @@
 #!/usr/bin/env python3
 """
-Fetch WebArena leaderboard data from Google Sheets and save as JSON.
+Fetch benchmark leaderboards and save them as JSON.
+
+All configured sources are fetched concurrently. Requests are conditional
+(ETag / If-Modified-Since), using validators remembered in
+data/.cache/fetch_state.json, and are retried with exponential backoff on
+timeouts, connection errors, 429 and 5xx responses.
+
+An output file is only rewritten when its content changes (compared by
+hash, ignoring the last_updated timestamp), so an unchanged sheet does not
+produce a new commit and redeploy.
+
+CSV sheets are parsed with the standard library csv module, mirroring
+pandas.read_csv (missing cells become null, numeric and boolean columns
+are converted), so the script starts fast and needs no third-party
+packages. --pandas parses with pandas instead, if it is installed.
+
+After fetching the WebArena sheet, its rows are matched to the models with
+trajectories (model_names.NameIndex, as normalize_data.py does); models
+left without a row and ambiguous names are printed as warnings.
+
+Sources:
+    Only the WebArena Google Sheet has a built-in URL. OSWorld,
+    VisualWebArena and EconWebArena publish no stable machine-readable
+    endpoint, so they are listed without one and skipped with a message
+    until a URL is configured through --sources. --sources adds or overrides
+    sources from a JSON list of {"name", "url", "format", "output"}
+    objects, where format is "csv" (a sheet with Model and Success Rate (%)
+    columns) or "json" (a leaderboard document saved as is), and optionally
+    "check_models": true to run the name check above. This also
+    allows running against a local HTTP stand-in:
+
+    [{"name": "osworld", "url": "http://127.0.0.1:8000/osworld.json",
+      "format": "json", "output": "data/osworld_leaderboard.json"}]
+
+    scripts/test_fetch_leaderboard.py runs the fetcher against such a
+    stand-in (python -m unittest scripts/test_fetch_leaderboard.py).
+
+Usage:
+    python scripts/fetch_leaderboard.py
+    python scripts/fetch_leaderboard.py --sources sources.json --only osworld
+    python scripts/fetch_leaderboard.py --timeout 10 --retries 5
+    python scripts/fetch_leaderboard.py --pandas
 """
 
-import pandas as pd
+import argparse
+import asyncio
+import csv
+import hashlib
+import io
 import json
+import os
+import random
+import re
+import sys
+import urllib.error
+import urllib.request
 from datetime import datetime
+from pathlib import Path
+
+from model_names import MODEL_NAME_ALIASES, MODEL_NAME_MAP, NameIndex, describe_issue
 
 # Google Sheets CSV export URL
 SPREADSHEET_ID = "1M801lEpBbKSNwP-vDBkC_pF7LdyGU1f_ufZb_NWNBZQ"
 GID = "0"
 CSV_URL = f"https://docs.google.com/spreadsheets/d/{SPREADSHEET_ID}/export?format=csv&gid={GID}"
 
-def fetch_and_save_leaderboard():
-    """Fetch leaderboard data and save as JSON."""
+# A source without a url is skipped until --sources configures one
+SOURCES = [
+    {"name": "webarena", "url": CSV_URL, "format": "csv", "output": "data/leaderboard.json", "check_models": True},
+    {"name": "osworld", "url": None, "format": "json", "output": "data/osworld_leaderboard.json"},
+    {"name": "visualwebarena", "url": None, "format": "json", "output": "data/visualwebarena_leaderboard.json"},
+    {"name": "econwebarena", "url": None, "format": "json", "output": "data/econwebarena_leaderboard.json"},
+]
+
+DEFAULT_STATE_FILE = Path("data/.cache/fetch_state.json")
+USER_AGENT = "webarena-benchmark-fetcher"
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+VOLATILE_KEYS = ("last_updated",)
+
+class FetchError(Exception):
+    """A source could not be fetched after all retries"""
+
+def http_get(url, headers, timeout):
+    """Blocking GET; returns (status, headers, body). 304 is returned, not raised."""
+    request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT, **headers})
     try:
-        # Read CSV from Google Sheets
-        df = pd.read_csv(CSV_URL)
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.status, dict(response.headers), response.read()
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return 304, dict(e.headers), b''
+        raise
 
-        # Clean up data: remove rows where Model is NaN or empty
-        df_clean = df[df['Model'].notna() & (df['Model'].str.strip() != '')]
+def conditional_headers(source_state):
+    headers = {}
+    if source_state.get("etag"):
+        headers["If-None-Match"] = source_state["etag"]
+    if source_state.get("last_modified"):
+        headers["If-Modified-Since"] = source_state["last_modified"]
+    return headers
 
-        # Remove rows with NaN Success Rate (these are usually headers/notes)
-        df_clean = df_clean[df_clean['Success Rate (%)'].notna()]
+def is_retryable(error):
+    if isinstance(error, urllib.error.HTTPError):
+        return error.code in RETRY_STATUSES
+    return isinstance(error, (urllib.error.URLError, TimeoutError, ConnectionError, OSError))
 
-        # Replace NaN with None for JSON serialization
-        df_clean = df_clean.where(pd.notna(df_clean), None)
+async def fetch_source(source, source_state, semaphore, timeout, retries, backoff):
+    """Conditionally GET a source, retrying transient failures"""
+    headers = conditional_headers(source_state)
+    for attempt in range(retries + 1):
+        try:
+            async with semaphore:
+                # The socket timeout bounds each read; wait_for bounds the whole request
+                return await asyncio.wait_for(
+                    asyncio.to_thread(http_get, source["url"], headers, timeout), timeout * 2
+                )
+        except Exception as e:
+            if attempt == retries or not is_retryable(e):
+                raise FetchError(f"{type(e).__name__}: {e}") from e
+            delay = backoff * 2 ** attempt * (1 + random.random())
+            print(f"   ⚠️  {source['name']}: {type(e).__name__}: {e} - retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
 
-        # Convert to JSON format
-        data = {
-            "last_updated": datetime.utcnow().isoformat() + "Z",
-            "leaderboard": df_clean.to_dict('records')
-        }
+# pandas.read_csv defaults, so both CSV paths produce the same records
+NA_VALUES = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+])
+TRUE_VALUES = frozenset(['True', 'TRUE', 'true'])
+FALSE_VALUES = frozenset(['False', 'FALSE', 'false'])
+INT_PATTERN = re.compile(r'\s*[+-]?\d+\s*\Z')
+FLOAT_PATTERN = re.compile(r'\s*[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?\s*\Z')
 
-        # Save to file
-        with open('data/leaderboard.json', 'w') as f:
-            json.dump(data, f, indent=2)
+def dedup_names(header):
+    """Column names as pandas gives them: blank -> "Unnamed: i", repeats -> "name.1" """
+    counts = {}
+    names = []
+    for i, name in enumerate(header):
+        name = name or f"Unnamed: {i}"
+        count = counts.get(name, 0)
+        while count > 0:
+            counts[name] = count + 1
+            name = f"{name}.{count}"
+            count = counts.get(name, 0)
+        names.append(name)
+        counts[name] = count + 1
+    return names
 
-        print(f"✅ Successfully fetched {len(df_clean)} entries")
-        print(f"📊 Columns: {list(df_clean.columns)}")
+def infer_column(values):
+    """Convert one column of raw cells (None = missing) the way pandas infers dtypes"""
+    present = [value for value in values if value is not None]
+    if not present:
+        return values
+    if all(INT_PATTERN.match(value) for value in present):
+        # An integer column with missing cells becomes float in pandas
+        convert = int if len(present) == len(values) else float
+        return [None if value is None else convert(value) for value in values]
+    if all(FLOAT_PATTERN.match(value) for value in present):
+        return [None if value is None else float(value) for value in values]
+    if all(value in TRUE_VALUES or value in FALSE_VALUES for value in present):
+        return [None if value is None else value in TRUE_VALUES for value in values]
+    return values
 
-    except Exception as e:
-        print(f"❌ Error fetching data: {e}")
-        raise
+def read_csv_records(text):
+    """Parse CSV text into a list of dicts, with pandas.read_csv semantics for
+    column names, missing values (None) and numeric/boolean columns"""
+    rows = [row for row in csv.reader(io.StringIO(text, newline='')) if row]
+    if not rows:
+        raise ValueError("empty CSV")
+    names = dedup_names(rows[0])
+    columns = [[] for _ in names]
+    for line, row in enumerate(rows[1:], start=2):
+        if len(row) > len(names):
+            raise ValueError(f"expected {len(names)} fields in line {line}, saw {len(row)}")
+        row = row + [''] * (len(names) - len(row))
+        for column, value in zip(columns, row):
+            column.append(None if value in NA_VALUES else value)
+    columns = [infer_column(column) for column in columns]
+    return [dict(zip(names, values)) for values in zip(*columns)]
+
+def clean_leaderboard(records):
+    """Drop rows without a Model or a Success Rate (these are usually headers/notes)"""
+    return [
+        record for record in records
+        if record.get('Model') is not None
+        and not (isinstance(record['Model'], str) and record['Model'].strip() == '')
+        and record.get('Success Rate (%)') is not None
+    ]
+
+def leaderboard_document(records):
+    return {
+        "last_updated": datetime.utcnow().isoformat() + "Z",
+        "leaderboard": records,
+    }
+
+def leaderboard_from_csv(body):
+    """Clean a leaderboard sheet export into the data/leaderboard.json document"""
+    records = read_csv_records(body.decode('utf-8-sig'))
+    if records and ('Model' not in records[0] or 'Success Rate (%)' not in records[0]):
+        raise ValueError("expected Model and Success Rate (%) columns")
+    if records and not any(isinstance(record['Model'], str) for record in records):
+        raise ValueError("the Model column has no text values")
+    return leaderboard_document(clean_leaderboard(records))
+
+def leaderboard_from_csv_pandas(body):
+    """leaderboard_from_csv() using pandas (--pandas)"""
+    import pandas as pd
+
+    # Read CSV from Google Sheets
+    df = pd.read_csv(io.BytesIO(body))
+
+    # Clean up data: remove rows where Model is NaN or empty
+    df_clean = df[df['Model'].notna() & (df['Model'].str.strip() != '')]
+
+    # Remove rows with NaN Success Rate (these are usually headers/notes)
+    df_clean = df_clean[df_clean['Success Rate (%)'].notna()]
+
+    # Replace NaN with None for JSON serialization
+    df_clean = df_clean.astype(object).where(pd.notna(df_clean), None)
+
+    return leaderboard_document(df_clean.to_dict('records'))
+
+def leaderboard_from_json(body):
+    data = json.loads(body)
+    if not isinstance(data, dict) or not isinstance(data.get("leaderboard"), list):
+        raise ValueError("expected an object with a 'leaderboard' list")
+    return data
+
+CONVERTERS = {
+    "csv": leaderboard_from_csv,
+    "json": leaderboard_from_json,
+}
+
+def content_digest(document):
+    """Hash of a leaderboard document, ignoring volatile keys such as last_updated"""
+    stable = {key: value for key, value in document.items() if key not in VOLATILE_KEYS}
+    return hashlib.sha256(json.dumps(stable, sort_keys=True).encode()).hexdigest()
+
+def existing_digest(path):
+    """content_digest() of the current output file, or None"""
+    try:
+        with open(path, 'r') as f:
+            return content_digest(json.load(f))
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def write_atomic(path, document):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(document, f, indent=2)
+    os.replace(tmp_path, path)
+
+def model_name_warnings(document):
+    """Trajectory models the sheet no longer joins to, and ambiguous names"""
+    name_index = NameIndex(MODEL_NAME_MAP, MODEL_NAME_ALIASES)
+    joined, issues = name_index.join([entry.get('Model') for entry in document['leaderboard']])
+    warnings = [describe_issue(issue) for issue in issues]
+    warnings += [f"no leaderboard entry matches {model_id} ({name})"
+                 for model_id, name in MODEL_NAME_MAP.items() if model_id not in joined]
+    return warnings
+
+async def update_source(source, state, semaphore, args):
+    """Fetch one source and write its output if the content changed; returns a status line"""
+    output = Path(source["output"])
+    # Without the output file a 304 would leave nothing to keep
+    source_state = state.get(source["name"], {}) if output.exists() else {}
+    status, headers, body = await fetch_source(
+        source, source_state, semaphore, args.timeout, args.retries, args.backoff
+    )
+    if status == 304:
+        return "not modified (304)"
+
+    converter = CONVERTERS[source["format"]]
+    if source["format"] == "csv" and args.pandas:
+        converter = leaderboard_from_csv_pandas
+    document = converter(body)
+    if source.get("check_models"):
+        for warning in model_name_warnings(document):
+            print(f"   ⚠️  {source['name']}: {warning}")
+    digest = content_digest(document)
+    # Validators are only remembered once the output holds this content,
+    # otherwise a failed write would be answered with 304 from then on
+    source_state = {
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+        "sha256": digest,
+    }
+    if digest == existing_digest(output):
+        state[source["name"]] = source_state
+        return f"unchanged ({len(document['leaderboard'])} entries)"
+
+    write_atomic(output, document)
+    state[source["name"]] = source_state
+    return f"updated {output} ({len(document['leaderboard'])} entries)"
+
+async def update_all(sources, state, args):
+    semaphore = asyncio.Semaphore(args.concurrency)
+    return await asyncio.gather(
+        *(update_source(source, state, semaphore, args) for source in sources),
+        return_exceptions=True,
+    )
+
+def load_state(path):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_state(path, state):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def load_sources(path):
+    """Built-in sources, overridden or extended by a --sources file"""
+    sources = {source["name"]: source for source in SOURCES}
+    if path is not None:
+        with open(path, 'r') as f:
+            for source in json.load(f):
+                missing = {"name", "url", "format", "output"} - source.keys()
+                if missing:
+                    raise SystemExit(f"Source {source.get('name', '?')} is missing {', '.join(sorted(missing))}")
+                if source["format"] not in CONVERTERS:
+                    raise SystemExit(f"Source {source['name']}: unknown format {source['format']!r}")
+                sources[source["name"]] = source
+    return list(sources.values())
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Fetch benchmark leaderboards and save them as JSON")
+    parser.add_argument("--sources", type=Path, help="JSON list of extra or overriding sources")
+    parser.add_argument("--only", action="append", help="Only fetch this source (repeatable)")
+    parser.add_argument(
+        "--state", type=Path, default=DEFAULT_STATE_FILE,
+        help=f"ETag / Last-Modified state file (default: {DEFAULT_STATE_FILE})",
+    )
+    parser.add_argument("--timeout", type=float, default=30, help="Per-request timeout in seconds")
+    parser.add_argument("--retries", type=int, default=3, help="Retries per source for transient errors")
+    parser.add_argument("--backoff", type=float, default=1.0, help="Initial retry delay in seconds")
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum concurrent requests")
+    parser.add_argument(
+        "--pandas", action="store_true",
+        help="Parse CSV sources with pandas instead of the csv module (same output)",
+    )
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    sources = load_sources(args.sources)
+    if args.only:
+        sources = [source for source in sources if source["name"] in args.only]
+    for source in sources:
+        if not source["url"]:
+            print(f"⏭️  {source['name']}: no URL configured (set one with --sources) - skipped")
+    sources = [source for source in sources if source["url"]]
+
+    state = load_state(args.state)
+    outcomes = asyncio.run(update_all(sources, state, args))
+    save_state(args.state, state)
+
+    failed = 0
+    for source, outcome in zip(sources, outcomes):
+        if isinstance(outcome, Exception):
+            failed += 1
+            print(f"❌ Error fetching {source['name']}: {outcome}")
+        else:
+            print(f"✅ {source['name']}: {outcome}")
+
+    if failed:
+        sys.exit(1)
 
 if __name__ == "__main__":
-    fetch_and_save_leaderboard()
+    main()
@@ -0,0 +1,287 @@
+"""
+Streaming JSON field extraction for large trajectory files
+
+Trajectory dumps can be several MB, mostly screenshots and accessibility
+trees that the normalizer never looks at. load_pruned() walks a document
+in fixed-size chunks and only builds the parts selected by the caller.
+Values that fit in the current chunk are skipped with a single C-level
+raw_decode call; values that straddle a chunk boundary are walked
+structurally, so memory stays bounded by the chunk size plus whatever
+was selected.
+
+Example:
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        data = load_pruned(f, trajectory_fields, tail_arrays={('trajectory',)})
+    # {'id': 12, 'trajectory': [{'success': True}]}
+
+Tests (against json.loads, with tiny chunks):
+    python -m unittest scripts/test_json_scan.py
+"""
+
+import json
+import re
+
+CHUNK_SIZE = 1 << 18
+
+# Selector results: drop a value, keep it whole, or keep only selected children
+SKIP = False
+KEEP = True
+PRUNE = 'prune'
+
+_SKIPPED = object()
+_INCOMPLETE = object()
+_decoder = json.JSONDecoder()
+_DELIMITERS = frozenset(' \t\n\r,]}')
+
+_NON_WHITESPACE = re.compile(r'\S')
+_SCALAR_END = re.compile(r'[\s,\]}]')
+
+class _Reader:
+    """Chunked text buffer that discards everything before the read position"""
+
+    def __init__(self, f):
+        self.f = f
+        self.buf = ''
+        self.pos = 0
+        self.mark = None  # start of a token that must survive a refill
+        self.eof = False
+
+    def fill(self):
+        """Read another chunk; returns False at end of file"""
+        if self.eof:
+            return False
+        chunk = self.f.read(CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        keep = self.pos if self.mark is None else self.mark
+        self.buf = self.buf[keep:] + chunk
+        self.pos -= keep
+        if self.mark is not None:
+            self.mark -= keep
+        return True
+
+    def search(self, pattern):
+        """Move past the next match of pattern and return the matched text"""
+        while True:
+            match = pattern.search(self.buf, self.pos)
+            if match:
+                self.pos = match.end()
+                return match.group()
+            self.pos = len(self.buf)
+            if not self.fill():
+                raise ValueError("Unexpected end of JSON input")
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it"""
+        self.search(_NON_WHITESPACE)
+        self.pos -= 1
+        return self.buf[self.pos]
+
+    def next(self):
+        """Consume and return the next non-whitespace character"""
+        return self.search(_NON_WHITESPACE)
+
+    def expect(self, char):
+        if self.next() != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos}")
+
+    def skip_string(self):
+        """Skip to just past the closing quote (opening quote already consumed)"""
+        quote = None  # next quote in the buffer, -1 if there is none
+        while True:
+            if quote is None or quote != -1 and quote < self.pos:
+                quote = self.buf.find('"', self.pos)
+            end = len(self.buf) if quote == -1 else quote
+            backslash = self.buf.find('\\', self.pos, end)
+            if backslash != -1:
+                # Step over the escaped character, which may be a quote
+                self.pos = backslash + 1
+                if self.pos >= len(self.buf):
+                    if not self.fill():
+                        raise ValueError("Unexpected end of JSON input")
+                    quote = None
+                self.pos += 1
+            elif quote != -1:
+                self.pos = quote + 1
+                return
+            else:
+                self.pos = len(self.buf)
+                if not self.fill():
+                    raise ValueError("Unexpected end of JSON input")
+                quote = None
+
+    def read_string(self):
+        """Decode a string (opening quote already consumed)"""
+        self.mark = self.pos - 1
+        self.skip_string()
+        raw = self.buf[self.mark:self.pos]
+        self.mark = None
+        return json.loads(raw)
+
+    def read_scalar(self):
+        """Decode a number, true, false or null"""
+        self.mark = self.pos
+        while True:
+            match = _SCALAR_END.search(self.buf, self.pos)
+            if match:
+                self.pos = match.start()
+                break
+            self.pos = len(self.buf)
+            if not self.fill():
+                break
+        raw = self.buf[self.mark:self.pos]
+        self.mark = None
+        return json.loads(raw)
+
+    def try_decode(self):
+        """Decode the next value with one C-level call if it is fully buffered.
+
+        Returns _INCOMPLETE (leaving the position unchanged) when the value
+        runs past the end of the buffer or is malformed.
+        """
+        self.peek()
+        try:
+            value, end = _decoder.raw_decode(self.buf, self.pos)
+        except ValueError:
+            return _INCOMPLETE
+        if end >= len(self.buf):
+            if not self.eof:
+                return _INCOMPLETE
+        elif self.buf[end] not in _DELIMITERS:
+            # A number cut short by the end of the chunk, e.g. "1.5" of "1.5e-07"
+            return _INCOMPLETE
+        self.pos = end
+        return value
+
+    def skip_value(self):
+        """Skip any value, walking it structurally only across chunk boundaries"""
+        if self.try_decode() is not _INCOMPLETE:
+            return
+        char = self.next()
+        if char == '"':
+            self.skip_string()
+        elif char == '{':
+            if self.peek() == '}':
+                self.pos += 1
+                return
+            while True:
+                if self.next() != '"':
+                    raise ValueError(f"Expected object key at offset {self.pos}")
+                self.skip_string()
+                self.expect(':')
+                self.skip_value()
+                char = self.next()
+                if char == '}':
+                    return
+                if char != ',':
+                    raise ValueError(f"Expected ',' or '}}' at offset {self.pos}")
+        elif char == '[':
+            if self.peek() == ']':
+                self.pos += 1
+                return
+            while True:
+                self.skip_value()
+                char = self.next()
+                if char == ']':
+                    return
+                if char != ',':
+                    raise ValueError(f"Expected ',' or ']' at offset {self.pos}")
+        else:
+            self.pos -= 1
+            self.read_scalar()
+
+def _keep_all(path):
+    return KEEP
+
+def _parse_child(reader, path, select, tail_arrays):
+    """Parse or skip one member/element according to select(path)"""
+    mode = select(path)
+    if not mode:
+        reader.skip_value()
+        return _SKIPPED
+    if mode == PRUNE:
+        return _parse(reader, path, select, tail_arrays)
+    value = reader.try_decode()
+    if value is _INCOMPLETE:
+        value = _parse(reader, path, _keep_all, ())
+    return value
+
+def _parse(reader, path, select, tail_arrays):
+    char = reader.peek()
+
+    if char == '{':
+        reader.pos += 1
+        obj = {}
+        if reader.peek() == '}':
+            reader.pos += 1
+            return obj
+        while True:
+            if reader.next() != '"':
+                raise ValueError(f"Expected object key at offset {reader.pos}")
+            key = reader.read_string()
+            reader.expect(':')
+            value = _parse_child(reader, path + (key,), select, tail_arrays)
+            if value is not _SKIPPED:
+                obj[key] = value
+            char = reader.next()
+            if char == '}':
+                return obj
+            if char != ',':
+                raise ValueError(f"Expected ',' or '}}' at offset {reader.pos}")
+
+    if char == '[':
+        reader.pos += 1
+        items = []
+        if reader.peek() == ']':
+            reader.pos += 1
+            return items
+        tail_only = path in tail_arrays
+        index = 0
+        while True:
+            value = _parse_child(reader, path + (index,), select, tail_arrays)
+            if value is not _SKIPPED:
+                if tail_only:
+                    items[:] = [value]
+                else:
+                    items.append(value)
+            index += 1
+            char = reader.next()
+            if char == ']':
+                return items
+            if char != ',':
+                raise ValueError(f"Expected ',' or ']' at offset {reader.pos}")
+
+    if char == '"':
+        reader.pos += 1
+        return reader.read_string()
+
+    return reader.read_scalar()
+
+def load_pruned(f, select, tail_arrays=()):
+    """Stream-parse a JSON document from a text file object, keeping only selected parts.
+
+    select(path) is called with the key/index path of every member and
+    element of a pruned container and returns SKIP, KEEP (decode the whole
+    value) or PRUNE (descend, consulting select for its children). The root
+    is always pruned. Arrays whose path is in tail_arrays keep only their
+    last kept element.
+    """
+    return _parse(_Reader(f), (), select, frozenset(tail_arrays))
+
+def trajectory_fields(path):
+    """Selector for the top-level id/score/success plus each trajectory step's success"""
+    if len(path) == 1:
+        if path[0] == 'trajectory':
+            return PRUNE
+        return path[0] in ('id', 'task_id', 'score', 'success')
+    if path[0] != 'trajectory':
+        return SKIP
+    if len(path) == 2:
+        return PRUNE
+    return len(path) == 3 and path[2] == 'success'
+
+def load_trajectory_fields(f):
+    """Stream-parse a trajectory file, keeping only id, task_id, score,
+    success and the last trajectory step's success."""
+    return load_pruned(f, trajectory_fields, tail_arrays={('trajectory',)})
@@ -0,0 +1,191 @@
+"""
+Model name resolution for leaderboard <-> trajectory joins
+
+NameIndex resolves free-form leaderboard names ("ScribeAgent + GPT-4o",
+"GUI-API Hybrid Agent") to model ids. It is built once from each id's
+display name and aliases, then reused for every row: normalize_data.py
+uses it to build models.json, and fetch_leaderboard.py to report sheet
+rows that stop joining after a fetch.
+
+MODEL_ALIASES is the one table of names a model is listed under besides
+its canonical name. NameIndex gets the trajectory models' share of it
+(MODEL_NAME_ALIASES), and benchmark_store.py folds every alias into its
+canonical name (canonical_name()) across leaderboards.
+
+Matching, best first:
+1. exact: the names are equal ignoring case, spacing and punctuation
+2. tokens: all tokens of one name appear in the other, and the shared
+   tokens include a distinctive one (not in GENERIC_TOKENS and held by a
+   single model), so "Agent" alone matches nothing; scored by the Jaccard
+   similarity of the two token sets
+3. fuzzy: similar spelling (difflib ratio of the keys >= FUZZY_THRESHOLD)
+
+Candidates are ranked by (method, score); a name whose best rank is shared
+by several ids is ambiguous and does not resolve. join() also reports ids
+claimed by several rows and keeps the best-matching row (the first in row
+order on ties).
+
+Tests: python -m unittest scripts/test_model_names.py
+"""
+
+import difflib
+import re
+from collections import namedtuple
+
+# Display names of the models with trajectories, used to match leaderboard entries to model ids
+MODEL_NAME_MAP = {
+    "deepsky": "DeepSky Agent",
+    "jace": "Jace.AI",
+    "gui_hybrid": "GUI-API Hybrid",
+    "agentoccam": "AgentOccam",
+    "ibm_cuga": "IBM CUGA",
+    "learn_by_interact": "Learn-by-Interact",
+    "narada": "Narada AI",
+    "openai_operator": "OpenAI Operator",
+    "scribeagent": "ScribeAgent",
+    "step": "SteP"
+}
+
+# Canonical model name -> other names it is listed under, on any leaderboard
+MODEL_ALIASES = {
+    "OpenAI Operator": ["OpenAI CUA", "OpenAI CUA 4o"],
+    "Claude 4 Sonnet": ["Claude Sonnet 4"],
+    "GPT-4o": ["gpt-4o-2024-05-13"],
+    "Gemini Pro": ["Gemini-Pro (text-only)"],
+    "Mixtral-8x7B": ["Mixtral"],
+}
+
+# The same aliases by trajectory model id, for NameIndex
+MODEL_NAME_ALIASES = {
+    model_id: MODEL_ALIASES[name] for model_id, name in MODEL_NAME_MAP.items() if name in MODEL_ALIASES
+}
+
+_CANONICAL_NAMES = {alias: name for name, aliases in MODEL_ALIASES.items() for alias in aliases}
+
+FUZZY_THRESHOLD = 0.85
+
+# Tokens too common in agent names to identify a model on their own
+GENERIC_TOKENS = {"agent", "ai", "the"}
+
+# Match methods, strongest first
+EXACT, TOKENS, FUZZY = "exact", "tokens", "fuzzy"
+METHOD_RANK = {EXACT: 2, TOKENS: 1, FUZZY: 0}
+
+Match = namedtuple("Match", "model_id method score")
+
+def name_tokens(name):
+    """Lowercase alphanumeric tokens of a name"""
+    return tuple(re.findall(r'[0-9a-z]+', name.casefold()))
+
+def name_key(name):
+    """A name with case, spacing and punctuation removed"""
+    return ''.join(name_tokens(name))
+
+def canonical_name(name):
+    """The canonical name of a model listed under an alias, else name"""
+    return _CANONICAL_NAMES.get(name, name)
+
+def match_rank(match):
+    return (METHOD_RANK[match.method], match.score)
+
+class NameIndex:
+    """Token and key index over model names, for resolving leaderboard rows"""
+
+    def __init__(self, names, aliases=None):
+        """names maps model id -> display name; aliases maps id -> extra names"""
+        aliases = aliases or {}
+        self.variants = {}   # model id -> [(key, token set)]
+        self.by_key = {}     # key -> model ids
+        self.by_token = {}   # token -> model ids
+        for model_id, name in names.items():
+            for variant in [name, *aliases.get(model_id, [])]:
+                tokens = name_tokens(variant)
+                key = ''.join(tokens)
+                if not key:
+                    continue
+                self.variants.setdefault(model_id, []).append((key, frozenset(tokens)))
+                self.by_key.setdefault(key, set()).add(model_id)
+                for token in tokens:
+                    self.by_token.setdefault(token, set()).add(model_id)
+
+    def is_distinctive(self, token):
+        """Whether a shared token can identify a model"""
+        return token not in GENERIC_TOKENS and len(self.by_token.get(token, ())) == 1
+
+    def candidates(self, name):
+        """Every id that matches name, best first"""
+        tokens = frozenset(name_tokens(name))
+        key = ''.join(name_tokens(name))
+        if not key:
+            return []
+
+        matches = [Match(model_id, EXACT, 1.0) for model_id in self.by_key.get(key, ())]
+        exact = {match.model_id for match in matches}
+
+        # Only ids sharing a distinctive token with the name can match on tokens
+        distinctive = {token for token in tokens if self.is_distinctive(token)}
+        token_ids = set().union(*(self.by_token.get(token, ()) for token in distinctive)) - exact
+        for model_id in token_ids:
+            scores = [len(tokens & variant) / len(tokens | variant)
+                      for _, variant in self.variants[model_id]
+                      if (tokens <= variant or variant <= tokens) and distinctive & variant]
+            if scores:
+                matches.append(Match(model_id, TOKENS, round(max(scores), 3)))
+
+        if not matches:
+            for model_id, variants in self.variants.items():
+                ratio = max(difflib.SequenceMatcher(None, key, variant_key).ratio()
+                            for variant_key, _ in variants)
+                if ratio >= FUZZY_THRESHOLD:
+                    matches.append(Match(model_id, FUZZY, round(ratio, 3)))
+
+        return sorted(matches, key=lambda match: (match_rank(match), match.model_id), reverse=True)
+
+    def resolve(self, name):
+        """(Match or None, ambiguous candidates) for one name"""
+        matches = self.candidates(name)
+        if not matches:
+            return None, []
+        best = [match for match in matches if match_rank(match) == match_rank(matches[0])]
+        if len(best) > 1:
+            return None, sorted(match.model_id for match in best)
+        return matches[0], []
+
+    def join(self, names):
+        """Match a list of names (e.g. leaderboard rows) to ids.
+
+        Returns ({model_id: (row index, Match)}, issues). Issues are dicts
+        with kind "ambiguous" (a name matching several ids equally well) or
+        "duplicate" (an id matched by several rows; the best one is kept).
+        """
+        claims = {}
+        issues = []
+        for row, name in enumerate(names):
+            if not isinstance(name, str):
+                continue
+            match, ambiguous = self.resolve(name)
+            if ambiguous:
+                issues.append({"kind": "ambiguous", "name": name, "candidates": ambiguous})
+            if match is not None:
+                claims.setdefault(match.model_id, []).append((row, match))
+
+        joined = {}
+        for model_id, rows in claims.items():
+            # Best match wins; on equal matches, the earliest row
+            best = min(rows, key=lambda claim: (-METHOD_RANK[claim[1].method], -claim[1].score, claim[0]))
+            joined[model_id] = best
+            if len(rows) > 1:
+                issues.append({
+                    "kind": "duplicate",
+                    "model_id": model_id,
+                    "names": [names[row] for row, _ in rows],
+                    "kept": names[best[0]],
+                })
+        return joined, issues
+
+def describe_issue(issue):
+    """One-line description of a join() issue"""
+    if issue["kind"] == "ambiguous":
+        return f"'{issue['name']}' matches {', '.join(issue['candidates'])} equally well - not joined"
+    others = [name for name in issue["names"] if name != issue["kept"]]
+    return f"{issue['model_id']}: kept '{issue['kept']}' over {', '.join(repr(name) for name in others)}"
@@ -12,299 +12,300 @@ Output files (in web/public/data/):
 - leaderboard.json: Pre-aggregated leaderboard with domain breakdown (~7KB)
 - task_difficulty.json: Per-task statistics (~128KB)
 - heatmap_data.json: Full performance matrix for visualization (~104KB)
+- search_index.json: Inverted index over task text for the task search (~130KB)
+- benchmarks.json: All benchmark leaderboards with shared model ids (~40KB)
+- analytics.json: Bootstrap confidence intervals and pairwise significance tests (~30KB)
+- clusters.json: Task and model similarity orders for the heatmap (~45KB, minified)
 
-Total size: ~881KB (uncompressed), ~200KB gzipped
+Each run prints the size of every file it writes and their total;
+--precompress also reports the gzip and brotli sizes.
 
 Usage:
     python scripts/normalize_data.py
+    python scripts/normalize_data.py --workers 8    # parallel extraction
+    python scripts/normalize_data.py --workers 0    # one worker per CPU
+    python scripts/normalize_data.py --full         # ignore the extraction cache
+    python scripts/normalize_data.py --compact      # also write compact exports
+    python scripts/normalize_data.py --precompress  # also write .gz/.br + hashed copies
+    python scripts/normalize_data.py --shards       # also write lazy-loading shards
+    python scripts/normalize_data.py --update narada  # patch artifacts for one changed model
+    python scripts/normalize_data.py --watch        # keep artifacts current as trajectories change
+    python scripts/normalize_data.py --stream       # write large artifacts record by record
+    python scripts/normalize_data.py --ndjson       # ... as results/task_difficulty/heatmap_data.ndjson
+    python scripts/normalize_data.py --resamples 2000  # fewer bootstrap resamples for analytics.json
+    python scripts/normalize_data.py --trajectory-store  # also pack steps into data/trajectory_store/
+    python scripts/normalize_data.py --report data/.cache/report.json  # timings, failures, memory
+    python scripts/normalize_data.py --cprofile normalize.prof         # cProfile stats
+
+Extracted results are cached in data/.cache/extraction_manifest.json, so
+later runs only re-parse trajectory files that are new or have changed.
+
+--stream generates the task, result, task difficulty and heatmap records
+while writing them, in the same indent=2 layout, instead of building them
+as lists first. Memory then no longer grows with the number of records;
+it stays bounded by the extracted results and the int8 results matrix.
+--ndjson also streams, writing those three artifacts as one minified
+record per line in place of their .json files (which it removes).
+
+--update MODEL_ID re-extracts a single model and patches the existing
+artifacts instead of rebuilding them: its heatmap column, leaderboard
+entry, results records and the task_difficulty counts it affects.
+analytics.json and clusters.json are recomputed from the patched results
+(they depend on every model), benchmarks.json from the new models.json.
+tasks.json and search_index.json are left untouched. The result is the
+same as a full run, as long as nothing else (other models, the task
+suite) changed since the artifacts were written. Updated artifacts are
+written to web/public/data/.staging/ first and then renamed into place,
+so readers never see a partially written file. Compact copies, shards and
+precompressed files from earlier --compact/--shards/--precompress runs
+are regenerated in the same swap (full runs regenerate them too), so
+none of them goes stale. scripts/test_normalize_update.py checks the
+equality with a full run on a small synthetic tree.
+
+--watch runs once, then watches data/trajectories/ (inotify, or polling
+with --poll or off Linux). A burst of events is collected until the tree
+has been quiet for --debounce seconds, then the touched models are
+--update'd; the extraction cache limits parsing to the touched files.
 """
 
+import argparse
+import bisect
+import copy
+import cProfile
+import heapq
 import json
-import re
-from collections import defaultdict
+import os
+import shutil
+import time
+import traceback
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
 
-def extract_task_id_from_filename(filename):
-    """Extract task ID from various filename formats"""
-    patterns = [
-        r'^(\d+)\.json',
-        r'task_(\d+)',
-        r'webarena_(\d+)',
-        r'task_summary_flat_(\d+)',
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, filename)
-        if match:
-            return int(match.group(1))
-    return None
-
-def extract_results_deepsky(file_path):
-    """Extract from DeepSky format"""
-    try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            data = json.load(f)
-            return data.get('task_id'), data.get('success')
-    except:
-        return None, None
-
-def extract_results_jace(line):
-    """Extract from Jace JSONL format"""
-    try:
-        data = json.loads(line)
-        return data.get('task_id'), data.get('result', {}).get('success')
-    except:
-        return None, None
-
-def extract_results_gui_hybrid(line):
-    """Extract from GUI Hybrid JSONL format"""
-    try:
-        data = json.loads(line)
-        return data.get('task_id'), data.get('correct')
-    except:
-        return None, None
-
-def extract_results_step(file_path):
-    """Extract from SteP format - has trajectory with success info"""
-    try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read(50000)  # Read first 50KB
-            data = json.loads(content)
-            task_id = data.get('id')
-            trajectory = data.get('trajectory', [])
-            if trajectory and len(trajectory) > 0:
-                last_step = trajectory[-1]
-                success = last_step.get('success')
-                return task_id, success
-    except:
-        pass
-    return None, None
-
-def extract_results_agentoccam(file_path):
-    """Extract from AgentOccam format"""
-    try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read(50000)
-            data = json.loads(content)
-            task_id = data.get('id')
-            trajectory = data.get('trajectory', [])
-            if trajectory and len(trajectory) > 0:
-                last_step = trajectory[-1]
-                success = last_step.get('success')
-                return task_id, success
-    except:
-        pass
-    return None, None
-
-def extract_results_narada(file_path):
-    """Extract from Narada format - has score field (1.0 = success, 0.0 = failure)"""
-    try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read(100000)  # Read first 100KB
-            data = json.loads(content)
-            # Extract task ID from filename
-            task_id = extract_task_id_from_filename(file_path.name)
-            score = data.get('score')
-            if score is not None:
-                success = score >= 0.5  # Score of 1.0 means success, 0.0 means failure
-                return task_id, success
-    except:
-        pass
-    return None, None
-
-def extract_results_ibm_cuga(file_path):
-    """Extract from IBM CUGA format - trajectory-only files without success data"""
-    # IBM CUGA files don't have success data embedded, return None
-    # Task ID can still be extracted for tracking
-    try:
-        task_id = extract_task_id_from_filename(file_path.name)
-        return task_id, None
-    except:
-        return None, None
-
-def extract_results_openai_operator(file_path):
-    """Extract from OpenAI Operator format - list of messages without success data"""
-    # OpenAI Operator files don't have success data embedded
-    try:
-        task_id = extract_task_id_from_filename(file_path.name)
-        return task_id, None
-    except:
-        return None, None
-
-def extract_results_scribeagent(file_path):
-    """Extract from ScribeAgent format"""
-    # ScribeAgent files need investigation
-    try:
-        task_id = extract_task_id_from_filename(file_path.name)
-        return task_id, None
-    except:
-        return None, None
-
-def extract_results_learn_by_interact(file_path):
-    """Extract from Learn-by-Interact format"""
-    # Learn-by-Interact files need investigation
-    try:
-        task_id = extract_task_id_from_filename(file_path.name)
-        return task_id, None
-    except:
-        return None, None
-
-def main():
-    # Configuration
-    trajectories_dir = Path("data/trajectories")
-    test_tasks_file = Path("data/test.raw.json")
-    leaderboard_file = Path("data/leaderboard.json")
-    output_dir = Path("web/public/data")
-
-    print("=" * 100)
-    print("WEBARENA DATA NORMALIZATION SCRIPT")
-    print("=" * 100)
-
-    # Load test tasks metadata
-    print("\n[1/6] Loading task metadata from test.raw.json...")
-    with open(test_tasks_file, 'r') as f:
-        test_tasks = json.load(f)
-    print(f"   ✓ Loaded {len(test_tasks)} tasks")
-
-    # Load leaderboard for model metadata
-    print("\n[2/6] Loading leaderboard metadata...")
-    with open(leaderboard_file, 'r') as f:
-        leaderboard_data = json.load(f)
-        leaderboard_entries = leaderboard_data['leaderboard']
-    print(f"   ✓ Loaded {len(leaderboard_entries)} models from leaderboard")
-
-    # Define model mapping
-    model_dirs = {
-        "agent_o_cam_trajectories": "agentoccam",
-        "deepsky_trajectories": "deepsky",
-        "ibm_cuga_webarena_trajectories": "ibm_cuga",
-        "jace_zetalabs_trajectories": "jace",
-        "learn_by_interact_trajectoties": "learn_by_interact",
-        "narada_ai_trajectories": "narada",
-        "oai_cua_trajectories": "openai_operator",
-        "scribeagent_trajectories": "scribeagent",
-        "gui_hybrid_trajectories": "gui_hybrid",
-        "step_trajectories": "step"
-    }
-
-    # Extraction methods per model
-    extraction_methods = {
-        "deepsky": extract_results_deepsky,
-        "step": extract_results_step,
-        "agentoccam": extract_results_agentoccam,
-        "narada": extract_results_narada,
-        "ibm_cuga": extract_results_ibm_cuga,
-        "openai_operator": extract_results_openai_operator,
-        "scribeagent": extract_results_scribeagent,
-        "learn_by_interact": extract_results_learn_by_interact,
+import extractors
+import json_scan
+from analytics import ANALYTICS_FILE, BOOTSTRAP_RESAMPLES, build_analytics, write_analytics
+from benchmark_store import (
+    STORE_FILE, build_benchmark_store, load_benchmarks, load_mapping, trajectory_models_from,
+    write_benchmark_store,
+)
+from clustering import CLUSTERS_FILE, build_clusters, write_clusters
+from compact_export import MATRIX_FILE, MATRIX_META_FILE, dump_minified, write_compact_artifacts
+from extraction_cache import ExtractionCache, extractor_fingerprint, file_signature
+from extractors import extract_file, list_trajectory_files
+from model_names import MODEL_NAME_ALIASES, MODEL_NAME_MAP, NameIndex, describe_issue
+from precompress import MANIFEST_FILE, brotli, publish_artifacts
+from profiling import StageTimer, environment, maxrss_mb
+from results_matrix import FAIL, PASS, UNSCORED, ResultsMatrix, encode_outcome
+from search_index import SEARCH_INDEX_FILE, build_search_index
+from shard_export import SHARDS_DIR, write_shards
+from stream_export import NDJSON_ARTIFACTS, StreamedList, write_json, write_ndjson
+from task_index import TaskIndex
+from trajectory_store import STORE_DIR, pack_models
+from trajectory_watch import open_watcher, wait_for_batch
+
+TRAJECTORIES_DIR = Path("data/trajectories")
+TEST_TASKS_FILE = Path("data/test.raw.json")
+LEADERBOARD_FILE = Path("data/leaderboard.json")
+OUTPUT_DIR = Path("web/public/data")
+DEFAULT_CACHE_FILE = Path("data/.cache/extraction_manifest.json")
+STANDARD_ARTIFACTS = (
+    "models.json", "tasks.json", "results.json", "leaderboard.json",
+    "task_difficulty.json", "heatmap_data.json", SEARCH_INDEX_FILE, STORE_FILE, ANALYTICS_FILE,
+    CLUSTERS_FILE,
+)
+REPORT_VERSION = 1
+MAX_FAILURE_EXAMPLES = 5
+SLOWEST_FILES = 10
+STAGING_DIR = ".staging"
+DEBOUNCE_SECONDS = 2.0
+MAX_BATCH_SECONDS = 30.0
+
+def list_extraction_jobs(dir_path, hint=None):
+    """List the (path, declared format) jobs needed for one model directory"""
+    return [(path, hint) for path in list_trajectory_files(dir_path, hint)]
+
+def run_extraction_job(job):
+    """Run a single extraction job (must stay top-level so it can be pickled).
+
+    Returns the file's extraction record: detected format (None if
+    unrecognized), pairs, parse failures and the first error, file size and
+    parse time.
+    """
+    path, hint = job
+    start = time.perf_counter()
+    format_name, pairs, failures, error = extract_file(path, hint)
+    return {
+        "format": format_name,
+        "pairs": pairs,
+        "failures": failures,
+        "error": error,
+        "bytes": os.path.getsize(path),
+        "seconds": time.perf_counter() - start,
+        "cached": False,
     }
 
-    print("\n[3/6] Extracting results from trajectory files...")
-    print("   This may take a minute...")
-
-    # Extract results for all models
-    all_results = defaultdict(dict)  # {model_id: {task_id: success}}
-
+def run_cached_extraction_job(job):
+    """Run an extraction job, also returning the file signature for the cache"""
+    return file_signature(job[0]), run_extraction_job(job)
+
+def map_jobs(fn, jobs, workers=1):
+    """Apply fn to every job, in order, optionally over a process pool.
+
+    With workers > 1 the jobs are spread over a process pool. Results come
+    back in submission order, so the output is identical to a serial run.
+    """
+    if workers <= 1 or len(jobs) <= 1:
+        return [fn(job) for job in jobs]
+
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(fn, jobs, chunksize=chunksize))
+
+def run_extraction_jobs(jobs, workers=1, cache=None):
+    """Run extraction jobs, returning their extraction records in job order.
+
+    When a cache is given, files whose manifest entry is still valid are
+    reused and only the remaining jobs are parsed.
+    """
+    if cache is None:
+        return map_jobs(run_extraction_job, jobs, workers)
+
+    # All the code that turns a job's file into pairs
+    fingerprint = extractor_fingerprint(extractors, json_scan)
+    results = [None] * len(jobs)
+    pending = []
+    for i, job in enumerate(jobs):
+        results[i] = cache.lookup(job[0], fingerprint)
+        if results[i] is None:
+            pending.append(i)
+
+    parsed = map_jobs(run_cached_extraction_job, [jobs[i] for i in pending], workers)
+    for i, (signature, record) in zip(pending, parsed):
+        cache.store(jobs[i][0], fingerprint, signature, record)
+        results[i] = record
+
+    return results
+
+# Trajectory directory -> model id
+MODEL_DIRS = {
+    "agent_o_cam_trajectories": "agentoccam",
+    "deepsky_trajectories": "deepsky",
+    "ibm_cuga_webarena_trajectories": "ibm_cuga",
+    "jace_zetalabs_trajectories": "jace",
+    "learn_by_interact_trajectoties": "learn_by_interact",
+    "narada_ai_trajectories": "narada",
+    "oai_cua_trajectories": "openai_operator",
+    "scribeagent_trajectories": "scribeagent",
+    "gui_hybrid_trajectories": "gui_hybrid",
+    "step_trajectories": "step"
+}
+
+# Declared trajectory format per model (see extractors.py). It picks the
+# file suffixes to list and wins unless a file positively fails its sniffer
+# while another format matches.
+MODEL_FORMATS = {
+    "deepsky": "deepsky",
+    "jace": "jace",
+    "gui_hybrid": "gui_hybrid",
+    "step": "step",
+    "agentoccam": "step",
+    "narada": "narada",
+    "ibm_cuga": "trajectory_only",
+    "openai_operator": "trajectory_only",
+    "scribeagent": "trajectory_only",
+    "learn_by_interact": "trajectory_only",
+}
+
+def collect_model_jobs(trajectories_dir, model_dirs=MODEL_DIRS):
+    """List (model_id, dir_path, jobs) for every model directory"""
+    model_jobs = []
     for dir_name, model_id in model_dirs.items():
         dir_path = trajectories_dir / dir_name
-
-        print(f"\n   Processing {model_id}...", end=" ")
-
-        if dir_name == "jace_zetalabs_trajectories":
-            # JSONL file
-            count = 0
-            with open(dir_path, 'r', encoding='utf-8', errors='ignore') as f:
-                for line in f:
-                    task_id, success = extract_results_jace(line)
-                    if task_id is not None:
-                        all_results[model_id][task_id] = success
-                        count += 1
-            print(f"✓ {count} tasks")
-
-        elif dir_name == "gui_hybrid_trajectories":
-            # Multiple JSONL files
-            count = 0
-            for file in dir_path.glob("*.jsonl"):
-                with open(file, 'r', encoding='utf-8', errors='ignore') as f:
-                    for line in f:
-                        task_id, success = extract_results_gui_hybrid(line)
-                        if task_id is not None:
-                            all_results[model_id][task_id] = success
-                            count += 1
-            print(f"✓ {count} tasks")
-
-        elif dir_path.is_dir():
-            # JSON files in directory or subdirectories
-            json_files = list(dir_path.glob("*.json"))
-
-            if not json_files:
-                # Check subdirectories
-                json_files = []
-                for subdir in dir_path.iterdir():
-                    if subdir.is_dir():
-                        json_files.extend(subdir.glob("*.json"))
-
-            count = 0
-            extraction_fn = extraction_methods.get(model_id, extract_results_deepsky)
-
-            for file in json_files:
-                task_id, success = extraction_fn(file)
-                if task_id is None:
-                    # Fallback to filename
-                    task_id = extract_task_id_from_filename(file.name)
-
-                if task_id is not None:
-                    all_results[model_id][task_id] = success
-                    count += 1
-
-            print(f"✓ {count} tasks")
-
-    print(f"\n   Extraction complete!")
-    print(f"   Total models with data: {len(all_results)}")
-
-    # Show summary
-    print("\n   Summary by model:")
-    for model_id in sorted(all_results.keys()):
-        total = len(all_results[model_id])
-        successes = sum(1 for v in all_results[model_id].values() if v)
-        rate = (successes / total * 100) if total > 0 else 0
-        print(f"     {model_id:20} {total:4} tasks, {successes:4} successes ({rate:5.1f}%)")
-
-    print("\n[4/6] Building normalized data structures...")
-
-    # Build models.json
-    model_name_map = {
-        "deepsky": "DeepSky Agent",
-        "jace": "Jace.AI",
-        "gui_hybrid": "GUI-API Hybrid",
-        "agentoccam": "AgentOccam",
-        "ibm_cuga": "IBM CUGA",
-        "learn_by_interact": "Learn-by-Interact",
-        "narada": "Narada AI",
-        "openai_operator": "OpenAI Operator",
-        "scribeagent": "ScribeAgent",
-        "step": "SteP"
-    }
-
+        jobs = list_extraction_jobs(dir_path, MODEL_FORMATS.get(model_id))
+        model_jobs.append((model_id, dir_path, jobs))
+    return model_jobs
+
+def collect_results(model_jobs, job_results):
+    """Fold per-job extraction records into {model_id: {task_id: success}}.
+
+    Also returns per-model extraction stats: files (total, cached, per
+    detected format), bytes, summed parse time, pairs read and parse
+    failures with a few examples. Stats are None when the model's
+    trajectory directory does not exist.
+    """
+    job_results = iter(job_results)
+    all_results = defaultdict(dict)
+    stats = {}
+    for model_id, dir_path, jobs in model_jobs:
+        if not jobs and not dir_path.exists():
+            stats[model_id] = None
+            continue
+
+        model_stats = {
+            "files": len(jobs),
+            "cached_files": 0,
+            "bytes": 0,
+            "parse_seconds": 0.0,
+            "pairs": 0,
+            "failures": 0,
+            "formats": Counter(),
+            "failure_examples": [],
+        }
+        for path, _ in jobs:
+            record = next(job_results)
+            model_stats["formats"][record["format"] or "unrecognized"] += 1
+            model_stats["cached_files"] += record["cached"]
+            model_stats["bytes"] += record["bytes"]
+            model_stats["parse_seconds"] += record["seconds"]
+            model_stats["failures"] += record["failures"]
+            if record["error"] and len(model_stats["failure_examples"]) < MAX_FAILURE_EXAMPLES:
+                model_stats["failure_examples"].append({"file": str(path), "error": record["error"]})
+            for task_id, success in record["pairs"]:
+                all_results[model_id][task_id] = success
+                model_stats["pairs"] += 1
+        stats[model_id] = model_stats
+    return all_results, stats
+
+def slowest_files(model_jobs, job_results, limit=SLOWEST_FILES):
+    """The trajectory files that took longest to parse, slowest first"""
+    records = iter(job_results)
+    files = []
+    for model_id, _, jobs in model_jobs:
+        for path, _ in jobs:
+            record = next(records)
+            if not record["cached"]:
+                files.append({
+                    "file": str(path),
+                    "model": model_id,
+                    "seconds": record["seconds"],
+                    "bytes": record["bytes"],
+                })
+    return heapq.nlargest(limit, files, key=lambda f: f["seconds"])
+
+def build_model_entries(leaderboard_entries, all_results, model_name_map=MODEL_NAME_MAP, issues=None):
+    """Build models.json from the official leaderboard and the extracted results.
+
+    Leaderboard rows are joined to model ids through a NameIndex; ambiguous
+    names and ids matched by several rows are appended to issues, if given.
+    """
     models = []
-    # Create reverse map for quick lookup
+    name_index = NameIndex(model_name_map, MODEL_NAME_ALIASES)
+    joined, join_issues = name_index.join([entry.get('Model') for entry in leaderboard_entries])
+    if issues is not None:
+        issues.extend(join_issues)
+
     official_success_rates = {}
-    for entry in leaderboard_entries:
-        model_name = entry.get('Model', '')
-        # Find matching model_id
-        model_id = None
-        for mid, mname in model_name_map.items():
-            if mname.lower() in model_name.lower() or model_name.lower() in mname.lower():
-                model_id = mid
-                break
-
-        if model_id:
-            official_success_rates[model_id] = {
-                "name": model_name,
-                "date": entry.get('a'),
-                "open": entry.get('Open?') == '✓',
-                "size_b": entry.get('Model Size (billion)'),
-                "official_rate": float(entry.get('Success Rate (%)', 0)),
-            }
+    for model_id, (row, _) in joined.items():
+        entry = leaderboard_entries[row]
+        official_success_rates[model_id] = {
+            "name": entry['Model'],
+            "date": entry.get('a'),
+            "open": entry.get('Open?') == '✓',
+            "size_b": entry.get('Model Size (billion)'),
+            "official_rate": float(entry.get('Success Rate (%)', 0)),
+        }
 
     # Build models list with trajectory data availability
     for model_id, model_name in model_name_map.items():
@@ -320,189 +321,881 @@ def main():
                 "success_rate": official_data['official_rate'],
                 "has_trajectories": has_traj
             })
+    return models
 
-    print(f"   ✓ Built {len(models)} model entries")
-
-    # Build tasks.json
-    tasks = []
-    for task in test_tasks:
-        tasks.append({
-            "id": task['task_id'],
+def iter_task_entries(task_index):
+    """Generate tasks.json entries"""
+    for i, task in enumerate(task_index.tasks):
+        yield {
+            "id": task_index.task_ids[i],
             "intent": task['intent'],
-            "site": task['sites'][0] if task['sites'] else 'unknown',
-            "template_id": task.get('intent_template_id'),
-            "eval_type": task['eval']['eval_types'][0] if task['eval'].get('eval_types') else 'unknown',
+            "site": task_index.sites[i],
+            "template_id": task_index.template_ids[i],
+            "eval_type": task_index.eval_types[i],
             "reference_answer": str(task['eval'].get('reference_answers', {}))[:100]
-        })
+        }
 
-    print(f"   ✓ Built {len(tasks)} task entries")
+def build_task_entries(task_index):
+    """Build tasks.json"""
+    return list(iter_task_entries(task_index))
 
-    # Build results.json (normalized format)
-    results = []
+def iter_result_entries(all_results):
+    """Generate results.json records (normalized format)"""
     for model_id, task_results in all_results.items():
         for task_id, success in task_results.items():
-            results.append({
+            yield {
                 "t": task_id,
                 "m": model_id,
                 "s": 1 if success else 0
-            })
+            }
 
-    print(f"   ✓ Built {len(results)} result entries")
+def build_result_entries(all_results):
+    """Build results.json (normalized format)"""
+    return list(iter_result_entries(all_results))
+
+def trajectory_leaderboard_entry(model, total, successes, domain_breakdown):
+    """Leaderboard entry of a model with trajectory data"""
+    return {
+        "id": model['id'],
+        "name": model['name'],
+        "total_tasks": total,
+        "successes": successes,
+        "success_rate": model['success_rate'],  # Use official rate
+        "domain_breakdown": domain_breakdown,
+        "has_trajectories": True
+    }
 
-    print("\n[5/6] Generating aggregated files...")
+def estimated_leaderboard_entry(model):
+    """Leaderboard entry of a model without trajectory data - official overall rate only"""
+    # Estimate total tasks and successes based on official rate
+    total_tasks = 812  # Standard WebArena task count
+    official_rate = model['success_rate']
+    estimated_successes = int(total_tasks * official_rate / 100)
+
+    return {
+        "id": model['id'],
+        "name": model['name'],
+        "total_tasks": total_tasks,
+        "successes": estimated_successes,
+        "success_rate": official_rate,
+        "domain_breakdown": {},  # No domain data available
+        "has_trajectories": False
+    }
+
+def rank_leaderboard(leaderboard_output):
+    """Sort entries by official success rate and number them"""
+    leaderboard_output.sort(key=lambda x: x['success_rate'], reverse=True)
+    for i, entry in enumerate(leaderboard_output):
+        entry['rank'] = i + 1
+    return leaderboard_output
+
+def build_leaderboard(models, all_results, results_matrix):
+    """Build leaderboard.json with per-domain breakdowns, ranked by official rate"""
+    model_totals = results_matrix.model_totals()
+    model_successes = results_matrix.model_successes()
+    site_counts = results_matrix.site_counts()
 
-    # Generate leaderboard.json with domain breakdown
     leaderboard_output = []
     for model in models:
         model_id = model['id']
 
-        # Use official success rate from leaderboard
-        official_rate = model['success_rate']
-
         # If we have trajectory data, calculate domain breakdown
-        domain_breakdown = {}
         if model_id in all_results:
-            model_results = all_results[model_id]
-            total = len(model_results)
-            successes = sum(1 for v in model_results.values() if v)
+            col = results_matrix.model_ids.index(model_id)
+            total = int(model_totals[col])
+            successes = int(model_successes[col])
 
             # Domain breakdown (only for models with trajectory data)
-            domain_stats = defaultdict(lambda: {'success': 0, 'total': 0})
-            for task_id, success in model_results.items():
-                task_meta = next((t for t in test_tasks if t['task_id'] == task_id), None)
-                if task_meta:
-                    domain = task_meta['sites'][0] if task_meta['sites'] else 'unknown'
-                    domain_stats[domain]['total'] += 1
-                    if success:
-                        domain_stats[domain]['success'] += 1
-
-            # Calculate rates
-            for domain in domain_stats:
-                s = domain_stats[domain]['success']
-                t = domain_stats[domain]['total']
-                domain_stats[domain]['rate'] = round((s / t * 100), 1) if t > 0 else 0
-
-            domain_breakdown = dict(domain_stats)
-
-            leaderboard_output.append({
-                "id": model_id,
-                "name": model['name'],
-                "total_tasks": total,
-                "successes": successes,
-                "success_rate": official_rate,  # Use official rate
-                "domain_breakdown": domain_breakdown,
-                "has_trajectories": True
-            })
-        else:
-            # Model without trajectory data - use official overall rate only
-            # Estimate total tasks and successes based on official rate
-            total_tasks = 812  # Standard WebArena task count
-            estimated_successes = int(total_tasks * official_rate / 100)
+            domain_breakdown = results_matrix.group_breakdown(
+                model_id, results_matrix.sites, site_counts
+            )
 
-            leaderboard_output.append({
-                "id": model_id,
-                "name": model['name'],
-                "total_tasks": total_tasks,
-                "successes": estimated_successes,
-                "success_rate": official_rate,
-                "domain_breakdown": {},  # No domain data available
-                "has_trajectories": False
-            })
-
-    # Sort by official success rate
-    leaderboard_output.sort(key=lambda x: x['success_rate'], reverse=True)
-    for i, entry in enumerate(leaderboard_output):
-        entry['rank'] = i + 1
-
-    print(f"   ✓ Generated leaderboard with {len(leaderboard_output)} models")
-
-    # Generate task_difficulty.json
-    task_difficulty = []
-    for task in test_tasks:
-        task_id = task['task_id']
-        success_count = 0
-        passing_models = []
-
-        for model_id, task_results in all_results.items():
-            if task_id in task_results and task_results[task_id]:
-                success_count += 1
-                passing_models.append(model_id)
-
-        total_models = len(all_results)
-        success_rate = round((success_count / total_models * 100), 1) if total_models > 0 else 0
-
-        # Categorize difficulty
-        if success_rate >= 80:
-            difficulty = "easy"
-        elif success_rate >= 40:
-            difficulty = "medium"
-        elif success_rate >= 20:
-            difficulty = "hard"
+            leaderboard_output.append(
+                trajectory_leaderboard_entry(model, total, successes, domain_breakdown)
+            )
         else:
-            difficulty = "very_hard"
-
-        task_difficulty.append({
+            leaderboard_output.append(estimated_leaderboard_entry(model))
+
+    return rank_leaderboard(leaderboard_output)
+
+def classify_difficulty(success_count, total_models):
+    """(success_rate, difficulty) of a task passed by success_count models"""
+    success_rate = round((success_count / total_models * 100), 1) if total_models > 0 else 0
+
+    # Categorize difficulty
+    if success_rate >= 80:
+        difficulty = "easy"
+    elif success_rate >= 40:
+        difficulty = "medium"
+    elif success_rate >= 20:
+        difficulty = "hard"
+    else:
+        difficulty = "very_hard"
+    return success_rate, difficulty
+
+def iter_task_difficulty(task_index, results_matrix):
+    """Generate task_difficulty.json entries"""
+    task_success_counts = results_matrix.task_success_counts()
+    total_models = len(results_matrix.model_ids)
+    for task_id in task_index.task_ids:
+        success_count = int(task_success_counts[results_matrix.row_of[task_id]])
+        passing_models = results_matrix.passing_models(task_id)
+        success_rate, difficulty = classify_difficulty(success_count, total_models)
+
+        yield {
             "id": task_id,
             "success_count": success_count,
             "success_rate": success_rate,
             "difficulty": difficulty,
             "passing_models": passing_models
-        })
+        }
 
-    print(f"   ✓ Generated task difficulty for {len(task_difficulty)} tasks")
+def build_task_difficulty(task_index, results_matrix):
+    """Build task_difficulty.json"""
+    return list(iter_task_difficulty(task_index, results_matrix))
 
-    # Generate heatmap_data.json (full matrix)
+def build_heatmap_data(all_results, task_index, results_matrix, stream=False):
+    """Build heatmap_data.json (full matrix); with stream=True the matrix rows
+    are generated while the file is written"""
     model_ids = sorted(all_results.keys())
-    task_ids = sorted(set(task['task_id'] for task in test_tasks))
-
-    # Build matrix
-    matrix = []
-    for task_id in task_ids:
-        row = []
-        for model_id in model_ids:
-            success = all_results[model_id].get(task_id, None)
-            row.append(1 if success else 0 if success is False else None)
-        matrix.append(row)
-
-    heatmap_data = {
+    return {
         "model_ids": model_ids,
-        "task_ids": task_ids,
-        "matrix": matrix
+        "task_ids": task_index.sorted_ids,
+        "matrix": (StreamedList(results_matrix.iter_heatmap(model_ids)) if stream
+                   else results_matrix.heatmap(model_ids))
     }
 
-    print(f"   ✓ Generated heatmap data ({len(task_ids)} tasks × {len(model_ids)} models)")
-
-    print("\n[6/6] Writing output files...")
+# Incremental updates (--update): patch existing artifacts for one model
+
+# Heatmap cell per outcome (unscored and missing results are both null)
+HEATMAP_CELLS = {PASS: 1, FAIL: 0, UNSCORED: None}
+
+# Artifacts read by an incremental update; the ones it rewrites
+UPDATE_INPUTS = ("tasks.json", "results.json", "leaderboard.json", "task_difficulty.json", "heatmap_data.json")
+UPDATE_OUTPUTS = ("models.json", "results.json", "leaderboard.json", "task_difficulty.json", "heatmap_data.json",
+                  ANALYTICS_FILE)
+# Artifacts with a minified copy under --compact
+COMPACT_ARTIFACTS = ("models.json", "tasks.json", "results.json", "leaderboard.json", "task_difficulty.json",
+                     "heatmap_data.json", STORE_FILE, ANALYTICS_FILE)
+
+def load_artifacts(output_dir, filenames=UPDATE_INPUTS):
+    """Load previously written artifacts as {filename: data}"""
+    artifacts = {}
+    for filename in filenames:
+        path = output_dir / filename
+        if not path.exists():
+            raise FileNotFoundError(f"{path} does not exist - run a full normalization first")
+        with open(path, 'r') as f:
+            artifacts[filename] = json.load(f)
+    return artifacts
+
+def model_columns(model_ids, model_id, has_results, model_order):
+    """Models with results after adding or removing model_id, in column order.
+
+    Columns follow the order in which a full run collects models
+    (model_order, i.e. MODEL_DIRS); models without results have no column.
+    """
+    ids = set(model_ids) - {model_id}
+    unknown = ids - set(model_order)
+    if unknown:
+        raise ValueError(f"Unknown models in existing artifacts ({', '.join(sorted(unknown))}) - run a full normalization")
+    if has_results:
+        ids.add(model_id)
+    return [mid for mid in model_order if mid in ids]
+
+def update_result_entries(results, model_id, task_results, column_ids):
+    """results.json with model_id's records replaced"""
+    by_model = defaultdict(list)
+    for record in results:
+        by_model[record['m']].append(record)
+    by_model[model_id] = build_result_entries({model_id: task_results})
+    return [record for mid in column_ids for record in by_model[mid]]
+
+def site_breakdown(task_results, task_sites):
+    """Domain breakdown of one model's results, as group_breakdown() computes it"""
+    counts = defaultdict(lambda: [0, 0])
+    for task_id, success in task_results.items():
+        site = task_sites.get(task_id)
+        if site is not None:
+            counts[site][0] += 1 if encode_outcome(success) == PASS else 0
+            counts[site][1] += 1
+    return {
+        site: {"success": s, "total": t, "rate": round((s / t * 100), 1)}
+        for site, (s, t) in sorted(counts.items())
+    }
 
-    # Create output directory
+def update_leaderboard(leaderboard_output, models, model_id, task_results, task_sites):
+    """leaderboard.json with model_id's entry recomputed and the ranking redone"""
+    previous = {entry['id']: entry for entry in leaderboard_output}
+    entries = []
+    for model in models:
+        if model['id'] == model_id:
+            if task_results:
+                successes = sum(1 for success in task_results.values() if encode_outcome(success) == PASS)
+                breakdown = site_breakdown(task_results, task_sites)
+                entries.append(trajectory_leaderboard_entry(model, len(task_results), successes, breakdown))
+            else:
+                entries.append(estimated_leaderboard_entry(model))
+        elif model['id'] in previous:
+            entries.append(previous[model['id']])
+        else:
+            raise ValueError(f"leaderboard.json has no entry for {model['id']} - run a full normalization")
+    return rank_leaderboard(entries)
+
+def update_task_difficulty(task_difficulty, model_id, task_results, column_ids, previous_total):
+    """Update pass counts and passing_models for model_id in place.
+
+    Only tasks the model passes now or passed before change, unless the
+    number of models changed, in which case every rate is recomputed.
+    """
+    total_models = len(column_ids)
+    column_of = {mid: i for i, mid in enumerate(column_ids)}
+    for entry in task_difficulty:
+        passed = encode_outcome(task_results.get(entry['id'])) == PASS
+        if passed != (model_id in entry['passing_models']):
+            passing = [mid for mid in entry['passing_models'] if mid != model_id]
+            if passed:
+                passing.append(model_id)
+                passing.sort(key=column_of.__getitem__)
+            entry['passing_models'] = passing
+            entry['success_count'] = len(passing)
+        elif total_models == previous_total:
+            continue
+        entry['success_rate'], entry['difficulty'] = classify_difficulty(entry['success_count'], total_models)
+    return task_difficulty
+
+def update_heatmap_data(heatmap_data, model_id, task_results):
+    """Replace, add or drop model_id's column of heatmap_data.json in place"""
+    model_ids = heatmap_data['model_ids']
+    matrix = heatmap_data['matrix']
+    if model_id in model_ids:
+        col = model_ids.index(model_id)
+        del model_ids[col]
+        for row in matrix:
+            del row[col]
+    if task_results:
+        col = bisect.bisect(model_ids, model_id)
+        model_ids.insert(col, model_id)
+        for task_id, row in zip(heatmap_data['task_ids'], matrix):
+            row.insert(col, HEATMAP_CELLS[encode_outcome(task_results.get(task_id))])
+    return heatmap_data
+
+def update_artifacts(artifacts, leaderboard_entries, model_id, task_results, model_order=None):
+    """Patch loaded artifacts (see load_artifacts()) for model_id's new results.
+
+    The patched artifacts equal those of a full run over the same inputs,
+    provided only model_id's trajectories changed since they were written.
+    task_results may be empty when the model's trajectories were removed.
+    """
+    if model_order is None:
+        model_order = list(MODEL_DIRS.values())
+    heatmap_data = artifacts["heatmap_data.json"]
+    column_ids = model_columns(heatmap_data['model_ids'], model_id, bool(task_results), model_order)
+
+    task_sites = {}
+    for task in artifacts["tasks.json"]:
+        task_sites.setdefault(task['id'], task['site'])
+
+    models = build_model_entries(leaderboard_entries, set(column_ids))
+    artifacts["models.json"] = models
+    artifacts["results.json"] = update_result_entries(
+        artifacts["results.json"], model_id, task_results, column_ids
+    )
+    artifacts["leaderboard.json"] = update_leaderboard(
+        artifacts["leaderboard.json"], models, model_id, task_results, task_sites
+    )
+    update_task_difficulty(
+        artifacts["task_difficulty.json"], model_id, task_results, column_ids, len(heatmap_data['model_ids'])
+    )
+    update_heatmap_data(heatmap_data, model_id, task_results)
+    return artifacts
+
+def write_outputs(output_dir, models, tasks, results, leaderboard_output, task_difficulty,
+                  heatmap_data, search_index, ndjson=False):
+    """Write the standard artifacts; returns (filename, count, unit) per file.
+
+    tasks, results and task_difficulty may be generators and the heatmap
+    matrix a StreamedList; their records are written as they are produced
+    (see stream_export.py). With ndjson=True, results, task difficulty and
+    heatmap rows are written as NDJSON instead (NDJSON_ARTIFACTS). Either
+    way the other format's copies of those files, left by an earlier run,
+    are removed.
+    """
     output_dir.mkdir(parents=True, exist_ok=True)
-
-    # Write all JSON files
     files_written = []
 
-    with open(output_dir / "models.json", 'w') as f:
-        json.dump(models, f, indent=2)
-        files_written.append(("models.json", len(models), "models"))
+    for json_name, ndjson_name in NDJSON_ARTIFACTS.items():
+        stale = output_dir / (json_name if ndjson else ndjson_name)
+        for path in (stale, stale.with_name(stale.name + '.gz'), stale.with_name(stale.name + '.br')):
+            path.unlink(missing_ok=True)
+
+    def write_records(filename, records, unit):
+        if ndjson and filename in NDJSON_ARTIFACTS:
+            filename = NDJSON_ARTIFACTS[filename]
+            count = write_ndjson(output_dir / filename, records)
+        else:
+            if not isinstance(records, list):
+                records = StreamedList(records)
+            count = write_json(output_dir / filename, records)
+        files_written.append((filename, count, unit))
+
+    write_records("models.json", models, "models")
+    write_records("tasks.json", tasks, "tasks")
+    write_records("results.json", results, "results")
+    write_records("leaderboard.json", leaderboard_output, "models")
+    write_records("task_difficulty.json", task_difficulty, "tasks")
+
+    shape = f"{len(heatmap_data['task_ids'])}×{len(heatmap_data['model_ids'])}"
+    if ndjson:
+        # A header line with the column ids, then one line per task row
+        filename = NDJSON_ARTIFACTS["heatmap_data.json"]
+        rows = ({"task_id": task_id, "cells": row}
+                for task_id, row in zip(heatmap_data['task_ids'], heatmap_data['matrix']))
+        write_ndjson(output_dir / filename, rows, header={"model_ids": heatmap_data['model_ids']})
+        files_written.append((filename, shape, "matrix"))
+    else:
+        write_json(output_dir / "heatmap_data.json", heatmap_data)
+        files_written.append(("heatmap_data.json", shape, "matrix"))
+
+    dump_minified(search_index, output_dir / SEARCH_INDEX_FILE)
+    files_written.append((SEARCH_INDEX_FILE, len(search_index['terms']), "terms"))
+
+    return files_written
+
+def build_run_report(timer, workers, model_stats, slowest):
+    """Machine-readable instrumentation report for one run (see --report)"""
+    stages = timer.summary()
+    models = {model_id: stats for model_id, stats in model_stats.items() if stats is not None}
+    files = sum(stats["files"] for stats in models.values())
+    cached_files = sum(stats["cached_files"] for stats in models.values())
+    peaks = [stage["peak_rss_mb"] for stage in stages.values() if stage["peak_rss_mb"] is not None]
+    return {
+        "version": REPORT_VERSION,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        **environment(),
+        "workers": workers,
+        "total_seconds": sum(stage["seconds"] for stage in stages.values()),
+        "peak_rss_mb": max(peaks) if peaks else None,
+        "children_peak_rss_mb": maxrss_mb(children=True) if workers > 1 else None,
+        "stages": stages,
+        "extraction": {
+            "files": files,
+            "cached_files": cached_files,
+            "parsed_files": files - cached_files,
+            "bytes": sum(stats["bytes"] for stats in models.values()),
+            "parse_seconds": sum(stats["parse_seconds"] for stats in models.values()),
+            "failures": sum(stats["failures"] for stats in models.values()),
+            "unrecognized_files": sum(stats["formats"].get("unrecognized", 0) for stats in models.values()),
+            "slowest_files": slowest,
+        },
+        "models": models,
+    }
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Normalize WebArena trajectory data for the web frontend")
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="Number of extraction processes (default: 1 = serial, 0 = one per CPU)",
+    )
+    parser.add_argument(
+        "--full", action="store_true",
+        help="Re-parse every trajectory file instead of reusing the extraction cache",
+    )
+    parser.add_argument(
+        "--cache", type=Path, default=DEFAULT_CACHE_FILE,
+        help=f"Extraction cache manifest (default: {DEFAULT_CACHE_FILE})",
+    )
+    parser.add_argument(
+        "--compact", action="store_true",
+        help="Also write a bit-packed results matrix and minified *.min.json copies",
+    )
+    parser.add_argument(
+        "--precompress", action="store_true",
+        help="Also write .gz/.br variants, content-hashed copies and manifest.json",
+    )
+    parser.add_argument(
+        "--shards", action="store_true",
+        help="Also write per-page, per-site, per-task and per-model shards with an index",
+    )
+    parser.add_argument(
+        "--stream", action="store_true",
+        help="Generate and write large artifacts record by record (same output, flat memory)",
+    )
+    parser.add_argument(
+        "--ndjson", action="store_true",
+        help="Stream results, task difficulty and heatmap rows as .ndjson instead of .json",
+    )
+    parser.add_argument(
+        "--resamples", type=int, default=BOOTSTRAP_RESAMPLES,
+        help=f"Bootstrap resamples for {ANALYTICS_FILE} (default: {BOOTSTRAP_RESAMPLES})",
+    )
+    parser.add_argument(
+        "--trajectory-store", type=Path, nargs="?", const=STORE_DIR, metavar="DIR",
+        help=f"Also pack the extracted models' steps into a random-access store (default DIR: {STORE_DIR})",
+    )
+    parser.add_argument(
+        "--update", action="append", metavar="MODEL_ID",
+        help="Only re-extract this model (repeatable) and patch the existing artifacts",
+    )
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="Keep running: re-normalize the models whose trajectory files change",
+    )
+    parser.add_argument(
+        "--poll", action="store_true",
+        help="With --watch, poll file stats instead of using inotify",
+    )
+    parser.add_argument(
+        "--debounce", type=float, default=DEBOUNCE_SECONDS,
+        help=f"With --watch, seconds without events before a batch is processed (default: {DEBOUNCE_SECONDS:g})",
+    )
+    parser.add_argument(
+        "--report", type=Path,
+        help="Write a JSON instrumentation report (stage and per-model timings, failures, memory)",
+    )
+    parser.add_argument(
+        "--cprofile", type=Path,
+        help="Write cProfile stats for the main process (worker processes are not profiled)",
+    )
+    args = parser.parse_args(argv)
+    if args.resamples < 1:
+        parser.error("--resamples must be at least 1")
+    if args.watch and args.update:
+        parser.error("--watch picks the models to update itself; drop --update")
+    if args.watch and (args.stream or args.ndjson):
+        parser.error("--watch patches the .json artifacts like --update; it cannot be combined with "
+                     "--stream/--ndjson")
+    if args.update and (args.stream or args.ndjson):
+        parser.error("--update patches the existing .json artifacts; it cannot stream")
+    for option in ("compact", "shards"):
+        if getattr(args, option) and (args.stream or args.ndjson):
+            parser.error(f"--{option} needs the artifacts in memory; it cannot be combined with --stream/--ndjson")
+    return args
+
+def extract_models(model_jobs, args, workers, timer):
+    """Extract (with the cache) and collect the results of model_jobs, printing
+    one line per model; returns (all_results, stats, slowest, cache)"""
+    with timer.stage("extract"):
+        # A full run starts from an empty manifest but still writes a fresh one
+        cache = ExtractionCache(args.cache) if args.full else ExtractionCache.load(args.cache)
+        job_results = run_extraction_jobs(
+            [job for _, _, jobs in model_jobs for job in jobs], workers, cache
+        )
+        # A partial (--update) run keeps the other models' entries
+        cache.save(prune=not args.update)
 
-    with open(output_dir / "tasks.json", 'w') as f:
-        json.dump(tasks, f, indent=2)
-        files_written.append(("tasks.json", len(tasks), "tasks"))
+    # Extract results for all models
+    with timer.stage("collect"):
+        all_results, stats = collect_results(model_jobs, job_results)
+        slowest = slowest_files(model_jobs, job_results)
+    for model_id, _, _ in model_jobs:
+        print(f"\n   Processing {model_id}...", end=" ")
+        if stats[model_id] is not None:
+            formats = ", ".join(f"{name} {n}" for name, n in stats[model_id]["formats"].most_common())
+            print(f"✓ {stats[model_id]['pairs']} tasks (files: {formats or 'none'})")
+    return all_results, stats, slowest, cache
+
+def pack_trajectory_store(model_jobs, store_dir, workers, timer):
+    """Bring the trajectory store up to date with model_jobs (see trajectory_store.py)"""
+    with timer.stage("trajectory_store"):
+        packed = pack_models(store_dir, model_jobs, workers)
+    tasks = sum(count for count, _, _ in packed.values())
+    parsed = sum(parsed for _, parsed, _ in packed.values())
+    reused = sum(reused for _, _, reused in packed.values())
+    print(f"   ✓ Packed {tasks} trajectories of {len(packed)} models into {store_dir} "
+          f"({parsed} files parsed, {reused} reused)")
+
+def print_stage_timings(report):
+    print("\n   Stage timings:")
+    for name, stage in report["stages"].items():
+        rss = stage["peak_rss_mb"]
+        print(f"     {name:20} {stage['seconds']:8.3f}s" + ("" if rss is None else f"  {rss:7.1f} MB peak"))
+    print(f"     {'total':20} {report['total_seconds']:8.3f}s")
+
+def write_report(path, report):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"   ✓ Wrote instrumentation report to {path}")
+
+def earlier_options(output_dir):
+    """Optional outputs (--compact, --shards, --precompress) that an earlier
+    run left in output_dir"""
+    found = []
+    if (output_dir / MATRIX_META_FILE).exists():
+        found.append("compact")
+    if (output_dir / SHARDS_DIR).is_dir():
+        found.append("shards")
+    if (output_dir / MANIFEST_FILE).exists():
+        found.append("precompress")
+    return found
+
+def keep_options_current(args, output_dir, stream=False):
+    """Turn on the optional outputs an earlier run left, so they are rebuilt
+    with the artifacts instead of going stale; a streaming run, which cannot
+    build --compact or --shards, deletes those instead"""
+    for option in earlier_options(output_dir):
+        if getattr(args, option):
+            continue
+        if stream and option in ("compact", "shards"):
+            remove_option_outputs(output_dir, option)
+            print(f"   Removed the stale --{option} files of an earlier run")
+        else:
+            setattr(args, option, True)
+            print(f"   Regenerating the --{option} files of an earlier run")
+
+def remove_option_outputs(output_dir, option):
+    """Delete the --compact or --shards files in output_dir, with their
+    precompressed variants"""
+    if option == "shards":
+        shutil.rmtree(output_dir / SHARDS_DIR)
+        return
+    for path in [output_dir / MATRIX_FILE, output_dir / MATRIX_META_FILE, *output_dir.glob("*.min.json")]:
+        for variant in (path, path.with_name(path.name + '.gz'), path.with_name(path.name + '.br')):
+            variant.unlink(missing_ok=True)
+
+def swap_artifacts(staging_dir, output_dir):
+    """Move every entry of staging_dir into output_dir and remove
+    staging_dir; returns the names. Files are renamed over the old ones
+    (atomic); a directory replaces the old one right after that is moved
+    aside."""
+    names = sorted(os.listdir(staging_dir))
+    for name in names:
+        source, target = staging_dir / name, output_dir / name
+        if source.is_dir() and target.exists():
+            old = output_dir / f"{STAGING_DIR}.old.{name}"
+            os.replace(target, old)
+            os.replace(source, target)
+            shutil.rmtree(old)
+        else:
+            os.replace(source, target)
+    staging_dir.rmdir()
+    return names
 
-    with open(output_dir / "results.json", 'w') as f:
-        json.dump(results, f, indent=2)
-        files_written.append(("results.json", len(results), "results"))
+def run_update(args):
+    """Incremental update: re-extract only the --update models and patch the
+    existing artifacts in place of a full rebuild"""
+    workers = args.workers or os.cpu_count() or 1
+    timer = StageTimer()
+    output_dir = OUTPUT_DIR
 
-    with open(output_dir / "leaderboard.json", 'w') as f:
-        json.dump(leaderboard_output, f, indent=2)
-        files_written.append(("leaderboard.json", len(leaderboard_output), "models"))
+    print("=" * 100)
+    print("WEBARENA DATA NORMALIZATION SCRIPT (incremental update)")
+    print("=" * 100)
 
-    with open(output_dir / "task_difficulty.json", 'w') as f:
-        json.dump(task_difficulty, f, indent=2)
-        files_written.append(("task_difficulty.json", len(task_difficulty), "tasks"))
+    model_dirs = {dir_name: model_id for dir_name, model_id in MODEL_DIRS.items() if model_id in args.update}
+    unknown = sorted(set(args.update) - set(model_dirs.values()))
+    if unknown:
+        raise SystemExit(f"Unknown model id(s): {', '.join(unknown)} (known: {', '.join(MODEL_DIRS.values())})")
+
+    print("\n[1/4] Loading leaderboard metadata and existing artifacts...")
+    with timer.stage("load_artifacts"):
+        with open(LEADERBOARD_FILE, 'r') as f:
+            leaderboard_entries = json.load(f)['leaderboard']
+        try:
+            artifacts = load_artifacts(output_dir)
+        except FileNotFoundError as e:
+            raise SystemExit(str(e))
+    print(f"   ✓ Loaded {len(UPDATE_INPUTS)} artifacts from {output_dir}")
+    keep_options_current(args, output_dir)
+
+    print(f"\n[2/4] Extracting results for {', '.join(model_dirs.values())}...")
+    with timer.stage("list_jobs"):
+        model_jobs = collect_model_jobs(TRAJECTORIES_DIR, model_dirs)
+    all_results, stats, slowest, cache = extract_models(model_jobs, args, workers, timer)
+    print(f"\n   Cache: {cache.hits} files reused, {cache.misses} files parsed")
+    if args.trajectory_store:
+        pack_trajectory_store(model_jobs, args.trajectory_store, workers, timer)
+
+    print("\n[3/4] Updating artifacts...")
+    with timer.stage("update"):
+        for model_id in model_dirs.values():
+            task_results = all_results.get(model_id, {})
+            try:
+                update_artifacts(artifacts, leaderboard_entries, model_id, task_results)
+            except ValueError as e:
+                raise SystemExit(str(e))
+            change = f"{len(task_results)} tasks" if task_results else "removed (no results)"
+            print(f"   ✓ {model_id}: {change}")
+    results_matrix = ResultsMatrix.from_artifacts(
+        artifacts["tasks.json"], artifacts["results.json"], artifacts["heatmap_data.json"]
+    )
+    model_ids = artifacts["heatmap_data.json"]['model_ids']
+    with timer.stage("analytics"):
+        artifacts[ANALYTICS_FILE] = build_analytics(results_matrix, args.resamples, workers=workers)
+    with timer.stage("clusters"):
+        clusters = build_clusters(results_matrix, model_ids)
+    with timer.stage("benchmark_store"):
+        artifacts[STORE_FILE] = build_benchmark_store(
+            load_benchmarks(), load_mapping(), trajectory_models_from(artifacts["models.json"])
+        )
+    print(f"   ✓ Recomputed {ANALYTICS_FILE}, {CLUSTERS_FILE} and {STORE_FILE}")
+
+    # Everything derived from the patched artifacts is staged and swapped in
+    # together, so no stale copy (minified, sharded, precompressed) survives
+    print("\n[4/4] Writing output files...")
+    staging_dir = output_dir / STAGING_DIR
+    if staging_dir.exists():
+        shutil.rmtree(staging_dir)  # Left over from an interrupted run
+    staging_dir.mkdir()
+    with timer.stage("write"):
+        for filename in UPDATE_OUTPUTS:
+            with open(staging_dir / filename, 'w') as f:
+                json.dump(artifacts[filename], f, indent=2)
+        write_clusters(staging_dir, clusters)
+        write_benchmark_store(staging_dir, artifacts[STORE_FILE])
+    published = [filename for filename in STANDARD_ARTIFACTS
+                 if (staging_dir / filename).exists() or (output_dir / filename).exists()]
+
+    if args.compact:
+        with timer.stage("compact"):
+            published += write_compact_artifacts(
+                staging_dir, results_matrix, model_ids,
+                {filename: artifacts[filename] for filename in COMPACT_ARTIFACTS},
+            )
+
+    if args.shards:
+        with timer.stage("shards"):
+            shard_count = write_shards(
+                staging_dir, artifacts["tasks.json"], artifacts["task_difficulty.json"],
+                artifacts["results.json"], artifacts["heatmap_data.json"],
+            )
+
+    if args.precompress:
+        with timer.stage("precompress"):
+            # Untouched artifacts are staged too, so the manifest and the
+            # hashed copies are rebuilt as a whole
+            for filename in published:
+                if not (staging_dir / filename).exists():
+                    shutil.copy2(output_dir / filename, staging_dir / filename)
+            manifest = publish_artifacts(staging_dir, published)
+
+    for name in swap_artifacts(staging_dir, output_dir):
+        path = output_dir / name
+        if path.is_dir():
+            print(f"     ✓ {name + '/':25}")
+        else:
+            print(f"     ✓ {name:25} ({path.stat().st_size / 1024:6.1f} KB)")
+    if args.shards:
+        print(f"\n   ✓ Wrote {shard_count} shard files to {output_dir / SHARDS_DIR}")
+    if args.precompress:
+        print(f"   ✓ Wrote hashed copies and {MANIFEST_FILE} for {len(manifest)} artifacts")
 
-    with open(output_dir / "heatmap_data.json", 'w') as f:
-        json.dump(heatmap_data, f, indent=2)
-        files_written.append(("heatmap_data.json", f"{len(task_ids)}×{len(model_ids)}", "matrix"))
+    report = build_run_report(timer, workers, stats, slowest)
+    print_stage_timings(report)
+    if args.report:
+        write_report(args.report, report)
+
+    print("\n" + "=" * 100)
+    print("✅ INCREMENTAL UPDATE COMPLETE!")
+    print("=" * 100)
+
+def touched_models(paths, trajectories_dir=TRAJECTORIES_DIR, model_dirs=MODEL_DIRS):
+    """Model ids whose trajectory directory (or file) contains one of paths;
+    every model if the trajectory directory itself is among them"""
+    models = set()
+    for path in paths:
+        try:
+            parts = Path(path).relative_to(trajectories_dir).parts
+        except ValueError:
+            continue
+        if not parts:
+            return set(model_dirs.values())
+        if parts[0] in model_dirs:
+            models.add(model_dirs[parts[0]])
+    return models
+
+def run_watch(args):
+    """Normalize once, then --update the models whose trajectory files change"""
+    if not TRAJECTORIES_DIR.is_dir():
+        raise SystemExit(f"{TRAJECTORIES_DIR} does not exist - nothing to watch")
+    # Watch first, so files dropped in during the initial run are not missed
+    watcher = open_watcher(TRAJECTORIES_DIR, poll=args.poll)
+    update_args = copy.copy(args)
+    update_args.full = False
+    try:
+        run(copy.copy(args), watch=False)
+        while True:
+            print(f"\n👀 Watching {TRAJECTORIES_DIR} ({type(watcher).__name__}, Ctrl-C to stop)...")
+            paths = wait_for_batch(watcher, args.debounce, MAX_BATCH_SECONDS)
+            model_ids = sorted(touched_models(paths))
+            if not model_ids:
+                continue
+            print(f"\n🔄 {len(paths)} changed paths in {', '.join(model_ids)}")
+            update_args.update = model_ids
+            # Keep watching after a failed batch; the next change may fix the
+            # input, and the staged swap left the previous artifacts in place
+            try:
+                run_update(update_args)
+            except SystemExit as e:
+                print(f"   ❌ Update failed: {e}")
+            except Exception:
+                print("   ❌ Update failed:")
+                traceback.print_exc()
+    except KeyboardInterrupt:
+        print("\n   Stopped watching")
+    finally:
+        watcher.close()
+
+def run(args, watch=True):
+    if args.watch and watch:
+        run_watch(args)
+        return
+    if args.update:
+        run_update(args)
+        return
+
+    workers = args.workers or os.cpu_count() or 1
+    timer = StageTimer()
+
+    # Configuration
+    trajectories_dir = TRAJECTORIES_DIR
+    test_tasks_file = TEST_TASKS_FILE
+    leaderboard_file = LEADERBOARD_FILE
+    output_dir = OUTPUT_DIR
+
+    print("=" * 100)
+    print("WEBARENA DATA NORMALIZATION SCRIPT")
+    print("=" * 100)
+
+    # Load test tasks metadata
+    print("\n[1/6] Loading task metadata from test.raw.json...")
+    with timer.stage("load_tasks"):
+        task_index = TaskIndex.load(test_tasks_file)
+    print(f"   ✓ Loaded {len(task_index)} tasks")
+
+    # Load leaderboard for model metadata
+    print("\n[2/6] Loading leaderboard metadata...")
+    with timer.stage("load_leaderboard"):
+        with open(leaderboard_file, 'r') as f:
+            leaderboard_data = json.load(f)
+            leaderboard_entries = leaderboard_data['leaderboard']
+    print(f"   ✓ Loaded {len(leaderboard_entries)} models from leaderboard")
+
+    print("\n[3/6] Extracting results from trajectory files...")
+    print("   This may take a minute...")
+
+    if workers > 1:
+        print(f"   Using {workers} worker processes")
+
+    # Collect extraction jobs for all models, then run them in one batch
+    with timer.stage("list_jobs"):
+        model_jobs = collect_model_jobs(trajectories_dir)
+    all_results, stats, slowest, cache = extract_models(model_jobs, args, workers, timer)
+
+    print(f"\n   Extraction complete!")
+    print(f"   Cache: {cache.hits} files reused, {cache.misses} files parsed")
+    print(f"   Total models with data: {len(all_results)}")
+    if args.trajectory_store:
+        pack_trajectory_store(model_jobs, args.trajectory_store, workers, timer)
+
+    # Show summary
+    print("\n   Summary by model:")
+    for model_id in sorted(all_results.keys()):
+        total = len(all_results[model_id])
+        successes = sum(1 for v in all_results[model_id].values() if v)
+        rate = (successes / total * 100) if total > 0 else 0
+        print(f"     {model_id:20} {total:4} tasks, {successes:4} successes ({rate:5.1f}%)")
+
+    failures = {model_id: s["failures"] for model_id, s in stats.items() if s and s["failures"]}
+    if failures:
+        print("\n   Parse failures (details with --report):")
+        for model_id, count in failures.items():
+            example = stats[model_id]["failure_examples"][0]
+            print(f"     {model_id:20} {count:4} (e.g. {example['file']}: {example['error']})")
+
+    print("\n[4/6] Building normalized data structures...")
+
+    # Streaming runs generate task, result and difficulty records while writing them
+    stream = args.stream or args.ndjson
+    keep_options_current(args, output_dir, stream)
+    name_issues = []
+    with timer.stage("build_entries"):
+        models = build_model_entries(leaderboard_entries, all_results, issues=name_issues)
+        if stream:
+            tasks = iter_task_entries(task_index)
+            results = iter_result_entries(all_results)
+        else:
+            tasks = build_task_entries(task_index)
+            results = build_result_entries(all_results)
+    print(f"   ✓ Built {len(models)} model entries")
+    for issue in name_issues:
+        print(f"   ⚠️  Leaderboard name match: {describe_issue(issue)}")
+    if not stream:
+        print(f"   ✓ Built {len(tasks)} task entries")
+        print(f"   ✓ Built {len(results)} result entries")
+
+    print("\n[5/6] Generating aggregated files...")
+
+    with timer.stage("aggregate"):
+        # All aggregates below are reductions over one task x model matrix
+        results_matrix = ResultsMatrix.build(all_results, task_index)
+        leaderboard_output = build_leaderboard(models, all_results, results_matrix)
+        if stream:
+            task_difficulty = iter_task_difficulty(task_index, results_matrix)
+        else:
+            task_difficulty = build_task_difficulty(task_index, results_matrix)
+        heatmap_data = build_heatmap_data(all_results, task_index, results_matrix, stream)
+    model_ids = heatmap_data['model_ids']
+    print(f"   ✓ Generated leaderboard with {len(leaderboard_output)} models")
+    if not stream:
+        print(f"   ✓ Generated task difficulty for {len(task_difficulty)} tasks")
+        print(f"   ✓ Generated heatmap data ({len(heatmap_data['task_ids'])} tasks × {len(model_ids)} models)")
+
+    with timer.stage("analytics"):
+        analytics = build_analytics(results_matrix, args.resamples, workers=workers)
+    print(f"   ✓ Computed analytics ({args.resamples} bootstrap resamples, {len(analytics['pairs'])} model pairs)")
+
+    with timer.stage("clusters"):
+        clusters = build_clusters(results_matrix, model_ids)
+    print(f"   ✓ Clustered {len(clusters['task_order'])} tasks "
+          f"({max(clusters['task_clusters'], default=-1) + 1} clusters) and {len(model_ids)} models")
+
+    with timer.stage("search_index"):
+        search_index = build_search_index(task_index.tasks)
+    print(f"   ✓ Built search index ({len(search_index['terms'])} terms)")
+
+    with timer.stage("benchmark_store"):
+        benchmark_store = build_benchmark_store(
+            load_benchmarks(), load_mapping(), trajectory_models_from(models)
+        )
+    print(f"   ✓ Built benchmark store ({len(benchmark_store['benchmarks'])} benchmarks, "
+          f"{len(benchmark_store['models'])} models)")
+
+    print("\n[6/6] Writing output files...")
+
+    # Write all JSON files
+    with timer.stage("write"):
+        files_written = write_outputs(
+            output_dir, models, tasks, results, leaderboard_output, task_difficulty,
+            heatmap_data, search_index, ndjson=args.ndjson,
+        )
+        write_benchmark_store(output_dir, benchmark_store)
+        files_written.append((STORE_FILE, len(benchmark_store['entries']), "entries"))
+        write_analytics(output_dir, analytics)
+        files_written.append((ANALYTICS_FILE, len(analytics['pairs']), "pairs"))
+        write_clusters(output_dir, clusters)
+        files_written.append((CLUSTERS_FILE, len(clusters['task_order']), "tasks"))
+
+    if args.compact:
+        with timer.stage("compact"):
+            compact_files = write_compact_artifacts(output_dir, results_matrix, model_ids, {
+                "models.json": models,
+                "tasks.json": tasks,
+                "results.json": results,
+                "leaderboard.json": leaderboard_output,
+                "task_difficulty.json": task_difficulty,
+                "heatmap_data.json": heatmap_data,
+                STORE_FILE: benchmark_store,
+                ANALYTICS_FILE: analytics,
+            })
+        for filename in compact_files:
+            files_written.append((filename, "compact", "export"))
+
+    if args.shards:
+        with timer.stage("shards"):
+            shard_count = write_shards(output_dir, tasks, task_difficulty, results, heatmap_data)
+        print(f"\n   ✓ Wrote {shard_count} shard files to {output_dir / SHARDS_DIR}")
 
     print(f"\n   Files written to {output_dir}:")
     for filename, count, unit in files_written:
@@ -513,6 +1206,23 @@ def main():
     total_size = sum((output_dir / f[0]).stat().st_size for f in files_written)
     print(f"\n   Total size: {total_size / 1024:.1f} KB")
 
+    if args.precompress:
+        with timer.stage("precompress"):
+            manifest = publish_artifacts(output_dir, [f[0] for f in files_written])
+        gzip_size = sum(entry['gzip_bytes'] for entry in manifest.values())
+        print(f"   Gzipped:    {gzip_size / 1024:.1f} KB")
+        if brotli is not None:
+            brotli_size = sum(entry['brotli_bytes'] for entry in manifest.values())
+            print(f"   Brotli:     {brotli_size / 1024:.1f} KB")
+        else:
+            print("   (brotli not installed - skipped .br variants; pip install brotli)")
+        print(f"   ✓ Wrote hashed copies and {MANIFEST_FILE} for {len(manifest)} artifacts")
+
+    report = build_run_report(timer, workers, stats, slowest)
+    print_stage_timings(report)
+    if args.report:
+        write_report(args.report, report)
+
     print("\n" + "=" * 100)
     print("✅ NORMALIZATION COMPLETE!")
     print("=" * 100)
@@ -521,5 +1231,19 @@ def main():
     print("  2. Ready to build frontend components")
     print("  3. Frontend can fetch these JSONs directly")
 
+def main(argv=None):
+    args = parse_args(argv)
+    if args.cprofile is None:
+        run(args)
+        return
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.runcall(run, args)
+    finally:
+        args.cprofile.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(args.cprofile)
+        print(f"✓ Wrote cProfile stats to {args.cprofile} (python -m pstats {args.cprofile})")
+
 if __name__ == "__main__":
     main()
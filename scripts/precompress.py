@@ -0,0 +1,89 @@
+"""
+Precompressed, content-hashed copies of the web data artifacts
+
+For every artifact in web/public/data/ this writes:
+- <name>.gz and <name>.br next to the original
+- immutable/<stem>.<hash><suffix> (plus .gz/.br), a copy whose name changes
+  whenever its content does, so a CDN can cache it forever
+- manifest.json mapping each logical name to its hashed path and sizes
+
+Brotli output needs the optional `brotli` package (pip install brotli);
+without it only gzip variants are written.
+"""
+
+import gzip
+import hashlib
+import json
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+HASHED_DIR = "immutable"
+MANIFEST_FILE = "manifest.json"
+HASH_LENGTH = 12
+
+def hashed_name(filename, digest):
+    """tasks.json -> tasks.<hash>.json"""
+    stem, dot, suffix = filename.rpartition('.')
+    if not dot:
+        return f"{filename}.{digest[:HASH_LENGTH]}"
+    return f"{stem}.{digest[:HASH_LENGTH]}.{suffix}"
+
+def compress(data):
+    """gzip and brotli encodings of data (brotli is None if unavailable)"""
+    # mtime=0 keeps the gzip bytes reproducible, so unchanged data does not churn
+    gz = gzip.compress(data, compresslevel=9, mtime=0)
+    br = None if brotli is None else brotli.compress(data, quality=11)
+    return gz, br
+
+def write_variants(path, gz, br):
+    """Write the .gz and .br variants of path"""
+    path.with_name(path.name + '.gz').write_bytes(gz)
+    if br is not None:
+        path.with_name(path.name + '.br').write_bytes(br)
+
+def publish_artifacts(output_dir, filenames):
+    """Precompress artifacts, write hashed copies and the manifest.
+
+    Hashed copies that are no longer referenced are removed. Returns the
+    manifest dict.
+    """
+    hashed_dir = output_dir / HASHED_DIR
+    hashed_dir.mkdir(parents=True, exist_ok=True)
+
+    manifest = {}
+    for filename in filenames:
+        path = output_dir / filename
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        gz, br = compress(data)
+        write_variants(path, gz, br)
+
+        hashed_path = hashed_dir / hashed_name(filename, digest)
+        hashed_path.write_bytes(data)
+        write_variants(hashed_path, gz, br)
+
+        manifest[filename] = {
+            "path": f"{HASHED_DIR}/{hashed_path.name}",
+            "sha256": digest,
+            "bytes": len(data),
+            "gzip_bytes": len(gz),
+            "brotli_bytes": None if br is None else len(br),
+        }
+
+    # Drop hashed copies (and their compressed variants) from earlier runs
+    live = {entry["path"].split('/', 1)[1] for entry in manifest.values()}
+    for path in hashed_dir.iterdir():
+        name = path.name
+        for ext in ('.gz', '.br'):
+            if name.endswith(ext):
+                name = name[:-len(ext)]
+        if name not in live:
+            path.unlink()
+
+    with open(output_dir / MANIFEST_FILE, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    return manifest
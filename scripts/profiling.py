@@ -0,0 +1,96 @@
+"""
+Instrumentation helpers for the normalization pipeline
+
+StageTimer records wall time and peak RSS per named stage; it is used by
+normalize_data.py (--report) and benchmark_pipeline.py. Peak RSS is per
+stage where the kernel allows resetting the high-water mark (Linux),
+otherwise it is the process high-water mark so far.
+"""
+
+import gc
+import os
+import platform
+import sys
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+def reset_peak_rss():
+    """Reset the kernel's peak RSS counter; returns False where unsupported"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+def maxrss_mb(children=False):
+    """ru_maxrss of this process (or its waited-for children) in MB"""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (None if unknown)"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return maxrss_mb()
+
+def environment():
+    """Interpreter and machine details for reports"""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+class StageTimer:
+    """Wall time and peak RSS per named stage, over one or more runs"""
+
+    def __init__(self, collect_garbage=False):
+        self.stages = {}
+        self.collect_garbage = collect_garbage
+        self.per_stage_rss = reset_peak_rss()
+
+    @contextmanager
+    def stage(self, name):
+        if self.collect_garbage:
+            gc.collect()
+        reset_peak_rss()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            entry = self.stages.setdefault(name, {"runs": [], "peak_rss_mb": None})
+            entry["runs"].append(elapsed)
+            rss = peak_rss_mb()
+            if rss is not None:
+                entry["peak_rss_mb"] = max(rss, entry["peak_rss_mb"] or 0)
+
+    def run(self, name, fn, *args, **kwargs):
+        """Call fn inside a stage and return its result"""
+        with self.stage(name):
+            return fn(*args, **kwargs)
+
+    def seconds(self, name):
+        """Best wall time of a stage"""
+        return min(self.stages[name]["runs"])
+
+    def summary(self):
+        """{stage: {"seconds", "peak_rss_mb"}} using each stage's best run"""
+        return {
+            name: {"seconds": min(entry["runs"]), "peak_rss_mb": entry["peak_rss_mb"]}
+            for name, entry in self.stages.items()
+        }
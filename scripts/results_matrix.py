@@ -0,0 +1,199 @@
+"""
+Dense task x model results matrix for the normalization scripts
+
+ResultsMatrix.build() turns the {model_id: {task_id: success}} dict produced
+by trajectory extraction into a single int8 array, one row per task and one
+column per model. Every aggregate the frontend needs (per-model totals,
+per-site and per-template breakdowns, per-task pass counts, the heatmap)
+is a vectorized reduction over that array.
+
+Cell values:
+    PASS     (1)  success flag is truthy
+    FAIL     (0)  success flag is False
+    UNSCORED (2)  a result exists but carries no usable success flag
+    MISSING (-1)  the model has no result for the task
+"""
+
+import numpy as np
+
+MISSING = -1
+FAIL = 0
+PASS = 1
+UNSCORED = 2
+
+HEATMAP_CHUNK_ROWS = 1024
+
+def encode_outcome(success):
+    """Cell value for an extracted success flag"""
+    if success:
+        return PASS
+    if success is False:
+        return FAIL
+    return UNSCORED
+
+def _codes(values):
+    """Integer codes for a column of labels, plus the sorted vocabulary"""
+    vocabulary = sorted(set(values), key=lambda v: (v is None, v))
+    lookup = {value: i for i, value in enumerate(vocabulary)}
+    return np.array([lookup[value] for value in values], dtype=np.int32), vocabulary
+
+class ResultsMatrix:
+    """Task x model outcome matrix with task metadata columns"""
+
+    def __init__(self, task_ids, model_ids, values, suite_size, sites, templates):
+        self.task_ids = task_ids        # row labels: suite tasks (sorted) then extras
+        self.model_ids = model_ids      # column labels
+        self.values = values            # int8 [tasks, models]
+        self.suite_size = suite_size    # rows [0, suite_size) belong to the task suite
+        self.row_of = {task_id: i for i, task_id in enumerate(task_ids)}
+
+        # Group codes per suite row (-1 for rows outside the suite)
+        self.site_codes, self.sites = self._group_codes(sites)
+        self.template_codes, self.templates = self._group_codes(templates)
+
+    def _group_codes(self, labels):
+        codes, vocabulary = _codes(labels)
+        padded = np.full(len(self.task_ids), -1, dtype=np.int32)
+        padded[:self.suite_size] = codes
+        return padded, vocabulary
+
+    @classmethod
+    def build(cls, all_results, task_index):
+        """Build the matrix from extracted results and a TaskIndex.
+
+        Columns keep the order of all_results. Rows are the suite's task ids
+        in sorted order, followed by any extracted task ids that are not in
+        the suite (in order of first appearance).
+        """
+        return cls._from_results(all_results, task_index.sorted_ids, task_index.site, task_index.template_id)
+
+    @classmethod
+    def from_artifacts(cls, tasks, results, heatmap_data=None):
+        """Rebuild the matrix of a full run from tasks.json and results.json.
+
+        results.json stores unscored results as failures (s = 0). Given
+        heatmap_data (heatmap_data.json), a result whose heatmap cell is null
+        comes back as UNSCORED; without it, or outside the heatmap, as FAIL.
+        """
+        suite = {}
+        for task in tasks:
+            suite.setdefault(task['id'], task)
+        unscored = set()
+        if heatmap_data is not None:
+            for task_id, row in zip(heatmap_data['task_ids'], heatmap_data['matrix']):
+                unscored.update((task_id, model_id) for model_id, cell in zip(heatmap_data['model_ids'], row)
+                                if cell is None)
+        all_results = {}
+        for record in results:
+            success = None if (record['t'], record['m']) in unscored else record['s'] == 1
+            all_results.setdefault(record['m'], {})[record['t']] = success
+        return cls._from_results(
+            all_results, sorted(suite), lambda t: suite[t]['site'], lambda t: suite[t]['template_id']
+        )
+
+    @classmethod
+    def _from_results(cls, all_results, suite_ids, site_of, template_of):
+        model_ids = list(all_results)
+        task_ids = list(suite_ids)
+        suite_size = len(task_ids)
+        row_of = {task_id: i for i, task_id in enumerate(task_ids)}
+        for task_results in all_results.values():
+            for task_id in task_results:
+                if task_id not in row_of:
+                    row_of[task_id] = len(task_ids)
+                    task_ids.append(task_id)
+
+        values = np.full((len(task_ids), len(model_ids)), MISSING, dtype=np.int8)
+        for col, task_results in enumerate(all_results.values()):
+            if not task_results:
+                continue
+            rows = np.fromiter((row_of[t] for t in task_results), dtype=np.int64, count=len(task_results))
+            cells = np.fromiter((encode_outcome(s) for s in task_results.values()), dtype=np.int8, count=len(task_results))
+            values[rows, col] = cells
+
+        suite_ids = task_ids[:suite_size]
+        sites = [site_of(task_id) for task_id in suite_ids]
+        templates = [template_of(task_id) for task_id in suite_ids]
+        return cls(task_ids, model_ids, values, suite_size, sites, templates)
+
+    @property
+    def present(self):
+        return self.values != MISSING
+
+    @property
+    def passed(self):
+        return self.values == PASS
+
+    @property
+    def scored(self):
+        """Results with a usable success flag (PASS or FAIL)"""
+        return (self.values == PASS) | (self.values == FAIL)
+
+    def model_totals(self):
+        """Results per model, including tasks outside the suite"""
+        return self.present.sum(axis=0)
+
+    def model_successes(self):
+        return self.passed.sum(axis=0)
+
+    def task_success_counts(self):
+        """Models passing each row"""
+        return self.passed.sum(axis=1)
+
+    def group_counts(self, codes, n_groups):
+        """(successes, totals) arrays of shape [n_groups, models] for suite rows"""
+        n_models = len(self.model_ids)
+        valid = codes >= 0
+        cells = (codes[valid, None] * n_models + np.arange(n_models)).ravel()
+        shape = (n_groups, n_models)
+
+        def count(mask):
+            flat = np.bincount(cells, weights=mask[valid].ravel(), minlength=n_groups * n_models)
+            return flat.astype(np.int64).reshape(shape)
+
+        return count(self.passed), count(self.present)
+
+    def site_counts(self):
+        return self.group_counts(self.site_codes, len(self.sites))
+
+    def template_counts(self):
+        return self.group_counts(self.template_codes, len(self.templates))
+
+    def group_breakdown(self, model_id, labels, counts):
+        """{label: {'success', 'total', 'rate'}} for one model, skipping empty groups"""
+        col = self.model_ids.index(model_id)
+        successes, totals = counts
+        breakdown = {}
+        for g, label in enumerate(labels):
+            t = int(totals[g, col])
+            if t == 0:
+                continue
+            s = int(successes[g, col])
+            breakdown[label] = {
+                "success": s,
+                "total": t,
+                "rate": round((s / t * 100), 1),
+            }
+        return breakdown
+
+    def passing_models(self, task_id):
+        """Model ids that pass task_id, in column order"""
+        row = self.row_of.get(task_id)
+        if row is None:
+            return []
+        return [self.model_ids[j] for j in np.flatnonzero(self.values[row] == PASS)]
+
+    def iter_heatmap(self, model_ids, chunk_rows=HEATMAP_CHUNK_ROWS):
+        """Suite rows as lists of 1 / 0 / None, with columns in model_ids order,
+        converted chunk_rows rows at a time"""
+        cols = [self.model_ids.index(model_id) for model_id in model_ids]
+        for start in range(0, self.suite_size, chunk_rows):
+            block = self.values[start:min(start + chunk_rows, self.suite_size), cols]
+            cells = np.full(block.shape, None, dtype=object)
+            cells[block == PASS] = 1
+            cells[block == FAIL] = 0
+            yield from cells.tolist()
+
+    def heatmap(self, model_ids):
+        """iter_heatmap() as a list"""
+        return list(self.iter_heatmap(model_ids))
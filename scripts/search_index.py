@@ -0,0 +1,101 @@
+"""
+Prebuilt full-text search index over the benchmark tasks
+
+Indexes each task's intent, site, template id and reference answers into
+an inverted index with precomputed term scores. The vocabulary is sorted,
+so the frontend (web/lib/search-index.ts) can resolve prefix queries with
+a binary search and rank documents by summing posting scores, without
+rescanning any task text.
+
+Artifact layout (search_index.json, minified):
+    {
+      "version": 1,
+      "doc_ids": [0, 1, ...],          # task id of each document
+      "terms": ["a", "abc", ...],      # sorted vocabulary
+      "postings": [[d0, s0, d1, s1, ...], ...]
+    }
+Each postings list belongs to the term at the same position. Document
+numbers are delta-encoded (d0 absolute, then gaps), and scores are
+tf-idf weights multiplied by SCORE_SCALE and rounded to integers.
+"""
+
+import math
+import re
+from collections import Counter, defaultdict
+
+SEARCH_INDEX_FILE = "search_index.json"
+SEARCH_INDEX_VERSION = 1
+SCORE_SCALE = 100
+
+# Field weights applied to term frequencies
+FIELD_WEIGHTS = {
+    "intent": 3,
+    "site": 2,
+    "template": 2,
+    "reference": 1,
+}
+
+_TOKEN = re.compile(r'\w+')
+
+def tokenize(text):
+    """Lowercased word tokens; must match tokenize() in web/lib/search-index.ts"""
+    return _TOKEN.findall(str(text).lower())
+
+def flatten_strings(value):
+    """All scalar leaves of a nested reference-answer structure, as strings"""
+    if isinstance(value, dict):
+        for item in value.values():
+            yield from flatten_strings(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from flatten_strings(item)
+    elif value is not None:
+        yield str(value)
+
+def task_fields(task):
+    """(field, text) pairs indexed for a raw test.raw.json task"""
+    yield "intent", task.get('intent', '')
+    for site in task.get('sites') or []:
+        yield "site", site
+    if task.get('intent_template_id') is not None:
+        yield "template", f"template_{task['intent_template_id']}"
+    for answer in flatten_strings(task.get('eval', {}).get('reference_answers')):
+        yield "reference", answer
+
+def build_search_index(raw_tasks):
+    """Build the search_index.json structure from raw tasks"""
+    doc_ids = []
+    weighted_tf = []  # per document: Counter(term -> weighted frequency)
+    for task in raw_tasks:
+        counts = Counter()
+        for field, text in task_fields(task):
+            weight = FIELD_WEIGHTS[field]
+            for token in tokenize(text):
+                counts[token] += weight
+        doc_ids.append(task['task_id'])
+        weighted_tf.append(counts)
+
+    postings = defaultdict(list)
+    for doc, counts in enumerate(weighted_tf):
+        for term, tf in counts.items():
+            postings[term].append((doc, tf))
+
+    n_docs = len(doc_ids)
+    terms = sorted(postings)
+    encoded = []
+    for term in terms:
+        idf = math.log(1 + n_docs / len(postings[term]))
+        flat = []
+        previous = 0
+        for doc, tf in postings[term]:
+            flat.append(doc - previous)
+            flat.append(max(1, round(math.log(1 + tf) * idf * SCORE_SCALE)))
+            previous = doc
+        encoded.append(flat)
+
+    return {
+        "version": SEARCH_INDEX_VERSION,
+        "doc_ids": doc_ids,
+        "terms": terms,
+        "postings": encoded,
+    }
@@ -0,0 +1,106 @@
+"""
+Sharded data slices for lazy loading in the web frontend
+
+Writes web/public/data/shards/ so a page can fetch only what it renders:
+- index.json: task ids, page ranges, site shards and file locations
+- pages/<n>.json: task summaries for page n (1-based, PAGE_SIZE tasks by id)
+- sites/<site>.json: task summaries for one site
+- tasks/<id>.json: one task with its difficulty and per-model results
+- models/<model_id>.json: one model's 1 / 0 / null vector over index.task_ids
+
+A task summary is a tasks.json entry plus success_count, success_rate and
+difficulty from task_difficulty.json. Shard files are minified; the whole
+directory is rewritten on every run.
+"""
+
+import shutil
+from collections import defaultdict
+
+from compact_export import dump_minified
+
+SHARDS_DIR = "shards"
+SHARD_VERSION = 1
+PAGE_SIZE = 20  # matches TASKS_PER_PAGE in web/components/TaskBrowser.tsx
+
+def task_summary(task, difficulty):
+    summary = dict(task)
+    if difficulty is not None:
+        summary["success_count"] = difficulty["success_count"]
+        summary["success_rate"] = difficulty["success_rate"]
+        summary["difficulty"] = difficulty["difficulty"]
+    return summary
+
+def write_shards(output_dir, tasks, task_difficulty, results, heatmap_data):
+    """Write all shards and the index; returns the number of files written"""
+    shard_dir = output_dir / SHARDS_DIR
+    if shard_dir.exists():
+        shutil.rmtree(shard_dir)
+    for sub in ("pages", "sites", "tasks", "models"):
+        (shard_dir / sub).mkdir(parents=True)
+
+    difficulty_by_id = {entry["id"]: entry for entry in task_difficulty}
+    results_by_task = defaultdict(list)
+    for result in results:
+        results_by_task[result["t"]].append({"m": result["m"], "s": result["s"]})
+
+    ordered = sorted(tasks, key=lambda task: task["id"])
+    summaries = [task_summary(task, difficulty_by_id.get(task["id"])) for task in ordered]
+    files = 0
+
+    # Page-range shards
+    pages = []
+    for start in range(0, len(summaries), PAGE_SIZE):
+        page = summaries[start:start + PAGE_SIZE]
+        name = f"pages/{len(pages) + 1}.json"
+        dump_minified(page, shard_dir / name)
+        pages.append({
+            "file": name,
+            "first_id": page[0]["id"],
+            "last_id": page[-1]["id"],
+            "count": len(page),
+        })
+        files += 1
+
+    # Per-site shards
+    by_site = defaultdict(list)
+    for summary in summaries:
+        by_site[summary["site"]].append(summary)
+    sites = {}
+    for site in sorted(by_site):
+        name = f"sites/{site}.json"
+        dump_minified(by_site[site], shard_dir / name)
+        sites[site] = {"file": name, "count": len(by_site[site])}
+        files += 1
+
+    # Per-task records
+    for task in ordered:
+        dump_minified({
+            "task": task,
+            "difficulty": difficulty_by_id.get(task["id"]),
+            "results": results_by_task.get(task["id"], []),
+        }, shard_dir / f"tasks/{task['id']}.json")
+        files += 1
+
+    # Per-model result vectors (columns of the heatmap)
+    models = {}
+    for col, model_id in enumerate(heatmap_data["model_ids"]):
+        name = f"models/{model_id}.json"
+        dump_minified({
+            "id": model_id,
+            "values": [row[col] for row in heatmap_data["matrix"]],
+        }, shard_dir / name)
+        models[model_id] = name
+        files += 1
+
+    dump_minified({
+        "version": SHARD_VERSION,
+        "page_size": PAGE_SIZE,
+        "task_count": len(summaries),
+        "task_ids": heatmap_data["task_ids"],
+        "pages": pages,
+        "sites": sites,
+        "task_file": "tasks/{id}.json",
+        "models": models,
+    }, shard_dir / "index.json")
+
+    return files + 1
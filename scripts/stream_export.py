@@ -0,0 +1,102 @@
+"""
+Streaming JSON writers for large artifacts (normalize_data.py --stream / --ndjson)
+
+write_json() writes an object in exactly the layout of json.dump(obj, f,
+indent=2), except that any StreamedList inside it is consumed one item at a
+time instead of being built as a list first. Records are generated and
+written lazily, so memory for results.json, task_difficulty.json and the
+heatmap matrix no longer grows with the number of records.
+
+write_ndjson() writes one minified record per line, optionally after a
+header line; see NDJSON_ARTIFACTS for the files written in that mode.
+
+Tests (byte comparison with json.dump):
+    python -m unittest scripts/test_stream_export.py
+"""
+
+import json
+from itertools import islice
+
+INDENT = 2
+CHUNK_ITEMS = 1000
+
+# Artifacts written as NDJSON by --ndjson, and their file names
+NDJSON_ARTIFACTS = {
+    "results.json": "results.ndjson",
+    "task_difficulty.json": "task_difficulty.ndjson",
+    "heatmap_data.json": "heatmap_data.ndjson",
+}
+
+class StreamedList:
+    """An iterable of plain JSON values, written as a JSON array without
+    materializing it (may be nested in dicts, not in lists)"""
+
+    def __init__(self, items):
+        self.items = items
+
+    def __iter__(self):
+        return iter(self.items)
+
+def _has_stream(value):
+    return isinstance(value, StreamedList) or (
+        isinstance(value, dict) and any(_has_stream(v) for v in value.values())
+    )
+
+def _indented(text, level):
+    """Shift multi-line JSON text right by level indents"""
+    if level == 0:
+        return text
+    pad = ' ' * (INDENT * level)
+    # Raw newlines only occur between tokens, never inside JSON strings
+    return text.replace('\n', '\n' + pad)
+
+def _write_value(f, value, level):
+    if isinstance(value, StreamedList):
+        return _write_array(f, value, level)
+    if isinstance(value, dict) and _has_stream(value):
+        return _write_object(f, value, level)
+    f.write(_indented(json.dumps(value, indent=INDENT), level))
+    return len(value) if isinstance(value, list) else None
+
+def _write_array(f, items, level):
+    # Encoding CHUNK_ITEMS records per json.dumps() call keeps memory bounded
+    # without paying the encoder setup for every record
+    items = iter(items)
+    count = 0
+    while True:
+        chunk = list(islice(items, CHUNK_ITEMS))
+        if not chunk:
+            break
+        # json.dumps(chunk) is "[\n" + indented items + "\n]"
+        body = json.dumps(chunk, indent=INDENT)[2:-2]
+        f.write(('[\n' if count == 0 else ',\n') + ' ' * (INDENT * level) + _indented(body, level))
+        count += len(chunk)
+    f.write('[]' if count == 0 else '\n' + ' ' * (INDENT * level) + ']')
+    return count
+
+def _write_object(f, obj, level):
+    newline = '\n' + ' ' * (INDENT * (level + 1))
+    for i, (key, value) in enumerate(obj.items()):
+        f.write(('{' if i == 0 else ',') + newline + json.dumps(key) + ': ')
+        _write_value(f, value, level + 1)
+    f.write('\n' + ' ' * (INDENT * level) + '}')
+
+def write_json(path, obj):
+    """Write obj like json.dump(obj, f, indent=2), streaming StreamedLists.
+
+    Returns the number of items of a top-level array (None for objects).
+    """
+    with open(path, 'w') as f:
+        return _write_value(f, obj, 0)
+
+def write_ndjson(path, records, header=None):
+    """Write records one per line (minified); returns the number of records"""
+    encode = json.JSONEncoder(separators=(',', ':')).encode
+    count = 0
+    with open(path, 'w') as f:
+        if header is not None:
+            f.write(encode(header) + '\n')
+        for record in records:
+            f.write(encode(record) + '\n')
+            count += 1
+    return count
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Synthetic trajectory trees for benchmarking normalize_data.py
+
+The real data/trajectories tree is not part of the repository. This script
+writes a self-contained stand-in that normalize_data.py (and
+benchmark_pipeline.py) can run against:
+
+    <root>/data/test.raw.json           tasks, cloned from the real task list
+    <root>/data/leaderboard.json        one entry per synthetic agent
+    <root>/data/synthetic_agents.json   agent -> name, directory and format
+    <root>/data/trajectories/...        one directory (or file) per agent
+
+Agents cycle through every format the normalizer understands: DeepSky JSON,
+Jace and GUI-hybrid JSONL, SteP and AgentOccam trajectory JSON, Narada
+score files and the trajectory-only formats. The first agent of each format
+uses the real directory name, so a plain normalize_data.py run picks it up;
+later agents get numbered directories that only the benchmark reads.
+
+Each trajectory carries padding shaped like the real dumps (accessibility
+trees and base64 screenshots). Most files are around --payload-kb; a
+--large-fraction of them are --large-kb outliers. A --late-key-fraction of
+DeepSky and Narada files put their steps under "trajectory" ahead of the
+keys that identify the format, so format sniffing has to cope with keys
+beyond the head of the file. Outcomes come from a
+logistic model of agent skill against task difficulty, so pass rates vary
+per agent and per task. Output is deterministic for a given --seed.
+
+Usage:
+    python scripts/synth_trajectories.py /tmp/synth
+    python scripts/synth_trajectories.py /tmp/synth --tasks 10000 --agents 200
+    python scripts/synth_trajectories.py /tmp/synth --formats step,agentoccam --large-kb 8192
+"""
+
+import argparse
+import base64
+import copy
+import json
+import math
+import random
+import shutil
+from pathlib import Path
+
+from normalize_data import MODEL_DIRS, MODEL_NAME_MAP
+
+DEFAULT_TASK_SOURCE = Path(__file__).resolve().parent.parent / "data" / "test.raw.json"
+AGENTS_FILE = "synthetic_agents.json"
+
+# Formats in the order agents are assigned to them
+FORMATS = [
+    "deepsky", "jace", "gui_hybrid", "step", "agentoccam", "narada",
+    "ibm_cuga", "openai_operator", "scribeagent", "learn_by_interact",
+]
+FORMAT_DIRS = {model_id: dir_name for dir_name, model_id in MODEL_DIRS.items()}
+
+GUI_HYBRID_LINES_PER_FILE = 1000
+BLOB_SIZE = 1 << 20
+STEP_KB = 32  # approximate size of one padded trajectory step
+TEMPLATE_STRIDE = 1000  # template id offset for each cloned copy of the task list
+
+ROLES = ["link", "button", "textbox", "StaticText", "menuitem", "combobox", "gridcell", "heading"]
+WORDS = ["Orders", "Customers", "Report", "Merge request", "Issue", "Forum", "Search",
+         "Add to Cart", "Sign out", "Settings", "Next page", "Reviews", "Directions"]
+
+class Padding:
+    """Deterministic filler text shaped like accessibility trees and screenshots"""
+
+    def __init__(self, rng):
+        lines = []
+        size = 0
+        while size < BLOB_SIZE:
+            line = f"[{rng.randrange(10000)}] {rng.choice(ROLES)} '{rng.choice(WORDS)}' \"{rng.randrange(1000)}\""
+            lines.append(line)
+            size += len(line) + 1
+        self.tree = "\n".join(lines)
+        self.image = base64.b64encode(rng.randbytes(BLOB_SIZE * 3 // 4)).decode('ascii')
+        self.rng = rng
+
+    def text(self, blob, size):
+        """A size-character slice of blob starting at a random offset"""
+        if size <= 0:
+            return ""
+        start = self.rng.randrange(len(blob))
+        if start + size <= len(blob):
+            return blob[start:start + size]
+        repeats = blob * (size // len(blob) + 2)
+        return repeats[start:start + size]
+
+    def steps(self, size_kb):
+        """Trajectory steps totalling roughly size_kb of padding"""
+        count = max(1, round(size_kb / STEP_KB))
+        half = int(size_kb * 1024 / count / 2)
+        return [{
+            "step": i,
+            "action": f"click [{self.rng.randrange(10000)}]",
+            "axtree": self.text(self.tree, half),
+            "screenshot": self.text(self.image, half),
+        } for i in range(count)]
+
+def write_json(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(data, f)
+
+def corrupt(text, rng):
+    """Truncate a serialized record so it no longer parses"""
+    return text[:rng.randrange(1, max(2, len(text) // 2))]
+
+def write_deepsky(path, records, padding, rng):
+    for task, success, size_kb, broken, late in records:
+        if late:
+            record = {
+                "intent": task['intent'],
+                "trajectory": padding.steps(size_kb),
+                "task_id": task['task_id'],
+                "success": success,
+            }
+        else:
+            record = {
+                "task_id": task['task_id'],
+                "intent": task['intent'],
+                "success": success,
+                "steps": padding.steps(size_kb),
+            }
+        text = json.dumps(record)
+        (path / f"{task['task_id']}.json").write_text(corrupt(text, rng) if broken else text)
+
+def write_jace(path, records, padding, rng):
+    # A single JSONL file at the directory path
+    with open(path, 'w') as f:
+        for task, success, size_kb, broken, _ in records:
+            text = json.dumps({
+                "task_id": task['task_id'],
+                "result": {"success": success, "answer": ""},
+                "trajectory": padding.steps(size_kb),
+            })
+            f.write((corrupt(text, rng) if broken else text) + "\n")
+
+def write_gui_hybrid(path, records, padding, rng):
+    for start in range(0, len(records), GUI_HYBRID_LINES_PER_FILE):
+        with open(path / f"part_{start // GUI_HYBRID_LINES_PER_FILE}.jsonl", 'w') as f:
+            for task, success, size_kb, broken, _ in records[start:start + GUI_HYBRID_LINES_PER_FILE]:
+                text = json.dumps({
+                    "task_id": task['task_id'],
+                    "correct": success,
+                    "steps": padding.steps(size_kb),
+                })
+                f.write((corrupt(text, rng) if broken else text) + "\n")
+
+def write_step(path, records, padding, rng, by_site=False):
+    for task, success, size_kb, broken, _ in records:
+        trajectory = padding.steps(size_kb)
+        trajectory[-1]["success"] = success
+        text = json.dumps({"id": task['task_id'], "intent": task['intent'], "trajectory": trajectory})
+        # AgentOccam keeps its files in per-site subdirectories
+        out_dir = path / task['sites'][0] if by_site else path
+        out_dir.mkdir(exist_ok=True)
+        (out_dir / f"task_{task['task_id']}.json").write_text(corrupt(text, rng) if broken else text)
+
+def write_agentoccam(path, records, padding, rng):
+    write_step(path, records, padding, rng, by_site=True)
+
+def write_narada(path, records, padding, rng):
+    run_dir = path / "run_1"
+    run_dir.mkdir()
+    for task, success, size_kb, broken, late in records:
+        score = 1.0 if success else 0.0
+        if late:
+            record = {"summary": task['intent'], "trajectory": padding.steps(size_kb), "score": score}
+        else:
+            record = {"score": score, "summary": task['intent'], "log": padding.steps(size_kb)}
+        text = json.dumps(record)
+        (run_dir / f"task_summary_flat_{task['task_id']}.json").write_text(corrupt(text, rng) if broken else text)
+
+def write_messages(path, records, padding, rng):
+    # Trajectory-only formats: a list of messages, no outcome
+    for task, _, size_kb, _, _ in records:
+        messages = [{"role": "user", "content": task['intent']}]
+        messages += [{"role": "assistant", "content": step["axtree"]} for step in padding.steps(size_kb)]
+        write_json(path / f"webarena_{task['task_id']}.json", messages)
+
+WRITERS = {
+    "deepsky": write_deepsky,
+    "jace": write_jace,
+    "gui_hybrid": write_gui_hybrid,
+    "step": write_step,
+    "agentoccam": write_agentoccam,
+    "narada": write_narada,
+    "ibm_cuga": write_messages,
+    "openai_operator": write_messages,
+    "scribeagent": write_messages,
+    "learn_by_interact": write_messages,
+}
+
+def synthetic_tasks(source, count):
+    """count tasks cloned from the source task list, with fresh ids"""
+    with open(source, 'r') as f:
+        pool = json.load(f)
+    tasks = []
+    for task_id in range(count):
+        base = pool[task_id % len(pool)]
+        task = copy.deepcopy(base)
+        task['task_id'] = task_id
+        generation = task_id // len(pool)
+        if generation:
+            task['intent'] = f"{base['intent']} (variant {generation})"
+            if task.get('intent_template_id') is not None:
+                task['intent_template_id'] += generation * TEMPLATE_STRIDE
+        tasks.append(task)
+    return tasks
+
+def plan_agents(count, formats):
+    """(model_id, dir_name, format) for count agents cycling through formats"""
+    agents = []
+    for i in range(count):
+        fmt = formats[i % len(formats)]
+        generation = i // len(formats)
+        if generation == 0:
+            agents.append((fmt, FORMAT_DIRS[fmt], fmt))
+        else:
+            agents.append((f"{fmt}_{generation}", f"{FORMAT_DIRS[fmt]}_{generation}", fmt))
+    return agents
+
+def generate(root, tasks=812, agents=10, formats=FORMATS, coverage=0.9, payload_kb=8.0,
+             large_kb=1024.0, large_fraction=0.01, corrupt_fraction=0.001, late_key_fraction=0.05,
+             seed=0, task_source=DEFAULT_TASK_SOURCE):
+    """Write a synthetic tree under root; returns a summary dict"""
+    rng = random.Random(seed)
+    root = Path(root)
+    data_dir = root / "data"
+    trajectories_dir = data_dir / "trajectories"
+    if trajectories_dir.exists():
+        shutil.rmtree(trajectories_dir)
+    trajectories_dir.mkdir(parents=True)
+
+    task_list = synthetic_tasks(task_source, tasks)
+    write_json(data_dir / "test.raw.json", task_list)
+
+    padding = Padding(rng)
+    difficulty = [rng.gauss(0, 1.5) for _ in task_list]
+    layout = []
+    leaderboard = []
+    trajectories = 0
+    for model_id, dir_name, fmt in plan_agents(agents, formats):
+        skill = rng.gauss(0, 1)
+        records = []
+        for i, task in enumerate(task_list):
+            if rng.random() >= coverage:
+                continue
+            success = rng.random() < 1 / (1 + math.exp(difficulty[i] - skill))
+            big = rng.random() < large_fraction
+            size_kb = large_kb if big else rng.expovariate(1 / payload_kb) if payload_kb > 0 else 0
+            broken = rng.random() < corrupt_fraction
+            records.append((task, success, size_kb, broken, rng.random() < late_key_fraction))
+
+        path = trajectories_dir / dir_name
+        if fmt != "jace":
+            path.mkdir()
+        WRITERS[fmt](path, records, padding, rng)
+        trajectories += len(records)
+
+        # Fixed-width names, so leaderboard name matching cannot confuse two agents
+        name = MODEL_NAME_MAP.get(model_id) or f"Synthetic Agent {len(layout):04d}"
+        rate = 100 * sum(1 for record in records if record[1]) / max(1, len(task_list))
+        layout.append({"model_id": model_id, "name": name, "dir": dir_name, "format": fmt})
+        leaderboard.append({
+            "a": "01/2025",
+            "Open?": "✓" if rng.random() < 0.5 else "✗",
+            "Model Size (billion)": "-",
+            "Model": name,
+            "Success Rate (%)": f"{rate:.1f}",
+            "Result Source": "Synthetic",
+            "Work": name,
+            "Traj": "Link",
+            "Note": None,
+        })
+
+    write_json(data_dir / "leaderboard.json", {"last_updated": "synthetic", "leaderboard": leaderboard})
+    write_json(data_dir / AGENTS_FILE, layout)
+
+    size = sum(p.stat().st_size for p in trajectories_dir.rglob("*") if p.is_file())
+    return {"tasks": len(task_list), "agents": len(layout), "trajectories": trajectories, "bytes": size}
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic WebArena trajectory tree")
+    parser.add_argument("root", type=Path, help="Directory to write data/ into")
+    add_generator_args(parser)
+    return parser.parse_args(argv)
+
+def add_generator_args(parser):
+    """Generator options, shared with benchmark_pipeline.py"""
+    parser.add_argument("--tasks", type=int, default=812, help="Number of tasks (default: 812)")
+    parser.add_argument("--agents", type=int, default=10, help="Number of agents (default: 10)")
+    parser.add_argument(
+        "--formats", default=",".join(FORMATS),
+        help="Comma-separated formats to cycle agents through (default: all)",
+    )
+    parser.add_argument("--coverage", type=float, default=0.9, help="Fraction of tasks each agent attempts")
+    parser.add_argument("--payload-kb", type=float, default=8.0, help="Mean padding per trajectory in KB")
+    parser.add_argument("--large-kb", type=float, default=1024.0, help="Padding of large trajectories in KB")
+    parser.add_argument("--large-fraction", type=float, default=0.01, help="Fraction of large trajectories")
+    parser.add_argument("--corrupt-fraction", type=float, default=0.001, help="Fraction of truncated records")
+    parser.add_argument(
+        "--late-key-fraction", type=float, default=0.05,
+        help="Fraction of DeepSky/Narada files whose format keys come after the steps",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--task-source", type=Path, default=DEFAULT_TASK_SOURCE, help="Task list to clone")
+
+def generator_options(args):
+    """generate() keyword arguments from parsed generator options"""
+    formats = [fmt.strip() for fmt in args.formats.split(",") if fmt.strip()]
+    unknown = [fmt for fmt in formats if fmt not in WRITERS]
+    if unknown or not formats:
+        raise SystemExit(f"Unknown formats: {', '.join(unknown) or '(none given)'}; choose from {', '.join(FORMATS)}")
+    return {
+        "tasks": args.tasks,
+        "agents": args.agents,
+        "formats": formats,
+        "coverage": args.coverage,
+        "payload_kb": args.payload_kb,
+        "large_kb": args.large_kb,
+        "large_fraction": args.large_fraction,
+        "corrupt_fraction": args.corrupt_fraction,
+        "late_key_fraction": args.late_key_fraction,
+        "seed": args.seed,
+        "task_source": args.task_source,
+    }
+
+def main(argv=None):
+    args = parse_args(argv)
+    summary = generate(args.root, **generator_options(args))
+    print(f"✓ Wrote {summary['trajectories']} trajectories for {summary['agents']} agents "
+          f"× {summary['tasks']} tasks ({summary['bytes'] / 1024 / 1024:.1f} MB) to {args.root / 'data'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Task metadata index for the normalization scripts
+
+Loads a task suite (e.g. data/test.raw.json) once and exposes O(1)
+task_id -> metadata lookups, plus site / template / eval-type columns
+aligned with the task order in the source file.
+"""
+
+import json
+
+def task_site(task):
+    """Primary site of a raw task, 'unknown' if it has none"""
+    return task['sites'][0] if task.get('sites') else 'unknown'
+
+def task_eval_type(task):
+    """Primary evaluation type of a raw task, 'unknown' if it has none"""
+    return task['eval']['eval_types'][0] if task['eval'].get('eval_types') else 'unknown'
+
+class TaskIndex:
+    """task_id -> metadata table with precomputed per-task columns"""
+
+    def __init__(self, tasks):
+        self.tasks = list(tasks)
+
+        # Columns, one entry per task in source order
+        self.task_ids = [task['task_id'] for task in self.tasks]
+        self.sites = [task_site(task) for task in self.tasks]
+        self.template_ids = [task.get('intent_template_id') for task in self.tasks]
+        self.eval_types = [task_eval_type(task) for task in self.tasks]
+
+        # First occurrence wins, matching a linear scan over the task list
+        self.positions = {}
+        for i, task_id in enumerate(self.task_ids):
+            self.positions.setdefault(task_id, i)
+
+        self.sorted_ids = sorted(self.positions)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r') as f:
+            return cls(json.load(f))
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def __contains__(self, task_id):
+        return task_id in self.positions
+
+    def get(self, task_id):
+        """Raw task dict for task_id, or None if it is not in the suite"""
+        i = self.positions.get(task_id)
+        return None if i is None else self.tasks[i]
+
+    def site(self, task_id):
+        """Site of task_id, or None if it is not in the suite"""
+        i = self.positions.get(task_id)
+        return None if i is None else self.sites[i]
+
+    def template_id(self, task_id):
+        i = self.positions.get(task_id)
+        return None if i is None else self.template_ids[i]
+
+    def eval_type(self, task_id):
+        i = self.positions.get(task_id)
+        return None if i is None else self.eval_types[i]
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+analytics.py on a small synthetic results matrix
+
+Checks that the bootstrap does not depend on the number of workers and
+the McNemar and Holm helpers against hand-computed values:
+
+    python -m unittest scripts/test_analytics.py
+"""
+
+import random
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import analytics
+from results_matrix import ResultsMatrix
+
+def synthetic_matrix(tasks=80, models=("a", "b", "c"), seed=7):
+    """Random pass/fail/unscored results over two sites, with a few gaps"""
+    rng = random.Random(seed)
+    task_records = [{"id": i, "site": "gitlab" if i % 3 else "reddit", "template_id": i // 4} for i in range(tasks)]
+    results = []
+    unscored = set()
+    for j, model_id in enumerate(models):
+        for task in task_records:
+            draw = rng.random()
+            if draw < 0.1:
+                continue
+            if draw < 0.15:
+                unscored.add((task["id"], model_id))
+            results.append({"t": task["id"], "m": model_id, "s": int(rng.random() < 0.3 + 0.2 * j)})
+    heatmap = {
+        "task_ids": [task["id"] for task in task_records],
+        "model_ids": list(models),
+        "matrix": [[None if (task["id"], model_id) in unscored else 0 for model_id in models]
+                   for task in task_records],
+    }
+    return ResultsMatrix.from_artifacts(task_records, results, heatmap)
+
+class AnalyticsTest(unittest.TestCase):
+    def test_output_does_not_depend_on_workers(self):
+        matrix = synthetic_matrix()
+        # More than one BOOTSTRAP_CHUNK, so the pool really splits the work
+        resamples = analytics.BOOTSTRAP_CHUNK * 2 + 100
+        serial = analytics.build_analytics(matrix, resamples=resamples, workers=1)
+        parallel = analytics.build_analytics(matrix, resamples=resamples, workers=2)
+        self.assertEqual(serial, parallel)
+
+    def test_unscored_results_are_left_out(self):
+        matrix = synthetic_matrix()
+        models = analytics.build_analytics(matrix, resamples=50)["models"]
+        for j, model in enumerate(models):
+            self.assertEqual(model["total"], int(matrix.scored[:, j].sum()))
+            self.assertEqual(model["successes"], int(matrix.passed[:, j].sum()))
+
+    def test_mcnemar_p(self):
+        only_a = np.array([0, 1, 5, 0, 3])
+        only_b = np.array([5, 9, 5, 0, 0])
+        expected = [
+            2 / 2 ** 5,           # all 5 discordant pairs on one side
+            2 * 11 / 2 ** 10,     # P(X <= 1) for X ~ Binomial(10, 1/2), doubled
+            1.0,                  # balanced
+            1.0,                  # no discordant pairs
+            2 / 2 ** 3,
+        ]
+        np.testing.assert_allclose(analytics.mcnemar_p(only_a, only_b), expected)
+
+    def test_holm(self):
+        p_values = np.array([0.01, 0.04, 0.03, 0.005])
+        # Sorted: 4 * 0.005, 3 * 0.01, 2 * 0.03, then max(0.06, 1 * 0.04) to stay monotone
+        np.testing.assert_allclose(analytics.holm(p_values), [0.03, 0.06, 0.06, 0.02])
+        np.testing.assert_allclose(analytics.holm(np.array([0.5, 0.9])), [1.0, 1.0])
+
+if __name__ == "__main__":
+    unittest.main()
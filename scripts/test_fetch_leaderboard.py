@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+fetch_leaderboard.py against a local HTTP stand-in
+
+Serves leaderboard documents from a ThreadingHTTPServer on a free port
+and runs fetch_leaderboard.main() on them with a temporary --sources and
+--state file. Needs only the standard library:
+
+    python -m unittest scripts/test_fetch_leaderboard.py
+"""
+
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import fetch_leaderboard
+
+CSV_BODY = b"Model,Success Rate (%),Open?\nAgent A,42.5,True\nAgent B,,False\nAgent C,10,True\n"
+
+def json_document(rate):
+    return {"last_updated": "2025-01-01T00:00:00Z", "leaderboard": [{"Model": "Agent", "Success Rate (%)": rate}]}
+
+class StandIn:
+    """Documents by path, each with an ETag; counts requests and can fail some"""
+
+    def __init__(self):
+        self.documents = {}  # path -> (body, etag)
+        self.requests = []  # (path, If-None-Match)
+        self.failures = {}  # path -> responses to answer with 503 first
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stand_in.requests.append((self.path, self.headers.get("If-None-Match")))
+                if stand_in.failures.get(self.path, 0) > 0:
+                    stand_in.failures[self.path] -= 1
+                    self.send_error(503)
+                    return
+                if self.path not in stand_in.documents:
+                    self.send_error(404)
+                    return
+                body, etag = stand_in.documents[self.path]
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def last_validator(self, path):
+        """If-None-Match of the latest request for path"""
+        return [etag for requested, etag in self.requests if requested == path][-1]
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.server.server_port}{path}"
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+class FetchLeaderboardTest(unittest.TestCase):
+    def setUp(self):
+        self.stand_in = StandIn()
+        self.addCleanup(self.stand_in.close)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        self.state_file = self.dir / "fetch_state.json"
+        self.sources = [
+            {"name": "osworld", "url": self.stand_in.url("/osworld.json"),
+             "format": "json", "output": str(self.dir / "out" / "osworld_leaderboard.json")},
+            {"name": "sheet", "url": self.stand_in.url("/sheet.csv"),
+             "format": "csv", "output": str(self.dir / "out" / "sheet_leaderboard.json")},
+        ]
+        self.serve("/osworld.json", json.dumps(json_document(30.0)).encode(), '"v1"')
+        self.serve("/sheet.csv", CSV_BODY, '"s1"')
+
+    def serve(self, path, body, etag):
+        self.stand_in.documents[path] = (body, etag)
+
+    def run_fetch(self, *extra):
+        sources_file = self.dir / "sources.json"
+        sources_file.write_text(json.dumps(self.sources))
+        argv = ["--sources", str(sources_file), "--only", "osworld", "--only", "sheet",
+                "--state", str(self.state_file), "--backoff", "0.01", "--timeout", "5", *extra]
+        output = io.StringIO()
+        code = 0
+        with contextlib.redirect_stdout(output):
+            try:
+                fetch_leaderboard.main(argv)
+            except SystemExit as e:
+                code = e.code
+        return code, output.getvalue()
+
+    def state(self):
+        return json.loads(self.state_file.read_text())
+
+    def test_first_fetch_writes_outputs_and_state(self):
+        code, output = self.run_fetch()
+        self.assertEqual(code, 0, output)
+        with open(self.sources[0]["output"]) as f:
+            self.assertEqual(json.load(f), json_document(30.0))
+        with open(self.sources[1]["output"]) as f:
+            sheet = json.load(f)
+        self.assertEqual(sheet["leaderboard"], [
+            {"Model": "Agent A", "Success Rate (%)": 42.5, "Open?": True},
+            {"Model": "Agent C", "Success Rate (%)": 10.0, "Open?": True},
+        ])
+        self.assertEqual(self.state()["osworld"]["etag"], '"v1"')
+        self.assertEqual(self.state()["sheet"]["etag"], '"s1"')
+
+    def test_csv_parsing_matches_pandas(self):
+        try:
+            import pandas  # noqa: F401
+        except ImportError:
+            self.skipTest("pandas is not installed")
+        self.assertEqual(
+            fetch_leaderboard.leaderboard_from_csv(CSV_BODY)["leaderboard"],
+            fetch_leaderboard.leaderboard_from_csv_pandas(CSV_BODY)["leaderboard"],
+        )
+
+    def test_second_fetch_is_conditional(self):
+        self.run_fetch()
+        output_path = Path(self.sources[0]["output"])
+        before = output_path.stat().st_mtime_ns
+        code, output = self.run_fetch()
+        self.assertEqual(code, 0, output)
+        self.assertIn("not modified (304)", output)
+        self.assertEqual(self.stand_in.last_validator("/osworld.json"), '"v1"')
+        self.assertEqual(self.stand_in.last_validator("/sheet.csv"), '"s1"')
+        self.assertEqual(output_path.stat().st_mtime_ns, before)
+
+    def test_unchanged_content_is_not_rewritten(self):
+        self.run_fetch()
+        output_path = Path(self.sources[0]["output"])
+        before = output_path.read_bytes()
+        # New ETag and timestamp, same entries
+        document = json_document(30.0)
+        document["last_updated"] = "2025-02-01T00:00:00Z"
+        self.serve("/osworld.json", json.dumps(document).encode(), '"v2"')
+        code, output = self.run_fetch()
+        self.assertEqual(code, 0, output)
+        self.assertIn("osworld: unchanged (1 entries)", output)
+        self.assertEqual(output_path.read_bytes(), before)
+        self.assertEqual(self.state()["osworld"]["etag"], '"v2"')
+
+    def test_changed_content_is_written(self):
+        self.run_fetch()
+        self.serve("/osworld.json", json.dumps(json_document(35.0)).encode(), '"v2"')
+        code, output = self.run_fetch()
+        self.assertEqual(code, 0, output)
+        self.assertIn("osworld: updated", output)
+        with open(self.sources[0]["output"]) as f:
+            self.assertEqual(json.load(f), json_document(35.0))
+
+    def test_transient_errors_are_retried(self):
+        self.stand_in.failures["/osworld.json"] = 2
+        code, output = self.run_fetch()
+        self.assertEqual(code, 0, output)
+        attempts = [path for path, _ in self.stand_in.requests if path == "/osworld.json"]
+        self.assertEqual(len(attempts), 3)
+
+    def test_failed_write_does_not_record_validators(self):
+        # A file where the output directory should be makes the write fail
+        blocked = self.dir / "blocked"
+        blocked.write_text("")
+        self.sources[0]["output"] = str(blocked / "osworld_leaderboard.json")
+        code, output = self.run_fetch()
+        self.assertEqual(code, 1)
+        self.assertIn("Error fetching osworld", output)
+        self.assertNotIn("osworld", self.state())
+        self.assertIn("sheet", self.state())
+
+        # Once the output can be written, the next run fetches it in full
+        blocked.unlink()
+        code, output = self.run_fetch()
+        self.assertEqual(code, 0, output)
+        self.assertIn("osworld: updated", output)
+        self.assertIsNone(self.stand_in.last_validator("/osworld.json"))
+        self.assertEqual(self.stand_in.last_validator("/sheet.csv"), '"s1"')
+
+    def test_sources_without_url_are_skipped(self):
+        self.sources = []
+        code, output = self.run_fetch("--only", "visualwebarena")
+        self.assertEqual(code, 0, output)
+        self.assertIn("visualwebarena: no URL configured", output)
+        self.assertEqual(self.stand_in.requests, [])
+
+if __name__ == "__main__":
+    unittest.main()
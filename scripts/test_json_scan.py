@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+json_scan.py against json.loads, with tiny chunks
+
+The chunked reader has to handle tokens split across chunk boundaries:
+escapes, surrogate pairs, and numbers cut short ("1.5" of "1.5e-07").
+Every test runs with CHUNK_SIZE set to a few small values, so every
+boundary position is hit, and compares the result with json.loads:
+
+    python -m unittest scripts/test_json_scan.py
+"""
+
+import io
+import json
+import random
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import json_scan
+from json_scan import KEEP, SKIP, load_pruned, load_trajectory_fields
+
+CHUNK_SIZES = (1, 2, 3, 5, 7, 64)
+
+# Scalars and strings that are awkward to split
+TRICKY_VALUES = [
+    1.5e-07, -0.0, 0, -12, 123456789012345678901234567890, 3.25, 1e+300, True, False, None,
+    "", "plain", 'quote " inside', "back\\slash", "\\\"", "tab\tnew\nline", "é ü ß", "😀 emoji",
+    "\u0000 nul", "ends with backslash \\",
+]
+
+def random_value(rng, depth=0):
+    if depth >= 3 or rng.random() < 0.4:
+        return rng.choice(TRICKY_VALUES)
+    if rng.random() < 0.5:
+        return [random_value(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+    return {rng.choice(["a", "b", "\"k\"", "k\\", "ключ", "success"]) + str(i): random_value(rng, depth + 1)
+            for i in range(rng.randint(0, 4))}
+
+def random_trajectory(rng):
+    """A trajectory document with the kept fields among large skipped ones"""
+    document = {
+        "screenshot": "x" * rng.randint(0, 40),
+        "id": rng.randint(0, 811),
+        "tree": random_value(rng),
+        "trajectory": [
+            {"action": random_value(rng), "success": rng.choice([True, False, None, 1.5e-07])}
+            for _ in range(rng.randint(0, 4))
+        ],
+        "score": rng.choice([0.0, 1.0, 1e-07, None]),
+    }
+    if rng.random() < 0.5:
+        document["success"] = rng.choice([True, False])
+    return document
+
+def expected_trajectory_fields(document):
+    """What load_trajectory_fields should keep, computed on the decoded document"""
+    kept = {key: document[key] for key in ("id", "task_id", "score", "success") if key in document}
+    if "trajectory" in document:
+        steps = [{"success": step["success"]} if "success" in step else {} for step in document["trajectory"]]
+        kept["trajectory"] = steps[-1:]
+    return kept
+
+def dump(document, rng):
+    """Compact, indented or ASCII-escaped text for the same document"""
+    return rng.choice([
+        lambda: json.dumps(document),
+        lambda: json.dumps(document, indent=2),
+        lambda: json.dumps(document, ensure_ascii=False, separators=(",", ":")),
+    ])()
+
+class JsonScanTest(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(20)
+        original = json_scan.CHUNK_SIZE
+        self.addCleanup(setattr, json_scan, "CHUNK_SIZE", original)
+
+    def for_each_chunk_size(self, check):
+        for chunk_size in CHUNK_SIZES:
+            json_scan.CHUNK_SIZE = chunk_size
+            with self.subTest(chunk_size=chunk_size):
+                check()
+
+    def test_keep_matches_json_loads(self):
+        documents = [dump(random_value(self.rng, depth=1), self.rng) for _ in range(60)]
+        documents = [text for text in documents if text[0] in "[{"]
+        documents += ['{"n": 1.5e-07}', '[1.5e-07, -0.0, 10]', '{"s": "\\ud83d\\ude00\\"\\\\"}', "[]", "{}"]
+
+        def check():
+            for text in documents:
+                self.assertEqual(load_pruned(io.StringIO(text), lambda path: KEEP), json.loads(text), text)
+
+        self.for_each_chunk_size(check)
+
+    def test_skip_walks_every_value(self):
+        documents = [dump({"skipped": random_value(self.rng), "id": i}, self.rng) for i in range(60)]
+
+        def check():
+            for i, text in enumerate(documents):
+                kept = load_pruned(io.StringIO(text), lambda path: path == ("id",))
+                self.assertEqual(kept, {"id": i}, text)
+                self.assertEqual(load_pruned(io.StringIO(text), lambda path: SKIP), {}, text)
+
+        self.for_each_chunk_size(check)
+
+    def test_trajectory_fields_match_json_loads(self):
+        documents = [dump(random_trajectory(self.rng), self.rng) for _ in range(60)]
+
+        def check():
+            for text in documents:
+                expected = expected_trajectory_fields(json.loads(text))
+                self.assertEqual(load_trajectory_fields(io.StringIO(text)), expected, text)
+
+        self.for_each_chunk_size(check)
+
+    def test_truncated_input_raises(self):
+        text = json.dumps(random_trajectory(self.rng) | {"tail": [1.5e-07, "a\\\"b", {"c": None}]})
+
+        def check():
+            for end in range(len(text)):
+                with self.assertRaises(ValueError, msg=text[:end]):
+                    load_pruned(io.StringIO(text[:end]), lambda path: KEEP)
+                with self.assertRaises(ValueError, msg=text[:end]):
+                    load_trajectory_fields(io.StringIO(text[:end]))
+
+        self.for_each_chunk_size(check)
+
+    def test_malformed_input_raises(self):
+        documents = [
+            '{"a" 1}', '{"a": [1 2]}', '{"a": tru}', '{a: 1}', '[1,]', '{"a": 1,}',
+            '{"a": 1 "b": 2}', '{"a": "unterminated}', '{"a": [1, 2}', '{"a": 1.5e}', '{"a": -}',
+        ]
+
+        def check():
+            for text in documents:
+                for select in (lambda path: KEEP, lambda path: SKIP):
+                    with self.assertRaises(ValueError, msg=text):
+                        load_pruned(io.StringIO(text), select)
+
+        self.for_each_chunk_size(check)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+model_names.py: which leaderboard names join to which models
+
+Table-driven cases for the WebArena sheet names, generic tokens, aliases,
+ambiguity and duplicate rows:
+
+    python -m unittest scripts/test_model_names.py
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from model_names import (
+    EXACT, FUZZY, MODEL_ALIASES, MODEL_NAME_ALIASES, MODEL_NAME_MAP, TOKENS, NameIndex, canonical_name,
+    describe_issue,
+)
+
+# WebArena sheet name -> (model id, method), or None when it joins nothing
+SHEET_NAMES = {
+    "DeepSky Agent": ("deepsky", EXACT),
+    "Narada AI": ("narada", EXACT),
+    "IBM CUGA": ("ibm_cuga", EXACT),
+    "OpenAI Operator": ("openai_operator", EXACT),
+    "Jace.AI": ("jace", EXACT),
+    "ScribeAgent + GPT-4o": ("scribeagent", TOKENS),
+    "Learn-by-Interact": ("learn_by_interact", EXACT),
+    "AgentOccam-Judge": ("agentoccam", TOKENS),
+    "GUI-API Hybrid Agent": ("gui_hybrid", TOKENS),
+    "SteP": ("step", EXACT),
+    "AgentSymbiotic": None,
+    "WebPilot": None,
+    "Agent Workflow Memory": None,
+    "BrowserGym + GPT-4": None,
+    "AgentTrek-1.0-32B": None,
+    "GPT-4o + Tree Search": None,
+    "gpt-4o-2024-05-13": None,
+    "Gemini Pro": None,
+    "Agent Flan": None,
+    "CodeAct Agent": None,
+    "AgentLM-70b": None,
+    "Mixtral": None,
+    "43.7": None,
+}
+
+# Names that share only generic tokens ("agent", "ai") with a model
+GENERIC_NAMES = ["Agent", "agent", "AI Agent", "The Agent", "Agent AI", "AI"]
+
+# Names reached through MODEL_ALIASES
+ALIAS_NAMES = {
+    "OpenAI CUA": "openai_operator",
+    "openai-cua": "openai_operator",
+    "OpenAI CUA 4o": "openai_operator",
+}
+
+class NameIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = NameIndex(MODEL_NAME_MAP, MODEL_NAME_ALIASES)
+
+    def assert_resolves(self, name, expected):
+        match, ambiguous = self.index.resolve(name)
+        self.assertEqual(ambiguous, [], name)
+        if expected is None:
+            self.assertIsNone(match, name)
+        else:
+            self.assertEqual((match.model_id, match.method), expected, name)
+
+    def test_sheet_names(self):
+        for name, expected in SHEET_NAMES.items():
+            with self.subTest(name=name):
+                self.assert_resolves(name, expected)
+
+    def test_sheet_join(self):
+        names = list(SHEET_NAMES)
+        joined, issues = self.index.join(names)
+        self.assertEqual(issues, [])
+        expected = {joins[0]: name for name, joins in SHEET_NAMES.items() if joins}
+        self.assertEqual({model_id: names[row] for model_id, (row, _) in joined.items()}, expected)
+
+    def test_generic_tokens_match_nothing(self):
+        for name in GENERIC_NAMES:
+            with self.subTest(name=name):
+                self.assert_resolves(name, None)
+
+    def test_distinctive_token_still_matches(self):
+        self.assert_resolves("DeepSky", ("deepsky", TOKENS))
+        self.assert_resolves("Narada", ("narada", TOKENS))
+        self.assert_resolves("AgentOccam", ("agentoccam", EXACT))
+
+    def test_tokens_shared_by_several_models_are_not_distinctive(self):
+        index = NameIndex({"x": "Foo Alpha", "y": "Foo Beta"})
+        self.assertEqual(index.resolve("Foo"), (None, []))
+        match, _ = index.resolve("Foo Alpha Large")
+        self.assertEqual(match.model_id, "x")
+
+    def test_aliases(self):
+        for name, model_id in ALIAS_NAMES.items():
+            with self.subTest(name=name):
+                self.assert_resolves(name, (model_id, EXACT))
+
+    def test_alias_tables_agree(self):
+        for model_id, aliases in MODEL_NAME_ALIASES.items():
+            self.assertEqual(MODEL_ALIASES[MODEL_NAME_MAP[model_id]], aliases)
+        for name, aliases in MODEL_ALIASES.items():
+            self.assertEqual(canonical_name(name), name)
+            for alias in aliases:
+                self.assertEqual(canonical_name(alias), name)
+        self.assertEqual(canonical_name("Unknown Model"), "Unknown Model")
+
+    def test_ambiguous_names_do_not_resolve(self):
+        cases = [
+            ({"x": "Alpha", "y": "ALPHA"}, "alpha"),                     # same key
+            ({"x": "Alpha One", "y": "Beta One"}, "Alpha Beta One"),     # equal token scores
+            ({"x": "Zorblax", "y": "Zorblay"}, "Zorbla"),                # equal spelling distance
+        ]
+        for names, name in cases:
+            with self.subTest(name=name):
+                self.assertEqual(NameIndex(names).resolve(name), (None, ["x", "y"]))
+                _, issues = NameIndex(names).join([name])
+                self.assertEqual(issues, [{"kind": "ambiguous", "name": name, "candidates": ["x", "y"]}])
+                self.assertIn("equally well", describe_issue(issues[0]))
+
+    def test_fuzzy_match(self):
+        match, _ = self.index.resolve("Learn by Interakt")
+        self.assertEqual((match.model_id, match.method), ("learn_by_interact", FUZZY))
+
+    def test_duplicates_keep_the_best_match(self):
+        names = ["ScribeAgent + GPT-4o", "ScribeAgent", None, "ScribeAgent"]
+        joined, issues = self.index.join(names)
+        row, match = joined["scribeagent"]
+        self.assertEqual((row, match.method), (1, EXACT))
+        self.assertEqual(issues, [{
+            "kind": "duplicate",
+            "model_id": "scribeagent",
+            "names": ["ScribeAgent + GPT-4o", "ScribeAgent", "ScribeAgent"],
+            "kept": "ScribeAgent",
+        }])
+        self.assertEqual(describe_issue(issues[0]), "scribeagent: kept 'ScribeAgent' over 'ScribeAgent + GPT-4o'")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+normalize_data.py --update against a full run, on a tiny synthetic tree
+
+--update patches the existing artifacts for the models it is given. After
+any change to those models' trajectories, the patched output directory
+must be byte-identical to what a full run writes for the same tree:
+
+    python -m unittest scripts/test_normalize_update.py
+"""
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import normalize_data
+import synth_trajectories
+
+# Small enough to run in seconds, large enough for every site to have tasks
+TASKS = 60
+RESAMPLES = "200"
+
+def output_files(output_dir):
+    """Relative path -> bytes of every file under output_dir"""
+    return {str(path.relative_to(output_dir)): path.read_bytes()
+            for path in sorted(output_dir.rglob("*")) if path.is_file()}
+
+class UpdateMatchesFullRunTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        synth_trajectories.generate(self.root, tasks=TASKS, agents=10, payload_kb=0.5, large_fraction=0,
+                                    corrupt_fraction=0, seed=3)
+        cwd = os.getcwd()
+        os.chdir(self.root)
+        self.addCleanup(os.chdir, cwd)
+        self.trajectories = self.root / normalize_data.TRAJECTORIES_DIR
+        self.output_dir = self.root / normalize_data.OUTPUT_DIR
+
+    def normalize(self, *argv):
+        """Run normalize_data.py in the synthetic root; returns its output"""
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            normalize_data.main(["--workers", "1", "--resamples", RESAMPLES, *argv])
+        return output.getvalue()
+
+    def model_dir(self, model_id):
+        dir_name = next(name for name, known_id in normalize_data.MODEL_DIRS.items() if known_id == model_id)
+        return self.trajectories / dir_name
+
+    def assert_update_matches_full_run(self, model_id, *options):
+        self.normalize("--update", model_id)
+        updated = output_files(self.output_dir)
+        self.normalize("--full", *options)
+        full = output_files(self.output_dir)
+        self.assertEqual(sorted(updated), sorted(full))
+        for name in full:
+            # assertTrue: a byte diff of a whole artifact is no help
+            self.assertTrue(updated[name] == full[name], f"{name} differs after --update {model_id}")
+
+    def test_changed_model(self):
+        self.normalize()
+        files = sorted(self.model_dir("deepsky").glob("*.json"))
+        for path in files[:8]:
+            record = json.loads(path.read_text())
+            record["success"] = not record["success"]
+            path.write_text(json.dumps(record))
+        files[-1].unlink()
+        self.assert_update_matches_full_run("deepsky")
+
+    def test_added_model(self):
+        step_dir = self.model_dir("step")
+        aside = self.root / "step_aside"
+        shutil.move(step_dir, aside)
+        self.normalize()
+        shutil.move(aside, step_dir)
+        self.assert_update_matches_full_run("step")
+
+    def test_removed_model(self):
+        self.normalize()
+        shutil.rmtree(self.model_dir("narada"))
+        self.assert_update_matches_full_run("narada")
+
+    def test_update_keeps_compact_shards_and_precompressed_copies(self):
+        self.normalize("--compact", "--shards", "--precompress")
+        shutil.rmtree(self.model_dir("narada"))
+        self.assert_update_matches_full_run("narada", "--compact", "--shards", "--precompress")
+
+    def test_unknown_model_id(self):
+        self.normalize()
+        with self.assertRaises(SystemExit) as raised:
+            self.normalize("--update", "no_such_model")
+        self.assertIn("Unknown model id(s): no_such_model", str(raised.exception))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+stream_export.py against json.dump
+
+write_json() must produce the exact bytes of json.dump(obj, f, indent=2)
+on the same object with every StreamedList materialized:
+
+    python -m unittest scripts/test_stream_export.py
+"""
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import stream_export
+from stream_export import StreamedList, write_json, write_ndjson
+
+def record(i):
+    """A results-like record with nested values and escaped text"""
+    return {"t": i, "m": f"model_{i % 3}", "s": i % 2, "tags": ["a\nb", {"x": [i, None]}], "r": i / 7}
+
+def materialized(value):
+    """The plain object write_json should match"""
+    if isinstance(value, StreamedList):
+        return [materialized(item) for item in value]
+    if isinstance(value, dict):
+        return {key: materialized(item) for key, item in value.items()}
+    return value
+
+def documents(chunk_items):
+    """Objects to write, each built fresh since StreamedLists of generators are single-use"""
+    lengths = [0, 1, chunk_items - 1, chunk_items, chunk_items + 1, 2 * chunk_items + 5]
+    for n in lengths:
+        yield f"top-level stream of {n}", lambda n=n: StreamedList(record(i) for i in range(n))
+        yield f"nested streams of {n}", lambda n=n: {
+            "version": 1,
+            "model_ids": ["a", "b"],
+            "matrix": StreamedList([i, None, 1] for i in range(n)),
+            "stats": {"empty": StreamedList(iter(())), "rows": StreamedList(record(i) for i in range(n)), "n": n},
+            "plain": {"nested": [{"deep": "value"}], "empty": {}},
+        }
+    yield "streams of scalars", lambda: {"ids": StreamedList(range(chunk_items + 2)), "names": StreamedList(["é", "\"q\""])}
+    yield "no streams", lambda: {"a": [1, 2, {"b": []}], "c": "d"}
+
+class WriteJsonTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        original = stream_export.CHUNK_ITEMS
+        self.addCleanup(setattr, stream_export, "CHUNK_ITEMS", original)
+
+    def check_chunk_items(self, chunk_items):
+        stream_export.CHUNK_ITEMS = chunk_items
+        for name, build in documents(chunk_items):
+            with self.subTest(chunk_items=chunk_items, document=name):
+                streamed_path, expected_path = self.dir / "streamed.json", self.dir / "expected.json"
+                expected = materialized(build())
+                count = write_json(streamed_path, build())
+                with open(expected_path, 'w') as f:
+                    json.dump(expected, f, indent=2)
+                self.assertEqual(streamed_path.read_bytes(), expected_path.read_bytes())
+                self.assertEqual(count, len(expected) if isinstance(expected, list) else None)
+
+    def test_matches_json_dump(self):
+        self.check_chunk_items(stream_export.CHUNK_ITEMS)
+
+    def test_matches_json_dump_with_small_chunks(self):
+        for chunk_items in (1, 2, 3):
+            self.check_chunk_items(chunk_items)
+
+    def test_ndjson_round_trip(self):
+        path = self.dir / "results.ndjson"
+        records = [record(i) for i in range(5)]
+        self.assertEqual(write_ndjson(path, iter(records), header={"version": 1}), 5)
+        lines = path.read_text().splitlines()
+        self.assertEqual([json.loads(line) for line in lines], [{"version": 1}, *records])
+        self.assertEqual(lines[1], json.dumps(records[0], separators=(",", ":")))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,512 @@
+"""
+Append-only trajectory store with a random-access index (data/trajectory_store/)
+
+TaskViewer only gets a success bit per model from the artifacts; the raw
+trajectories are far too big to ship. This module packs them so that one
+task's steps can be read, or fetched with a single HTTP range request,
+without loading anything else:
+
+    <model>.index.json    task id -> [offset, [compressed size of each step]]
+    <model>.<gen>.blob    the step records, back to back
+    <model>.files.json    source file signatures, only used for packing
+
+Every step (an element of the record's step list, see
+extractors.record_steps) is JSON-encoded and zlib-compressed on its own,
+so a reader slices the task's byte range and inflates only the steps it
+needs. Strings longer than MAX_STRING_CHARS (base64 screenshots,
+accessibility trees) are replaced by a short marker before compression.
+Readers mmap the blob: a lookup is one dict access and one slice.
+
+Packing is incremental and append-only. Files whose size and mtime match
+the index keep their records; new or changed files are parsed (optionally
+in parallel) and appended, and the index is repointed, leaving the old
+records as dead bytes. The blob is truncated back to the indexed size
+before appending and the index is replaced atomically after the blob is
+synced, so an interrupted pack leaves the previous store intact. Once dead
+bytes exceed COMPACT_RATIO of the blob, the live records are copied into
+a new generation of the blob and the old one is removed after the index
+points to the new one. As in results.json, a task in several files keeps
+its last one.
+
+Usage:
+    python scripts/trajectory_store.py pack --workers 4
+    python scripts/trajectory_store.py show deepsky 27
+    python scripts/trajectory_store.py serve --port 8765
+    python scripts/normalize_data.py --trajectory-store   # pack after extraction
+
+The server answers GET /models, GET /steps/<model>/<task_id>?start=&stop=
+and serves the index and blob files themselves with Range support. It
+sends CORS headers and answers preflight (OPTIONS) requests, so a site on
+another origin can read it. Any static host with range requests can
+serve the store directory as well (see web/lib/trajectory-store.ts).
+"""
+
+import argparse
+import json
+import mmap
+import os
+import re
+import threading
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from extractors import extract_file_steps
+
+STORE_DIR = Path("data/trajectory_store")
+STORE_VERSION = 1
+CODEC = "zlib"
+ZLIB_LEVEL = 6
+MAX_STRING_CHARS = 65536
+COMPACT_RATIO = 0.5
+SERVE_PORT = 8765
+
+_RANGE = re.compile(r'bytes=(\d*)-(\d*)$')
+
+def is_store_name(name):
+    """Whether a model id or file name from a request stays inside the store"""
+    return bool(name) and '/' not in name and '\\' not in name and '..' not in name \
+        and not name.startswith('.')
+
+def index_path(store_dir, model_id):
+    return store_dir / f"{model_id}.index.json"
+
+def files_path(store_dir, model_id):
+    return store_dir / f"{model_id}.files.json"
+
+def blob_name(model_id, generation):
+    return f"{model_id}.{generation}.blob"
+
+def file_stat(path):
+    """Cheap change signature of a trajectory file: [size, mtime_ns]"""
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+def strip_large_strings(value, max_chars):
+    """Copy of a JSON value with strings longer than max_chars replaced by a marker"""
+    if isinstance(value, str):
+        return value if len(value) <= max_chars else f"<omitted {len(value)} chars>"
+    if isinstance(value, list):
+        return [strip_large_strings(item, max_chars) for item in value]
+    if isinstance(value, dict):
+        return {key: strip_large_strings(item, max_chars) for key, item in value.items()}
+    return value
+
+def encode_step(step, max_chars=MAX_STRING_CHARS):
+    if max_chars:
+        step = strip_large_strings(step, max_chars)
+    return zlib.compress(json.dumps(step, separators=(',', ':')).encode(), ZLIB_LEVEL)
+
+def decode_step(data):
+    return json.loads(zlib.decompress(data))
+
+def pack_file(job):
+    """Parse and compress one trajectory file (top-level so it can be pickled).
+
+    Returns a file record: its stat, format, parse failures and the first
+    error, plus [(task key, [compressed step])].
+    """
+    path, hint, max_chars = job
+    stat = file_stat(path)
+    format_name, tasks, failures, error = extract_file_steps(path, hint)
+    return {
+        "stat": stat,
+        "format": format_name,
+        "failures": failures,
+        "error": error,
+        "tasks": [(str(task_id), [encode_step(step, max_chars) for step in steps]) for task_id, steps in tasks],
+    }
+
+def map_pack_jobs(jobs, workers=1):
+    """pack_file over jobs, in order, optionally over a process pool"""
+    if workers <= 1 or len(jobs) <= 1:
+        return [pack_file(job) for job in jobs]
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(pack_file, jobs, chunksize=chunksize))
+
+def load_index(store_dir, model_id):
+    """A model's index, or None if it is missing or unreadable"""
+    try:
+        with open(index_path(store_dir, model_id), 'r') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return index if index.get('version') == STORE_VERSION else None
+
+def load_files(store_dir, index):
+    """The source files recorded with index, or None if they belong to another pack"""
+    try:
+        with open(files_path(store_dir, index['model']), 'r') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (manifest.get('generation'), manifest.get('size')) != (index['generation'], index['size']):
+        return None
+    return manifest['files']
+
+def write_json_atomic(path, document):
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(document, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+def task_owners(keys, task_keys):
+    """{task key: position of the file that provides it}; later files win"""
+    owners = {}
+    for i, key in enumerate(keys):
+        for task_key in task_keys(i, key):
+            owners[task_key] = i
+    return owners
+
+def live_bytes(tasks):
+    return sum(sum(sizes) for _, sizes in tasks.values())
+
+def blob_intact(store_dir, index):
+    """Whether the index's blob still holds at least the indexed bytes"""
+    try:
+        return (store_dir / index['blob']).stat().st_size >= index['size']
+    except FileNotFoundError:
+        return False
+
+def remove_stale_blobs(store_dir, model_id, keep=None):
+    for path in store_dir.glob(f"{model_id}.*.blob"):
+        if path.name != keep:
+            path.unlink()
+
+def compact(store_dir, index):
+    """Copy the live records of index into the next blob generation,
+    rewriting its offsets, blob and size in place"""
+    generation = index['generation'] + 1
+    new_blob = blob_name(index['model'], generation)
+    offset = 0
+    with open(store_dir / index['blob'], 'rb') as src, open(store_dir / new_blob, 'wb') as dst:
+        for record in index['tasks'].values():
+            length = sum(record[1])
+            src.seek(record[0])
+            dst.write(src.read(length))
+            record[0] = offset
+            offset += length
+        dst.flush()
+        os.fsync(dst.fileno())
+    index.update(generation=generation, blob=new_blob, size=offset)
+
+def pack_model(store_dir, model_id, jobs, workers=1, max_chars=MAX_STRING_CHARS):
+    """Bring one model's blob and index up to date with its trajectory files.
+
+    jobs are the (path, declared format) extraction jobs of the model.
+    Returns (index, files parsed, files reused).
+    """
+    store_dir.mkdir(parents=True, exist_ok=True)
+    previous = load_index(store_dir, model_id)
+    old_files = previous and load_files(store_dir, previous)
+    if previous is None:
+        generation, old_files, old_tasks, size = 0, {}, {}, 0
+    elif old_files is None or (previous['codec'], previous['max_string_chars']) != (CODEC, max_chars) \
+            or not blob_intact(store_dir, previous):
+        # Records encoded differently, or the store is damaged: start a new generation
+        generation, old_files, old_tasks, size = previous['generation'] + 1, {}, {}, 0
+    else:
+        generation, size, old_tasks = previous['generation'], previous['size'], previous['tasks']
+
+    keys = [str(path) for path, _ in jobs]
+    stats = [file_stat(path) for path, _ in jobs]
+    pending = [i for i, key in enumerate(keys) if old_files.get(key, {}).get('stat') != stats[i]]
+    parsed = dict(zip(pending, map_pack_jobs([(*jobs[i], max_chars) for i in pending], workers)))
+
+    def task_keys(i, key):
+        if i in parsed:
+            return [task_key for task_key, _ in parsed[i]['tasks']]
+        return old_files[key]['tasks']
+
+    # Only the record of each task's last file is stored. An unchanged file
+    # that now provides a task whose record was shadowed (or came from a
+    # changed file) is parsed again.
+    old_owners = task_owners(list(old_files), lambda i, key: old_files[key]['tasks'])
+    old_keys = list(old_files)
+    owners = task_owners(keys, task_keys)
+    shadowed = sorted({i for task_key, i in owners.items()
+                       if i not in parsed and old_keys[old_owners[task_key]] != keys[i]})
+    parsed.update(zip(shadowed, map_pack_jobs([(*jobs[i], max_chars) for i in shadowed], workers)))
+
+    # Append the new records past the indexed size (dropping any partial append)
+    new_records = {}
+    blob_path = store_dir / blob_name(model_id, generation)
+    with open(blob_path, 'r+b' if blob_path.exists() else 'w+b') as blob:
+        blob.truncate(size)
+        blob.seek(size)
+        for i in sorted(parsed):
+            for task_key, steps in parsed[i]['tasks']:
+                if owners[task_key] != i:
+                    continue
+                new_records[task_key] = [size, [len(step) for step in steps]]
+                blob.write(b''.join(steps))
+                size += sum(len(step) for step in steps)
+        blob.flush()
+        os.fsync(blob.fileno())
+
+    files = {}
+    for i, key in enumerate(keys):
+        if i in parsed:
+            record = parsed[i]
+            files[key] = {
+                "stat": record['stat'],
+                "format": record['format'],
+                "failures": record['failures'],
+                "error": record['error'],
+                "tasks": task_keys(i, key),
+            }
+        else:
+            files[key] = old_files[key]
+    index = {
+        "version": STORE_VERSION,
+        "model": model_id,
+        "codec": CODEC,
+        "max_string_chars": max_chars,
+        "generation": generation,
+        "blob": blob_name(model_id, generation),
+        "size": size,
+        "tasks": {task_key: new_records.get(task_key) or old_tasks[task_key] for task_key in owners},
+    }
+    if size - live_bytes(index['tasks']) > COMPACT_RATIO * size:
+        compact(store_dir, index)
+    # The index goes last: a files.json that does not match it is ignored
+    write_json_atomic(files_path(store_dir, model_id),
+                      {"generation": index['generation'], "size": index['size'], "files": files})
+    write_json_atomic(index_path(store_dir, model_id), index)
+    remove_stale_blobs(store_dir, model_id, keep=index['blob'])
+    return index, len(parsed), len(jobs) - len(parsed)
+
+def remove_model(store_dir, model_id):
+    """Delete a model's index and blobs (e.g. when its trajectories are gone)"""
+    index_path(store_dir, model_id).unlink(missing_ok=True)
+    files_path(store_dir, model_id).unlink(missing_ok=True)
+    remove_stale_blobs(store_dir, model_id)
+
+def pack_models(store_dir, model_jobs, workers=1, max_chars=MAX_STRING_CHARS):
+    """pack_model() for every (model_id, dir_path, jobs) of normalize_data.py.
+
+    Models without trajectory files are removed from the store. Returns
+    {model_id: (tasks, files parsed, files reused)} for the packed models.
+    """
+    packed = {}
+    for model_id, _, jobs in model_jobs:
+        if not jobs:
+            remove_model(store_dir, model_id)
+            continue
+        index, parsed, reused = pack_model(store_dir, model_id, jobs, workers, max_chars)
+        packed[model_id] = (len(index['tasks']), parsed, reused)
+    return packed
+
+class TrajectoryStore:
+    """Read side of the store: memory-maps each model's blob on first use.
+
+    Indexes are re-read when their file changes, so a long-running reader
+    (serve) picks up re-packed models.
+    """
+
+    def __init__(self, store_dir=STORE_DIR):
+        self.store_dir = Path(store_dir)
+        self._open = {}  # model id -> (index mtime_ns, index, mmap or None)
+        self._lock = threading.Lock()
+
+    def models(self):
+        return sorted(path.name[:-len('.index.json')] for path in self.store_dir.glob('*.index.json'))
+
+    def _model(self, model_id):
+        if not is_store_name(model_id):
+            raise KeyError(model_id)
+        path = index_path(self.store_dir, model_id)
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            raise KeyError(model_id) from None
+        with self._lock:
+            cached = self._open.get(model_id)
+            if cached is not None and cached[0] == mtime:
+                return cached[1], cached[2]
+            index = load_index(self.store_dir, model_id)
+            if index is None:
+                raise KeyError(model_id)
+            view = None
+            if index['size']:
+                with open(self.store_dir / index['blob'], 'rb') as f:
+                    view = mmap.mmap(f.fileno(), index['size'], access=mmap.ACCESS_READ)
+            self._open[model_id] = (mtime, index, view)
+            return index, view
+
+    def index(self, model_id):
+        return self._model(model_id)[0]
+
+    def task_ids(self, model_id):
+        return list(self.index(model_id)['tasks'])
+
+    def step_count(self, model_id, task_id):
+        return len(self.index(model_id)['tasks'][str(task_id)][1])
+
+    def steps(self, model_id, task_id, start=0, stop=None):
+        """Decoded steps [start:stop] of one task; KeyError if it is not stored"""
+        index, view = self._model(model_id)
+        offset, sizes = index['tasks'][str(task_id)]
+        start, stop, _ = slice(start, stop).indices(len(sizes))
+        offset += sum(sizes[:start])
+        steps = []
+        for size in sizes[start:stop]:
+            steps.append(decode_step(view[offset:offset + size]))
+            offset += size
+        return steps
+
+    def close(self):
+        with self._lock:
+            for _, _, view in self._open.values():
+                if view is not None:
+                    view.close()
+            self._open.clear()
+
+def make_handler(store):
+    """Request handler class serving one TrajectoryStore"""
+
+    class StoreHandler(BaseHTTPRequestHandler):
+        head_only = False  # HEAD: headers of the GET response, no body
+
+        def send_json(self, document, status=HTTPStatus.OK):
+            body = json.dumps(document, separators=(',', ':')).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.end_headers()
+            if not self.head_only:
+                self.wfile.write(body)
+
+        def send_file(self, path):
+            """A store file, or the byte range named by a Range header"""
+            length = path.stat().st_size
+            start, end = 0, length - 1
+            status = HTTPStatus.OK
+            match = _RANGE.match(self.headers.get("Range", ""))
+            if match and match.group(1) + match.group(2):
+                if match.group(1):
+                    start = int(match.group(1))
+                    end = min(int(match.group(2)), length - 1) if match.group(2) else length - 1
+                else:
+                    start = max(0, length - int(match.group(2)))
+                if start > end:
+                    self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                    self.send_header("Content-Range", f"bytes */{length}")
+                    self.end_headers()
+                    return
+                status = HTTPStatus.PARTIAL_CONTENT
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json" if path.suffix == '.json' else "application/octet-stream")
+            self.send_header("Content-Length", str(end - start + 1))
+            self.send_header("Accept-Ranges", "bytes")
+            self.send_header("Access-Control-Allow-Origin", "*")
+            if status == HTTPStatus.PARTIAL_CONTENT:
+                self.send_header("Content-Range", f"bytes {start}-{end}/{length}")
+            self.end_headers()
+            if self.head_only:
+                return
+            with open(path, 'rb') as f:
+                f.seek(start)
+                self.wfile.write(f.read(end - start + 1))
+
+        def do_OPTIONS(self):
+            """CORS preflight: cross-origin range requests send one for the Range header"""
+            self.send_response(HTTPStatus.NO_CONTENT)
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.send_header("Access-Control-Allow-Methods", "GET, HEAD")
+            self.send_header("Access-Control-Allow-Headers", "Range")
+            self.send_header("Access-Control-Max-Age", "86400")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def do_HEAD(self):
+            self.head_only = True
+            self.do_GET()
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            parts = [unquote(part) for part in url.path.split('/') if part]
+            query = parse_qs(url.query)
+            try:
+                if parts == ["models"]:
+                    self.send_json({"models": store.models()})
+                elif len(parts) == 3 and parts[0] == "steps" and is_store_name(parts[1]):
+                    start = int(query.get("start", ["0"])[0])
+                    stop = int(query["stop"][0]) if "stop" in query else None
+                    self.send_json({
+                        "model": parts[1],
+                        "task_id": parts[2],
+                        "step_count": store.step_count(parts[1], parts[2]),
+                        "start": start,
+                        "steps": store.steps(parts[1], parts[2], start, stop),
+                    })
+                elif len(parts) == 1 and parts[0].endswith(('.index.json', '.blob')) \
+                        and is_store_name(parts[0]) and (store.store_dir / parts[0]).is_file():
+                    self.send_file(store.store_dir / parts[0])
+                else:
+                    self.send_json({"error": "not found"}, HTTPStatus.NOT_FOUND)
+            except KeyError:
+                self.send_json({"error": "not found"}, HTTPStatus.NOT_FOUND)
+            except ValueError as e:
+                self.send_json({"error": str(e)}, HTTPStatus.BAD_REQUEST)
+
+    return StoreHandler
+
+def serve(store_dir=STORE_DIR, host="127.0.0.1", port=SERVE_PORT):
+    store = TrajectoryStore(store_dir)
+    server = ThreadingHTTPServer((host, port), make_handler(store))
+    print(f"Serving {store_dir} on http://{host}:{server.server_port} ({len(store.models())} models)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        store.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pack, inspect and serve the trajectory store")
+    parser.add_argument("--store-dir", type=Path, default=STORE_DIR, help=f"Store directory (default: {STORE_DIR})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    pack = commands.add_parser("pack", help="Pack (or incrementally update) every model's trajectories")
+    pack.add_argument("--workers", type=int, default=1, help="Parsing processes (0 = one per CPU)")
+    pack.add_argument("--max-string", type=int, default=MAX_STRING_CHARS,
+                      help=f"Replace longer strings by a marker (default: {MAX_STRING_CHARS}, 0 = keep all)")
+    pack.add_argument("--model", action="append", metavar="MODEL_ID", help="Only pack this model (repeatable)")
+    show = commands.add_parser("show", help="Print the steps of one task")
+    show.add_argument("model")
+    show.add_argument("task_id")
+    serve_parser = commands.add_parser("serve", help="Serve steps and range requests over HTTP")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=SERVE_PORT)
+    args = parser.parse_args(argv)
+
+    if args.command == "pack":
+        # Model directories and formats are defined by the normalization script
+        from normalize_data import MODEL_DIRS, TRAJECTORIES_DIR, collect_model_jobs
+        model_dirs = {name: model_id for name, model_id in MODEL_DIRS.items()
+                      if not args.model or model_id in args.model}
+        packed = pack_models(args.store_dir, collect_model_jobs(TRAJECTORIES_DIR, model_dirs),
+                             args.workers or os.cpu_count() or 1, args.max_string)
+        for model_id, (tasks, parsed, reused) in packed.items():
+            index = load_index(args.store_dir, model_id)
+            print(f"✓ {model_id:20} {tasks:5} tasks, {index['size'] / 1024:9.1f} KB "
+                  f"({parsed} files parsed, {reused} reused)")
+    elif args.command == "show":
+        store = TrajectoryStore(args.store_dir)
+        try:
+            steps = store.steps(args.model, args.task_id)
+        except KeyError:
+            raise SystemExit(f"No trajectory for {args.model} task {args.task_id} in {args.store_dir}")
+        print(json.dumps(steps, indent=2))
+        store.close()
+    else:
+        serve(args.store_dir, args.host, args.port)
+
+if __name__ == "__main__":
+    main()
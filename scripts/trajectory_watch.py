@@ -0,0 +1,185 @@
+"""
+File change watchers over the trajectory tree, for `normalize_data.py --watch`
+
+Both watchers expose wait(timeout) -> set of touched paths (empty on
+timeout), so the caller can debounce bursts of events the same way:
+
+- InotifyWatcher: Linux inotify through libc (no extra package). Watches
+  the root and every directory below it, adding new directories as they
+  appear. Files count as touched once they are closed after writing,
+  moved in or out, or deleted, so half-written files are not picked up.
+- PollingWatcher: re-stats the tree every POLL_SECONDS and reports files
+  whose size or mtime changed, or which appeared or disappeared. Used on
+  other platforms, with --poll, or when inotify is unavailable.
+
+A kernel queue overflow reports the root itself, i.e. everything changed.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+
+POLL_SECONDS = 2.0
+READ_BYTES = 64 * 1024
+
+# inotify(7) event bits
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+FILE_EVENTS = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE
+
+_EVENT = struct.Struct('iIII')  # wd, mask, cookie, name length
+
+def is_hidden(path):
+    return path.name.startswith('.')
+
+class InotifyWatcher:
+    """Recursive inotify watch over a directory tree (Linux only)"""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        self._init = libc.inotify_init1
+        self._add = libc.inotify_add_watch
+        self.fd = self._init(IN_CLOEXEC)
+        if self.fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, f"inotify_init1: {os.strerror(error)}")
+        self.dirs = {}  # watch descriptor -> directory
+        self.add_tree(self.root)
+
+    def add_watch(self, path):
+        wd = self._add(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            if error in (errno.ENOENT, errno.ENOTDIR):
+                return False  # Gone again before we got to it
+            raise OSError(error, f"inotify_add_watch {path}: {os.strerror(error)}")
+        self.dirs[wd] = path
+        return True
+
+    def add_tree(self, path):
+        """Watch path and its subdirectories; returns the files already in them"""
+        files = []
+        for dir_path, dir_names, file_names in os.walk(path):
+            dir_names[:] = [name for name in dir_names if not name.startswith('.')]
+            if self.add_watch(Path(dir_path)):
+                files.extend(Path(dir_path) / name for name in file_names if not name.startswith('.'))
+        return files
+
+    def read_events(self):
+        touched = set()
+        data = os.read(self.fd, READ_BYTES)
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            name = data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b'\0')
+            offset += _EVENT.size + length
+            if mask & IN_Q_OVERFLOW:
+                touched.add(self.root)
+                continue
+            if mask & IN_IGNORED:
+                self.dirs.pop(wd, None)
+                continue
+            directory = self.dirs.get(wd)
+            if directory is None:
+                continue
+            path = directory / os.fsdecode(name) if name else directory
+            if is_hidden(path):
+                continue
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    # Files may land in the new directory before its watch exists
+                    touched.update(self.add_tree(path))
+                touched.add(path)
+            elif mask & (FILE_EVENTS | IN_DELETE_SELF):
+                touched.add(path)
+        return touched
+
+    def wait(self, timeout=None):
+        """Touched paths, blocking until there are some or timeout passes"""
+        touched = set()
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        while readable:
+            touched |= self.read_events()
+            readable, _, _ = select.select([self.fd], [], [], 0)
+        return touched
+
+    def close(self):
+        os.close(self.fd)
+
+class PollingWatcher:
+    """Stat-based fallback: compares snapshots of the tree"""
+
+    def __init__(self, root, interval=POLL_SECONDS):
+        self.root = Path(root)
+        self.interval = interval
+        self.snapshot = self.scan()
+
+    def scan(self):
+        snapshot = {}
+        for dir_path, dir_names, file_names in os.walk(self.root):
+            dir_names[:] = [name for name in dir_names if not name.startswith('.')]
+            for name in file_names:
+                if name.startswith('.'):
+                    continue
+                path = Path(dir_path) / name
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                snapshot[path] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = self.interval if deadline is None else min(self.interval, deadline - time.monotonic())
+            if remaining > 0:
+                time.sleep(remaining)
+            snapshot = self.scan()
+            touched = {path for path in snapshot.keys() | self.snapshot.keys()
+                       if snapshot.get(path) != self.snapshot.get(path)}
+            self.snapshot = snapshot
+            if touched or (deadline is not None and time.monotonic() >= deadline):
+                return touched
+
+    def close(self):
+        pass
+
+def open_watcher(root, poll=False):
+    """An InotifyWatcher where possible, else a PollingWatcher"""
+    if not poll and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError) as e:
+            print(f"   inotify unavailable ({e}); polling every {POLL_SECONDS:g}s")
+    return PollingWatcher(root)
+
+def wait_for_batch(watcher, quiet_seconds, max_seconds):
+    """Block until something changes, then collect events until none arrive
+    for quiet_seconds (or max_seconds have passed); returns the touched paths"""
+    touched = watcher.wait()
+    deadline = time.monotonic() + max_seconds
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return touched
+        more = watcher.wait(min(quiet_seconds, remaining))
+        if not more:
+            return touched
+        touched |= more
@@ -0,0 +1,191 @@
+import { Badge } from '@/components/ui/badge';
+import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card';
+import {
+  Table,
+  TableBody,
+  TableCell,
+  TableHead,
+  TableHeader,
+  TableRow,
+} from '@/components/ui/table';
+import { comparison, crossBenchmarkModels } from '@/lib/benchmark-store';
+import { BenchmarkStore } from '@/types/normalized';
+import { promises as fs } from 'fs';
+import path from 'path';
+
+async function getData() {
+  const dataDir = path.join(process.cwd(), 'public', 'data');
+  const store = await fs.readFile(path.join(dataDir, 'benchmarks.json'), 'utf8');
+  return JSON.parse(store) as BenchmarkStore;
+}
+
+function formatRate(rate: number | null | undefined) {
+  return rate === null || rate === undefined ? '—' : `${rate.toFixed(1)}%`;
+}
+
+export default async function ComparePage() {
+  const store = await getData();
+  const models = crossBenchmarkModels(store);
+  const modelNames = new Map(store.models.map((model) => [model.id, model.name]));
+  const pairs = store.benchmarks.flatMap((a, i) =>
+    store.benchmarks.slice(i + 1).map((b) => ({ a, b, shared: comparison(store, a.id, b.id) }))
+  );
+
+  return (
+    <main className="min-h-screen bg-background">
+      <div className="container mx-auto px-4 py-12 max-w-7xl">
+        {/* Header */}
+        <div className="mb-10">
+          <h1 className="text-4xl font-bold tracking-tight mb-3">
+            Cross-Benchmark Comparison
+          </h1>
+          <p className="text-muted-foreground text-base max-w-3xl">
+            The {store.benchmarks.length} leaderboards side by side, with model names matched across them.
+            {' '}{models.length} of {store.models.length} models are listed on more than one benchmark.
+          </p>
+        </div>
+
+        <div className="space-y-8">
+          {/* Benchmarks */}
+          <Card>
+            <CardHeader>
+              <CardTitle>Benchmarks</CardTitle>
+              <CardDescription>Best overall and best open model on each leaderboard, and the human baseline where one is published.</CardDescription>
+            </CardHeader>
+            <CardContent>
+              <div className="relative w-full overflow-auto">
+                <Table>
+                  <TableHeader>
+                    <TableRow className="hover:bg-transparent">
+                      <TableHead>Benchmark</TableHead>
+                      <TableHead className="text-right">Tasks</TableHead>
+                      <TableHead className="text-right">Models</TableHead>
+                      <TableHead>Best</TableHead>
+                      <TableHead>Best Open</TableHead>
+                      <TableHead className="text-right">Median</TableHead>
+                      <TableHead className="text-right">Human</TableHead>
+                      <TableHead className="text-right">Gap to Human</TableHead>
+                    </TableRow>
+                  </TableHeader>
+                  <TableBody>
+                    {store.benchmarks.map((benchmark) => {
+                      const { aggregates } = benchmark;
+                      return (
+                        <TableRow key={benchmark.id}>
+                          <TableCell className="font-medium">{benchmark.name}</TableCell>
+                          <TableCell className="text-right tabular-nums">{benchmark.total_tasks ?? '—'}</TableCell>
+                          <TableCell className="text-right tabular-nums">{aggregates.models}</TableCell>
+                          <TableCell>
+                            {aggregates.best
+                              ? `${modelNames.get(aggregates.best.model) ?? aggregates.best.model} (${formatRate(aggregates.best.success_rate)})`
+                              : '—'}
+                          </TableCell>
+                          <TableCell>
+                            {aggregates.best_open
+                              ? `${modelNames.get(aggregates.best_open.model) ?? aggregates.best_open.model} (${formatRate(aggregates.best_open.success_rate)})`
+                              : '—'}
+                          </TableCell>
+                          <TableCell className="text-right tabular-nums">{formatRate(aggregates.median)}</TableCell>
+                          <TableCell className="text-right tabular-nums">{formatRate(aggregates.human)}</TableCell>
+                          <TableCell className="text-right tabular-nums">
+                            {aggregates.gap_to_human === null ? '—' : `${aggregates.gap_to_human.toFixed(1)} pts`}
+                          </TableCell>
+                        </TableRow>
+                      );
+                    })}
+                  </TableBody>
+                </Table>
+              </div>
+            </CardContent>
+          </Card>
+
+          {/* Models on several leaderboards */}
+          <Card>
+            <CardHeader>
+              <CardTitle>Models on Several Benchmarks</CardTitle>
+              <CardDescription>Best listed success rate of each model, most widely evaluated first.</CardDescription>
+            </CardHeader>
+            <CardContent>
+              <div className="relative w-full overflow-auto">
+                <Table>
+                  <TableHeader>
+                    <TableRow className="hover:bg-transparent">
+                      <TableHead>Model</TableHead>
+                      {store.benchmarks.map((benchmark) => (
+                        <TableHead key={benchmark.id} className="text-right">{benchmark.name}</TableHead>
+                      ))}
+                    </TableRow>
+                  </TableHeader>
+                  <TableBody>
+                    {models.map((model) => (
+                      <TableRow key={model.id}>
+                        <TableCell>
+                          <div className="flex items-center gap-2">
+                            <span className="font-medium">{model.name}</span>
+                            {model.is_human && <Badge variant="secondary">Human</Badge>}
+                            {model.open && <Badge variant="outline">Open</Badge>}
+                          </div>
+                          {model.organization && (
+                            <div className="text-xs text-muted-foreground">{model.organization}</div>
+                          )}
+                        </TableCell>
+                        {store.benchmarks.map((benchmark) => (
+                          <TableCell key={benchmark.id} className="text-right tabular-nums">
+                            {formatRate(store.scores[model.id]?.[benchmark.id])}
+                          </TableCell>
+                        ))}
+                      </TableRow>
+                    ))}
+                  </TableBody>
+                </Table>
+              </div>
+            </CardContent>
+          </Card>
+
+          {/* Rank agreement */}
+          <Card>
+            <CardHeader>
+              <CardTitle>Rank Agreement</CardTitle>
+              <CardDescription>
+                Spearman correlation of the ranks of the models two leaderboards share. It needs at least three shared models.
+              </CardDescription>
+            </CardHeader>
+            <CardContent>
+              <div className="relative w-full overflow-auto">
+                <Table>
+                  <TableHeader>
+                    <TableRow className="hover:bg-transparent">
+                      <TableHead>Benchmarks</TableHead>
+                      <TableHead className="text-right">Shared Models</TableHead>
+                      <TableHead className="text-right">Spearman</TableHead>
+                    </TableRow>
+                  </TableHeader>
+                  <TableBody>
+                    {pairs.map(({ a, b, shared }) => (
+                      <TableRow key={`${a.id}-${b.id}`}>
+                        <TableCell className="font-medium">{a.name} / {b.name}</TableCell>
+                        <TableCell className="text-right tabular-nums">{shared?.models.length ?? 0}</TableCell>
+                        <TableCell className="text-right tabular-nums">
+                          {shared?.spearman === null || shared?.spearman === undefined
+                            ? '—'
+                            : shared.spearman.toFixed(2)}
+                        </TableCell>
+                      </TableRow>
+                    ))}
+                  </TableBody>
+                </Table>
+              </div>
+            </CardContent>
+          </Card>
+        </div>
+
+        {/* Footer */}
+        <div className="mt-12 text-center text-sm text-muted-foreground">
+          <p>
+            From benchmarks.json, rebuilt by scripts/benchmark_store.py on every normalization run.
+          </p>
+        </div>
+      </div>
+    </main>
+  );
+}
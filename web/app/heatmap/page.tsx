@@ -44,6 +44,9 @@ export default async function HeatmapPage() {
 
         {/* Visualizations */}
         <div className="space-y-8">
+          {/* Task x model matrix, fetched client-side from the compact export */}
+          <TaskHeatmap models={models} taskDifficulty={taskDifficulty} />
+
           {/* Radar Chart */}
           <RadarChart entries={leaderboard} />
 
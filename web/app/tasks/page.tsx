@@ -1,28 +1,38 @@
 import TaskBrowser from '@/components/TaskBrowser';
-import { Task, Result, Model, TaskDifficulty } from '@/types/normalized';
+import { Task, Result, Model, TaskDifficulty, ShardIndex } from '@/types/normalized';
 import { promises as fs } from 'fs';
 import path from 'path';
 
 async function getData() {
   const dataDir = path.join(process.cwd(), 'public', 'data');
+  const models = await fs.readFile(path.join(dataDir, 'models.json'), 'utf8').then(JSON.parse) as Model[];
 
-  const [tasks, results, models, taskDifficulty] = await Promise.all([
+  // With `normalize_data.py --shards` output only the shard index is sent;
+  // the browser fetches the task pages it shows
+  const shardIndex = await fs.readFile(path.join(dataDir, 'shards', 'index.json'), 'utf8')
+    .then(JSON.parse)
+    .catch(() => undefined) as ShardIndex | undefined;
+  if (shardIndex) {
+    return { models, shardIndex, taskCount: shardIndex.task_count };
+  }
+
+  const [tasks, results, taskDifficulty] = await Promise.all([
     fs.readFile(path.join(dataDir, 'tasks.json'), 'utf8').then(JSON.parse),
     fs.readFile(path.join(dataDir, 'results.json'), 'utf8').then(JSON.parse),
-    fs.readFile(path.join(dataDir, 'models.json'), 'utf8').then(JSON.parse),
     fs.readFile(path.join(dataDir, 'task_difficulty.json'), 'utf8').then(JSON.parse),
   ]);
 
   return {
     tasks: tasks as Task[],
     results: results as Result[],
-    models: models as Model[],
+    models,
     taskDifficulty: taskDifficulty as TaskDifficulty[],
+    taskCount: (tasks as Task[]).length,
   };
 }
 
 export default async function TasksPage() {
-  const { tasks, results, models, taskDifficulty } = await getData();
+  const { taskCount, ...data } = await getData();
 
   return (
     <main className="min-h-screen bg-background">
@@ -33,18 +43,13 @@ export default async function TasksPage() {
             Task Browser
           </h1>
           <p className="text-muted-foreground text-base max-w-3xl">
-            Browse and filter through all {tasks.length} WebArena benchmark tasks.
+            Browse and filter through all {taskCount} WebArena benchmark tasks.
             View task details, difficulty ratings, and model performance on each task.
           </p>
         </div>
 
         {/* Task Browser */}
-        <TaskBrowser
-          tasks={tasks}
-          results={results}
-          models={models}
-          taskDifficulty={taskDifficulty}
-        />
+        <TaskBrowser {...data} />
 
         {/* Footer */}
         <div className="mt-12 text-center text-sm text-muted-foreground">
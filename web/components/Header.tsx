@@ -38,6 +38,12 @@ export function Header() {
             >
               OSWorld
             </Link>
+            <Link
+              href="/compare"
+              className="text-sm font-medium text-muted-foreground transition-colors hover:text-foreground"
+            >
+              Compare
+            </Link>
             <ThemeToggle />
           </nav>
         </div>
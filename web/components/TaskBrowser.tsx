@@ -1,7 +1,10 @@
 'use client';
 
-import { useState, useMemo } from 'react';
-import { Task, Result, Model, TaskDifficulty } from '@/types/normalized';
+import { useState, useMemo, useEffect } from 'react';
+import { Task, Result, Model, TaskDifficulty, SearchIndexData, ShardIndex, TaskRecord, TaskSummary, TrajectoryStoreIndex } from '@/types/normalized';
+import { SearchIndex } from '@/lib/search-index';
+import { fetchSiteTasks, fetchTaskPage, fetchTaskRecord } from '@/lib/data-shards';
+import { fetchTaskSteps, fetchTrajectoryIndex, hasTrajectory } from '@/lib/trajectory-store';
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card';
 import { Badge } from '@/components/ui/badge';
 import { Input } from '@/components/ui/input';
@@ -9,11 +12,14 @@ import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from '@
 import { Button } from '@/components/ui/button';
 import { Check, X, Search, ChevronRight, ChevronLeft } from 'lucide-react';
 
+// Either the full task data, or the shard index of `normalize_data.py --shards`
+// output, in which case tasks are fetched as they are shown
 interface TaskBrowserProps {
-  tasks: Task[];
-  results: Result[];
   models: Model[];
-  taskDifficulty: TaskDifficulty[];
+  tasks?: Task[];
+  results?: Result[];
+  taskDifficulty?: TaskDifficulty[];
+  shardIndex?: ShardIndex;
 }
 
 type SiteFilter = 'all' | 'gitlab' | 'map' | 'reddit' | 'shopping' | 'shopping_admin' | 'wikipedia';
@@ -37,9 +43,34 @@ const DIFFICULTY_COLORS = {
   very_hard: 'bg-rose-100 dark:bg-rose-200 text-rose-800',
 };
 
+const SEARCH_INDEX_URL = '/data/search_index.json';
+
+// Must match PAGE_SIZE in scripts/shard_export.py
 const TASKS_PER_PAGE = 20;
 
-export default function TaskBrowser({ tasks, results, models, taskDifficulty }: TaskBrowserProps) {
+// Steps fetched per range request from the trajectory store
+const STEPS_PER_FETCH = 10;
+
+// Steps of one model on the expanded task; error when they cannot be loaded
+interface TrajectorySteps {
+  modelId: string;
+  steps: unknown[];
+  loading: boolean;
+  error?: string;
+}
+
+// Same shape as the page/site shards
+function toSummaries(tasks: Task[], taskDifficulty: TaskDifficulty[]): TaskSummary[] {
+  const byId = new Map(taskDifficulty.map(d => [d.id, d]));
+  return tasks.map(task => {
+    const difficulty = byId.get(task.id);
+    return difficulty
+      ? { ...task, success_count: difficulty.success_count, success_rate: difficulty.success_rate, difficulty: difficulty.difficulty }
+      : task;
+  });
+}
+
+export default function TaskBrowser({ tasks, results, models, taskDifficulty, shardIndex }: TaskBrowserProps) {
   const [selectedTaskId, setSelectedTaskId] = useState<number | null>(null);
   const [searchQuery, setSearchQuery] = useState('');
   const [siteFilter, setSiteFilter] = useState<SiteFilter>('all');
@@ -47,11 +78,89 @@ export default function TaskBrowser({ tasks, results, models, taskDifficulty }:
   const [sortOrder, setSortOrder] = useState<SortOrder>('id');
   const [currentPage, setCurrentPage] = useState(1);
 
+  // Full mode: every task summary up front
+  const allSummaries = useMemo(
+    () => (tasks ? toSummaries(tasks, taskDifficulty ?? []) : null),
+    [tasks, taskDifficulty],
+  );
+
+  // Sharded mode: unfiltered browsing reads one page shard at a time; filters,
+  // search and sorting need the site shards they cover, loaded once each
+  const [pageShard, setPageShard] = useState<TaskSummary[] | null>(null);
+  const [siteShards, setSiteShards] = useState<Record<string, TaskSummary[]>>({});
+  const sharded = allSummaries === null && shardIndex !== undefined;
+  const browsingPages = sharded && !searchQuery && siteFilter === 'all' && difficultyFilter === 'all' && sortOrder === 'id';
+  const neededSites = useMemo(() => {
+    if (!shardIndex) return [];
+    return siteFilter === 'all' ? Object.keys(shardIndex.sites) : [siteFilter].filter(site => site in shardIndex.sites);
+  }, [shardIndex, siteFilter]);
+
+  useEffect(() => {
+    if (!browsingPages || !shardIndex) return;
+    let cancelled = false;
+    setPageShard(null);
+    fetchTaskPage(shardIndex, currentPage)
+      .then(page => { if (!cancelled) setPageShard(page); })
+      .catch(error => console.error(error));
+    return () => { cancelled = true; };
+  }, [browsingPages, shardIndex, currentPage]);
+
+  useEffect(() => {
+    if (!sharded || browsingPages || !shardIndex) return;
+    const missing = neededSites.filter(site => !(site in siteShards));
+    if (missing.length === 0) return;
+    let cancelled = false;
+    Promise.all(missing.map(site => fetchSiteTasks(shardIndex, site)))
+      .then(loaded => {
+        if (cancelled) return;
+        setSiteShards(prev => {
+          const next = { ...prev };
+          missing.forEach((site, i) => { next[site] = loaded[i]; });
+          return next;
+        });
+      })
+      .catch(error => console.error(error));
+    return () => { cancelled = true; };
+  }, [sharded, browsingPages, shardIndex, neededSites, siteShards]);
+
+  // Summaries to filter and sort; null while their shards are loading
+  const candidates = useMemo(() => {
+    if (allSummaries) return allSummaries;
+    if (browsingPages || neededSites.some(site => !(site in siteShards))) return null;
+    return neededSites.flatMap(site => siteShards[site]);
+  }, [allSummaries, browsingPages, neededSites, siteShards]);
+
+  // Prebuilt index, fetched on the first search (null when search_index.json
+  // is unavailable; substring matching is used until it has loaded)
+  const [index, setIndex] = useState<SearchIndex | null | undefined>(undefined);
+  const searching = searchQuery !== '';
+  useEffect(() => {
+    if (!searching || index !== undefined) return;
+    let cancelled = false;
+    fetch(SEARCH_INDEX_URL)
+      .then(response => {
+        if (!response.ok) throw new Error(`Failed to load ${SEARCH_INDEX_URL}: ${response.status}`);
+        return response.json() as Promise<SearchIndexData>;
+      })
+      .then(data => { if (!cancelled) setIndex(new SearchIndex(data)); })
+      .catch(() => { if (!cancelled) setIndex(null); });
+    return () => { cancelled = true; };
+  }, [searching, index]);
+
+  // Task id -> relevance score for the current query
+  const searchScores = useMemo(() => {
+    if (!index || !searchQuery) return null;
+    const hits = index.search(searchQuery);
+    return hits === null ? null : new Map(hits.map(hit => [hit.taskId, hit.score]));
+  }, [index, searchQuery]);
+
   // Filter and sort tasks
   const filteredTasks = useMemo(() => {
-    const filtered = tasks.filter(task => {
+    const filtered = (candidates ?? []).filter(task => {
       // Search filter
-      if (searchQuery && !task.intent.toLowerCase().includes(searchQuery.toLowerCase())) {
+      if (searchScores) {
+        if (!searchScores.has(task.id)) return false;
+      } else if (searchQuery && !task.intent.toLowerCase().includes(searchQuery.toLowerCase())) {
         return false;
       }
 
@@ -61,26 +170,24 @@ export default function TaskBrowser({ tasks, results, models, taskDifficulty }:
       }
 
       // Difficulty filter
-      if (difficultyFilter !== 'all') {
-        const difficulty = taskDifficulty.find(t => t.id === task.id);
-        if (difficulty?.difficulty !== difficultyFilter) {
-          return false;
-        }
+      if (difficultyFilter !== 'all' && task.difficulty !== difficultyFilter) {
+        return false;
       }
 
       return true;
     });
 
-    // Sort tasks
+    // Sort tasks (best match first while searching, unless sorted by success rate)
     const sorted = [...filtered].sort((a, b) => {
       if (sortOrder === 'id') {
+        if (searchScores) {
+          return searchScores.get(b.id)! - searchScores.get(a.id)! || a.id - b.id;
+        }
         return a.id - b.id;
       }
 
-      const aDifficulty = taskDifficulty.find(t => t.id === a.id);
-      const bDifficulty = taskDifficulty.find(t => t.id === b.id);
-      const aRate = aDifficulty?.success_rate || 0;
-      const bRate = bDifficulty?.success_rate || 0;
+      const aRate = a.success_rate || 0;
+      const bRate = b.success_rate || 0;
 
       if (sortOrder === 'success_rate_asc') {
         return aRate - bRate;
@@ -90,22 +197,80 @@ export default function TaskBrowser({ tasks, results, models, taskDifficulty }:
     });
 
     return sorted;
-  }, [tasks, searchQuery, siteFilter, difficultyFilter, sortOrder, taskDifficulty]);
+  }, [candidates, searchQuery, searchScores, siteFilter, difficultyFilter, sortOrder]);
+
+  // Get results for selected task (from its task shard in sharded mode)
+  const [selectedRecord, setSelectedRecord] = useState<TaskRecord | null>(null);
+  useEffect(() => {
+    if (results || !shardIndex || selectedTaskId === null) return;
+    let cancelled = false;
+    fetchTaskRecord(shardIndex, selectedTaskId)
+      .then(record => { if (!cancelled) setSelectedRecord(record); })
+      .catch(error => console.error(error));
+    return () => { cancelled = true; };
+  }, [results, shardIndex, selectedTaskId]);
 
-  // Get results for selected task
-  const selectedTask = tasks.find(t => t.id === selectedTaskId);
   const selectedTaskResults = useMemo(() => {
-    if (!selectedTaskId) return [];
-    return results.filter(r => r.t === selectedTaskId);
-  }, [selectedTaskId, results]);
-
-  const selectedTaskDifficulty = taskDifficulty.find(t => t.id === selectedTaskId);
+    if (selectedTaskId === null) return [];
+    if (results) return results.filter(r => r.t === selectedTaskId);
+    return selectedRecord?.task.id === selectedTaskId ? selectedRecord.results : [];
+  }, [selectedTaskId, results, selectedRecord]);
+
+  // Trajectory store indexes, fetched once a task is expanded (null for a
+  // model without one), and the steps of one model on the selected task
+  const [storeIndexes, setStoreIndexes] = useState<Record<string, TrajectoryStoreIndex | null>>({});
+  const [trajectory, setTrajectory] = useState<TrajectorySteps | null>(null);
+
+  useEffect(() => {
+    setTrajectory(null);
+  }, [selectedTaskId]);
+
+  useEffect(() => {
+    if (selectedTaskId === null) return;
+    const missing = models.map(model => model.id).filter(id => !(id in storeIndexes));
+    if (missing.length === 0) return;
+    let cancelled = false;
+    Promise.all(missing.map(id => fetchTrajectoryIndex(id).catch(() => null)))
+      .then(loaded => {
+        if (cancelled) return;
+        setStoreIndexes(prev => {
+          const next = { ...prev };
+          missing.forEach((id, i) => { next[id] = loaded[i]; });
+          return next;
+        });
+      });
+    return () => { cancelled = true; };
+  }, [selectedTaskId, models, storeIndexes]);
+
+  // Stored steps of a model on a task (0 when there are none)
+  const stepCount = (modelId: string, taskId: number) => {
+    const index = storeIndexes[modelId];
+    return index && hasTrajectory(index, taskId) ? index.tasks[String(taskId)][1].length : 0;
+  };
+
+  const loadSteps = (modelId: string, taskId: number, loaded: unknown[] = []) => {
+    setTrajectory({ modelId, steps: loaded, loading: true });
+    fetchTaskSteps(storeIndexes[modelId]!, taskId, loaded.length, loaded.length + STEPS_PER_FETCH)
+      .then(more => ({ modelId, steps: [...loaded, ...more], loading: false }))
+      .catch((error: Error) => ({ modelId, steps: loaded, loading: false, error: error.message }))
+      .then(next => setTrajectory(current => (current?.modelId === modelId ? next : current)));
+  };
+
+  const toggleSteps = (modelId: string, taskId: number) => {
+    if (trajectory?.modelId === modelId) {
+      setTrajectory(null);
+    } else {
+      loadSteps(modelId, taskId);
+    }
+  };
 
   // Pagination calculations
-  const totalPages = Math.ceil(filteredTasks.length / TASKS_PER_PAGE);
+  const totalTasks = browsingPages ? shardIndex!.task_count : filteredTasks.length;
+  const loading = browsingPages ? pageShard === null : candidates === null;
+  const totalPages = Math.ceil(totalTasks / TASKS_PER_PAGE);
   const startIndex = (currentPage - 1) * TASKS_PER_PAGE;
   const endIndex = startIndex + TASKS_PER_PAGE;
-  const paginatedTasks = filteredTasks.slice(startIndex, endIndex);
+  const paginatedTasks = browsingPages ? (pageShard ?? []) : filteredTasks.slice(startIndex, endIndex);
 
   // Reset to page 1 when filters change
   useMemo(() => {
@@ -158,7 +323,7 @@ export default function TaskBrowser({ tasks, results, models, taskDifficulty }:
                   <SelectValue />
                 </SelectTrigger>
                 <SelectContent>
-                  <SelectItem value="id">Sort by ID</SelectItem>
+                  <SelectItem value="id">{searchScores ? 'Best Match' : 'Sort by ID'}</SelectItem>
                   <SelectItem value="success_rate_desc">Highest Success Rate</SelectItem>
                   <SelectItem value="success_rate_asc">Lowest Success Rate</SelectItem>
                 </SelectContent>
@@ -167,7 +332,9 @@ export default function TaskBrowser({ tasks, results, models, taskDifficulty }:
           </div>
 
           <div className="mt-4 text-sm text-muted-foreground">
-            Showing {startIndex + 1}-{Math.min(endIndex, filteredTasks.length)} of {filteredTasks.length} tasks
+            {loading
+              ? 'Loading tasks...'
+              : `Showing ${startIndex + 1}-${Math.min(endIndex, totalTasks)} of ${totalTasks} tasks`}
           </div>
         </CardContent>
       </Card>
@@ -175,7 +342,6 @@ export default function TaskBrowser({ tasks, results, models, taskDifficulty }:
       {/* Task List */}
       <div className="grid gap-3">
         {paginatedTasks.map(task => {
-          const difficulty = taskDifficulty.find(t => t.id === task.id);
           const isSelected = selectedTaskId === task.id;
 
           return (
@@ -197,14 +363,14 @@ export default function TaskBrowser({ tasks, results, models, taskDifficulty }:
                       <Badge variant="outline" className="text-xs">
                         {task.site}
                       </Badge>
-                      {difficulty && (
-                        <Badge className={`text-xs ${DIFFICULTY_COLORS[difficulty.difficulty]}`}>
-                          {difficulty.difficulty.replace('_', ' ')}
+                      {task.difficulty && (
+                        <Badge className={`text-xs ${DIFFICULTY_COLORS[task.difficulty]}`}>
+                          {task.difficulty.replace('_', ' ')}
                         </Badge>
                       )}
-                      {difficulty && (
+                      {task.difficulty && (
                         <span className="text-xs text-muted-foreground">
-                          {difficulty.success_count}/{models.length} models passed
+                          {task.success_count}/{models.length} models passed
                         </span>
                       )}
                     </div>
@@ -250,26 +416,70 @@ export default function TaskBrowser({ tasks, results, models, taskDifficulty }:
                                   ) : (
                                     <div className="w-4 h-4 rounded-full bg-gray-300 dark:bg-gray-700 flex-shrink-0" />
                                   )}
-                                  <span className="text-xs truncate">{model.name}</span>
+                                  <span className="text-xs truncate flex-1">{model.name}</span>
+                                  {stepCount(model.id, task.id) > 0 && (
+                                    <Button
+                                      variant={trajectory?.modelId === model.id ? 'default' : 'ghost'}
+                                      size="sm"
+                                      className="h-6 px-2 text-xs"
+                                      onClick={(e) => {
+                                        e.stopPropagation();
+                                        toggleSteps(model.id, task.id);
+                                      }}
+                                    >
+                                      Steps
+                                    </Button>
+                                  )}
                                 </div>
                               );
                             })}
                           </div>
                         </div>
 
+                        {/* Trajectory steps */}
+                        {trajectory && (
+                          <div className="cursor-auto" onClick={(e) => e.stopPropagation()}>
+                            <h4 className="text-xs font-semibold text-muted-foreground uppercase mb-2">
+                              Steps of {models.find(m => m.id === trajectory.modelId)?.name ?? trajectory.modelId}
+                              {` (${trajectory.steps.length} of ${stepCount(trajectory.modelId, task.id)})`}
+                            </h4>
+                            <div className="space-y-2">
+                              {trajectory.steps.map((step, i) => (
+                                <pre key={i} className="text-xs bg-muted/50 p-3 rounded font-mono overflow-auto max-h-64">
+                                  {JSON.stringify(step, null, 2)}
+                                </pre>
+                              ))}
+                              {trajectory.error && (
+                                <p className="text-sm text-muted-foreground">{trajectory.error}</p>
+                              )}
+                              {trajectory.loading ? (
+                                <p className="text-sm text-muted-foreground">Loading steps...</p>
+                              ) : trajectory.steps.length < stepCount(trajectory.modelId, task.id) && (
+                                <Button
+                                  variant="outline"
+                                  size="sm"
+                                  onClick={() => loadSteps(trajectory.modelId, task.id, trajectory.steps)}
+                                >
+                                  More steps
+                                </Button>
+                              )}
+                            </div>
+                          </div>
+                        )}
+
                         {/* Stats */}
-                        {selectedTaskDifficulty && (
+                        {task.difficulty && task.success_rate !== undefined && (
                           <div className="flex gap-4 text-sm">
                             <div className="bg-muted/50 px-3 py-2 rounded">
                               <span className="text-muted-foreground">Success Rate:</span>{' '}
                               <span className="font-semibold">
-                                {selectedTaskDifficulty.success_rate.toFixed(1)}%
+                                {task.success_rate.toFixed(1)}%
                               </span>
                             </div>
                             <div className="bg-muted/50 px-3 py-2 rounded">
                               <span className="text-muted-foreground">Difficulty:</span>{' '}
                               <span className="font-semibold capitalize">
-                                {selectedTaskDifficulty.difficulty.replace('_', ' ')}
+                                {task.difficulty.replace('_', ' ')}
                               </span>
                             </div>
                           </div>
@@ -291,7 +501,7 @@ export default function TaskBrowser({ tasks, results, models, taskDifficulty }:
         })}
       </div>
 
-      {filteredTasks.length === 0 && (
+      {!loading && totalTasks === 0 && (
         <Card>
           <CardContent className="py-12 text-center">
             <p className="text-muted-foreground">
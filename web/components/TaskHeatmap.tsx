@@ -1,18 +1,35 @@
 'use client';
 
-import { useState, useMemo } from 'react';
-import { HeatmapData, Model, TaskDifficulty } from '@/types/normalized';
+import { useState, useMemo, useEffect } from 'react';
+import { ClustersData, HeatmapData, Model, TaskDifficulty } from '@/types/normalized';
+import { fetchCompactResults } from '@/lib/compact-data';
+import { fetchClusters, groupStarts, orderedHeatmap, similarTasks } from '@/lib/clusters';
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card';
 import { Badge } from '@/components/ui/badge';
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from '@/components/ui/select';
 
 interface TaskHeatmapProps {
-  heatmapData: HeatmapData;
+  // Optional: without it the matrix is fetched from the compact export
+  heatmapData?: HeatmapData;
   models: Model[];
   taskDifficulty: TaskDifficulty[];
 }
 
 type DifficultyFilter = 'all' | 'easy' | 'medium' | 'hard' | 'very_hard';
+// Row order: task id, solve-pattern clusters, or clusters grouped by template
+type RowOrder = 'id' | 'cluster' | 'template';
+
+const EMPTY_HEATMAP: HeatmapData = { model_ids: [], task_ids: [], matrix: [] };
+
+// results_matrix.bin (2 bits per cell) when `--compact` output exists, else heatmap_data.json
+async function loadHeatmapData(): Promise<HeatmapData> {
+  try {
+    return (await fetchCompactResults()).toHeatmapData();
+  } catch {
+    const response = await fetch('/data/heatmap_data.json');
+    return response.json();
+  }
+}
 
 const DIFFICULTY_COLORS = {
   easy: 'bg-green-100 dark:bg-green-950',
@@ -21,8 +38,48 @@ const DIFFICULTY_COLORS = {
   very_hard: 'bg-red-100 dark:bg-red-950',
 };
 
-export default function TaskHeatmap({ heatmapData, models, taskDifficulty }: TaskHeatmapProps) {
+export default function TaskHeatmap({ heatmapData: initialData, models, taskDifficulty }: TaskHeatmapProps) {
+  const [loadedData, setLoadedData] = useState<HeatmapData | null>(null);
+  const baseData = initialData ?? loadedData ?? EMPTY_HEATMAP;
   const [difficultyFilter, setDifficultyFilter] = useState<DifficultyFilter>('all');
+  const [rowOrder, setRowOrder] = useState<RowOrder>('id');
+
+  // clusters.json, fetched when a clustered order is first chosen (null if unavailable)
+  const [clusters, setClusters] = useState<ClustersData | null | undefined>(undefined);
+  useEffect(() => {
+    if (rowOrder === 'id' || clusters !== undefined) return;
+    let cancelled = false;
+    fetchClusters()
+      .then(data => { if (!cancelled) setClusters(data); })
+      .catch(() => { if (!cancelled) setClusters(null); });
+    return () => { cancelled = true; };
+  }, [rowOrder, clusters]);
+
+  // The matrix in the chosen order, and the tasks that open a new group in it
+  const clustered = rowOrder !== 'id' && clusters ? clusters : null;
+  const heatmapData = useMemo(
+    () => (clustered ? orderedHeatmap(baseData, clustered, rowOrder === 'template') : baseData),
+    [baseData, clustered, rowOrder],
+  );
+  const groupStartIds = useMemo(
+    () => (clustered ? groupStarts(clustered, rowOrder === 'template') : null),
+    [clustered, rowOrder],
+  );
+  const clusterRows = useMemo(
+    () => (clusters ? new Map(clusters.task_ids.map((taskId, row) => [taskId, row])) : null),
+    [clusters],
+  );
+
+  useEffect(() => {
+    if (initialData) return;
+    let cancelled = false;
+    loadHeatmapData().then(data => {
+      if (!cancelled) setLoadedData(data);
+    });
+    return () => {
+      cancelled = true;
+    };
+  }, [initialData]);
   const [hoveredCell, setHoveredCell] = useState<{ task: number; model: string } | null>(null);
 
   // Filter tasks by difficulty
@@ -83,11 +140,26 @@ export default function TaskHeatmap({ heatmapData, models, taskDifficulty }: Tas
         <div>
           <h3 className="text-lg font-semibold">Task Performance Heatmap</h3>
           <p className="text-sm text-muted-foreground">
-            {filteredTaskIds.length} tasks × {heatmapData.model_ids.length} models
+            {baseData === EMPTY_HEATMAP
+              ? 'Loading results matrix...'
+              : `${filteredTaskIds.length} tasks × ${heatmapData.model_ids.length} models`}
+            {rowOrder !== 'id' && clusters === undefined && ' (loading clusters...)'}
+            {rowOrder !== 'id' && clusters === null && ' (clusters.json unavailable, ordered by task id)'}
           </p>
         </div>
 
         <div className="flex items-center gap-4">
+          <Select value={rowOrder} onValueChange={(v) => setRowOrder(v as RowOrder)}>
+            <SelectTrigger className="w-[180px]">
+              <SelectValue />
+            </SelectTrigger>
+            <SelectContent>
+              <SelectItem value="id">Order by Task ID</SelectItem>
+              <SelectItem value="cluster">Order by Cluster</SelectItem>
+              <SelectItem value="template">Order by Template</SelectItem>
+            </SelectContent>
+          </Select>
+
           <Select value={difficultyFilter} onValueChange={(v) => setDifficultyFilter(v as DifficultyFilter)}>
             <SelectTrigger className="w-[180px]">
               <SelectValue placeholder="Filter by difficulty" />
@@ -146,7 +218,12 @@ export default function TaskHeatmap({ heatmapData, models, taskDifficulty }: Tas
                 if (taskIndex === -1) return null;
 
                 return (
-                  <div key={taskId} className="flex gap-4 items-center group">
+                  <div
+                    key={taskId}
+                    className={`flex gap-4 items-center group ${
+                      groupStartIds?.has(taskId) ? 'border-t border-primary/40 pt-0.5' : ''
+                    }`}
+                  >
                     {/* Task ID */}
                     <div className="w-16 flex-shrink-0 text-right">
                       <Badge
@@ -231,6 +308,15 @@ export default function TaskHeatmap({ heatmapData, models, taskDifficulty }: Tas
                 <p className="text-xs text-muted-foreground mt-1">
                   Model: {getModel(hoveredCell.model)?.name}
                 </p>
+                {clusters && clusterRows?.has(hoveredCell.task) && (
+                  <p className="text-xs text-muted-foreground mt-1">
+                    Similar tasks:{' '}
+                    {similarTasks(clusters, clusterRows.get(hoveredCell.task)!)
+                      .slice(0, 5)
+                      .map(neighbor => `#${neighbor.taskId} (${Math.round(neighbor.similarity * 100)}%)`)
+                      .join(', ')}
+                  </p>
+                )}
               </div>
               <div className="text-right">
                 {(() => {
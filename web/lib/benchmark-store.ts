@@ -0,0 +1,24 @@
+// Lookups over the multi-benchmark store written by `scripts/benchmark_store.py`
+
+import { BenchmarkComparison, BenchmarkEntry, BenchmarkModel, BenchmarkStore } from '@/types/normalized';
+
+export function benchmarkEntries(store: BenchmarkStore, benchmarkId: string): BenchmarkEntry[] {
+  return (store.index.by_benchmark[benchmarkId] ?? []).map((i) => store.entries[i]);
+}
+
+export function modelEntries(store: BenchmarkStore, modelId: string): BenchmarkEntry[] {
+  return (store.index.by_model[modelId] ?? []).map((i) => store.entries[i]);
+}
+
+// Models listed on at least `minBenchmarks` leaderboards, most widely evaluated first
+export function crossBenchmarkModels(store: BenchmarkStore, minBenchmarks = 2): BenchmarkModel[] {
+  return store.models
+    .filter((model) => model.benchmarks.length >= minBenchmarks)
+    .sort((a, b) => b.benchmarks.length - a.benchmarks.length);
+}
+
+export function comparison(store: BenchmarkStore, a: string, b: string): BenchmarkComparison | undefined {
+  return store.comparisons.find(
+    (c) => (c.benchmarks[0] === a && c.benchmarks[1] === b) || (c.benchmarks[0] === b && c.benchmarks[1] === a)
+  );
+}
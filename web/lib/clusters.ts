@@ -0,0 +1,76 @@
+// Heatmap orderings from `clusters.json`, written by `scripts/clustering.py`
+
+import { ClustersData, HeatmapData } from '@/types/normalized';
+
+export const CLUSTERS_URL = '/data/clusters.json';
+
+export async function fetchClusters(): Promise<ClustersData> {
+  const response = await fetch(CLUSTERS_URL);
+  if (!response.ok) {
+    throw new Error(`Failed to load ${CLUSTERS_URL}: ${response.status}`);
+  }
+  return response.json();
+}
+
+// Indexes of `ids` in the order of `order`, then any ids the order does not cover
+function permutation<T>(ids: T[], order: T[]): number[] {
+  const indexOf = new Map(ids.map((id, i) => [id, i]));
+  const result = order.flatMap((id) => (indexOf.has(id) ? [indexOf.get(id)!] : []));
+  const covered = new Set(result);
+  ids.forEach((_, i) => { if (!covered.has(i)) result.push(i); });
+  return result;
+}
+
+// heatmap_data.json with rows and columns permuted into clustered order.
+// byTemplate groups rows by intent template (see templateBands). Rows and
+// columns are matched by id, so the matrix may come from the compact export.
+export function orderedHeatmap(heatmap: HeatmapData, clusters: ClustersData, byTemplate = false): HeatmapData {
+  const taskOrder = (byTemplate ? clusters.template_order : clusters.task_order).map((row) => clusters.task_ids[row]);
+  const rows = permutation(heatmap.task_ids, taskOrder);
+  const cols = permutation(heatmap.model_ids, clusters.model_order.map((col) => clusters.model_ids[col]));
+  return {
+    task_ids: rows.map((row) => heatmap.task_ids[row]),
+    model_ids: cols.map((col) => heatmap.model_ids[col]),
+    matrix: rows.map((row) => cols.map((col) => heatmap.matrix[row][col])),
+  };
+}
+
+// Row ranges of the template groups of orderedHeatmap(..., true)
+export function templateBands(clusters: ClustersData): { templateId: number | null; start: number; count: number }[] {
+  let start = 0;
+  return clusters.template_ids.map((templateId, i) => {
+    const band = { templateId, start, count: clusters.template_sizes[i] };
+    start += band.count;
+    return band;
+  });
+}
+
+// Task ids that open a new group (solve-pattern cluster, or template with
+// byTemplate) in the order of orderedHeatmap
+export function groupStarts(clusters: ClustersData, byTemplate = false): Set<number> {
+  if (byTemplate) {
+    return new Set(templateBands(clusters)
+      .filter((band) => band.count > 0)
+      .map((band) => clusters.task_ids[clusters.template_order[band.start]]));
+  }
+  const starts = new Set<number>();
+  clusters.task_order.forEach((row, i) => {
+    if (i === 0 || clusters.task_clusters[row] !== clusters.task_clusters[clusters.task_order[i - 1]]) {
+      starts.add(clusters.task_ids[row]);
+    }
+  });
+  return starts;
+}
+
+// Most similar tasks of a heatmap row, most similar first
+export function similarTasks(clusters: ClustersData, row: number): { taskId: number; similarity: number }[] {
+  const k = clusters.neighbors;
+  const result = [];
+  for (let i = row * k; i < (row + 1) * k; i++) {
+    result.push({
+      taskId: clusters.task_ids[clusters.task_neighbors[i]],
+      similarity: clusters.task_neighbor_similarity[i] / clusters.similarity_scale,
+    });
+  }
+  return result;
+}
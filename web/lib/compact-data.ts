@@ -0,0 +1,82 @@
+// Decoder for the compact results export written by `normalize_data.py --compact`
+//
+// results_matrix.bin stores every task × model cell as a 2-bit code,
+// four cells per byte (low bits first), row-major with one row per task.
+// results_matrix.json holds the row/column id tables.
+
+import { CompactMatrixMeta, HeatmapData, Result } from '@/types/normalized';
+
+export const CELL_MISSING = 0;
+export const CELL_FAIL = 1;
+export const CELL_PASS = 2;
+export const CELL_UNSCORED = 3;
+
+export class CompactResults {
+  readonly meta: CompactMatrixMeta;
+  private readonly bytes: Uint8Array;
+  private readonly rowIndex: Map<number, number>;
+
+  constructor(meta: CompactMatrixMeta, bytes: Uint8Array) {
+    this.meta = meta;
+    this.bytes = bytes;
+    this.rowIndex = new Map(meta.task_ids.map((taskId, row): [number, number] => [taskId, row]));
+  }
+
+  cell(row: number, col: number): number {
+    const i = row * this.meta.cols + col;
+    return (this.bytes[i >> 2] >> ((i & 3) * 2)) & 3;
+  }
+
+  rowOf(taskId: number): number | undefined {
+    return this.rowIndex.get(taskId);
+  }
+
+  // Results for one task, equivalent to results.filter(r => r.t === taskId)
+  resultsForTask(taskId: number): Result[] {
+    const row = this.rowOf(taskId);
+    if (row === undefined) return [];
+
+    const results: Result[] = [];
+    this.meta.model_ids.forEach((modelId, col) => {
+      const value = this.cell(row, col);
+      if (value !== CELL_MISSING) {
+        results.push({ t: taskId, m: modelId, s: value === CELL_PASS ? 1 : 0 });
+      }
+    });
+    return results;
+  }
+
+  // Rebuild heatmap_data.json (suite tasks only; unscored cells become null)
+  toHeatmapData(): HeatmapData {
+    const { suite_size, cols } = this.meta;
+    const matrix: (number | null)[][] = [];
+    for (let row = 0; row < suite_size; row++) {
+      const values: (number | null)[] = new Array(cols);
+      for (let col = 0; col < cols; col++) {
+        const value = this.cell(row, col);
+        values[col] = value === CELL_PASS ? 1 : value === CELL_FAIL ? 0 : null;
+      }
+      matrix.push(values);
+    }
+    return {
+      model_ids: this.meta.model_ids,
+      task_ids: this.meta.task_ids.slice(0, suite_size),
+      matrix,
+    };
+  }
+}
+
+async function fetchOk(url: string): Promise<Response> {
+  const response = await fetch(url);
+  if (!response.ok) {
+    throw new Error(`Failed to load ${url}: ${response.status}`);
+  }
+  return response;
+}
+
+// Rejects when the compact export is missing (it is only written with --compact)
+export async function fetchCompactResults(baseUrl = '/data'): Promise<CompactResults> {
+  const meta: CompactMatrixMeta = await fetchOk(`${baseUrl}/results_matrix.json`).then(r => r.json());
+  const buffer = await fetchOk(`${baseUrl}/${meta.file}`).then(r => r.arrayBuffer());
+  return new CompactResults(meta, new Uint8Array(buffer));
+}
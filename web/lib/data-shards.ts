@@ -0,0 +1,36 @@
+// Fetch helpers for the lazy-loading shards written by `normalize_data.py --shards`
+
+import { ModelVector, ShardIndex, TaskRecord, TaskSummary } from '@/types/normalized';
+
+const SHARDS_URL = '/data/shards';
+
+async function fetchShard<T>(file: string): Promise<T> {
+  const response = await fetch(`${SHARDS_URL}/${file}`);
+  if (!response.ok) {
+    throw new Error(`Failed to load shard ${file}: ${response.status}`);
+  }
+  return response.json();
+}
+
+export function fetchShardIndex(): Promise<ShardIndex> {
+  return fetchShard<ShardIndex>('index.json');
+}
+
+// page is 1-based, matching the task browser pagination
+export function fetchTaskPage(index: ShardIndex, page: number): Promise<TaskSummary[]> {
+  const entry = index.pages[page - 1];
+  return entry ? fetchShard<TaskSummary[]>(entry.file) : Promise.resolve([]);
+}
+
+export function fetchSiteTasks(index: ShardIndex, site: string): Promise<TaskSummary[]> {
+  const entry = index.sites[site];
+  return entry ? fetchShard<TaskSummary[]>(entry.file) : Promise.resolve([]);
+}
+
+export function fetchTaskRecord(index: ShardIndex, taskId: number): Promise<TaskRecord> {
+  return fetchShard<TaskRecord>(index.task_file.replace('{id}', String(taskId)));
+}
+
+export function fetchModelVector(index: ShardIndex, modelId: string): Promise<ModelVector> {
+  return fetchShard<ModelVector>(index.models[modelId]);
+}
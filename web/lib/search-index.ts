@@ -0,0 +1,106 @@
+// Client for the prebuilt task search index (search_index.json)
+//
+// Built by scripts/search_index.py: a sorted vocabulary with one
+// delta-encoded postings list per term. Every query token is matched as a
+// prefix of index terms (exact matches score higher) and documents must
+// match all tokens. Postings are decoded once into typed arrays.
+
+import { SearchIndexData } from '@/types/normalized';
+
+// Must match tokenize() in scripts/search_index.py (Unicode \w)
+const TOKEN = new RegExp('[\\p{L}\\p{N}_]+', 'gu');
+
+// Score multiplier for terms that only match a query token as a prefix
+const PREFIX_WEIGHT = 0.5;
+
+export function tokenize(text: string): string[] {
+  return text.toLowerCase().match(TOKEN) ?? [];
+}
+
+export interface SearchHit {
+  taskId: number;
+  score: number;
+}
+
+export class SearchIndex {
+  private readonly docIds: number[];
+  private readonly terms: string[];
+  private readonly docs: Int32Array[];
+  private readonly scores: Int32Array[];
+
+  constructor(data: SearchIndexData) {
+    this.docIds = data.doc_ids;
+    this.terms = data.terms;
+    this.docs = [];
+    this.scores = [];
+
+    for (const flat of data.postings) {
+      const docs = new Int32Array(flat.length / 2);
+      const scores = new Int32Array(flat.length / 2);
+      let doc = 0;
+      for (let i = 0; i < docs.length; i++) {
+        doc += flat[2 * i];
+        docs[i] = doc;
+        scores[i] = flat[2 * i + 1];
+      }
+      this.docs.push(docs);
+      this.scores.push(scores);
+    }
+  }
+
+  // First term index whose value is >= key
+  private lowerBound(key: string): number {
+    let lo = 0;
+    let hi = this.terms.length;
+    while (lo < hi) {
+      const mid = (lo + hi) >> 1;
+      if (this.terms[mid] < key) lo = mid + 1;
+      else hi = mid;
+    }
+    return lo;
+  }
+
+  // Best score per document for terms starting with token
+  private matchToken(token: string): Map<number, number> {
+    const matched = new Map<number, number>();
+    for (let t = this.lowerBound(token); t < this.terms.length && this.terms[t].startsWith(token); t++) {
+      const weight = this.terms[t] === token ? 1 : PREFIX_WEIGHT;
+      const docs = this.docs[t];
+      const scores = this.scores[t];
+      for (let i = 0; i < docs.length; i++) {
+        const score = scores[i] * weight;
+        if (score > (matched.get(docs[i]) ?? 0)) matched.set(docs[i], score);
+      }
+    }
+    return matched;
+  }
+
+  // Ranked matches for a query; null if the query has no searchable tokens
+  search(query: string, limit?: number): SearchHit[] | null {
+    const tokens = tokenize(query);
+    if (tokens.length === 0) return null;
+
+    let totals = this.matchToken(tokens[0]);
+    for (const token of tokens.slice(1)) {
+      if (totals.size === 0) break;
+      const matched = this.matchToken(token);
+      const next = new Map<number, number>();
+      totals.forEach((score, doc) => {
+        const other = matched.get(doc);
+        if (other !== undefined) next.set(doc, score + other);
+      });
+      totals = next;
+    }
+
+    const hits: SearchHit[] = [];
+    totals.forEach((score, doc) => hits.push({ taskId: this.docIds[doc], score }));
+    hits.sort((a, b) => b.score - a.score || a.taskId - b.taskId);
+    return limit === undefined ? hits : hits.slice(0, limit);
+  }
+
+  // Task ids matching a query; null if the query has no searchable tokens
+  matchingTaskIds(query: string): Set<number> | null {
+    const hits = this.search(query);
+    return hits === null ? null : new Set(hits.map(hit => hit.taskId));
+  }
+}
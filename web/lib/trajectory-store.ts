@@ -0,0 +1,61 @@
+// Range-request reader for the trajectory store written by `scripts/trajectory_store.py`.
+// The store is packed into data/trajectory_store/ by default, outside web/public, so
+// either pack a copy with `--store-dir web/public/data/trajectories` (the default URL
+// below) or set NEXT_PUBLIC_TRAJECTORY_STORE_URL to `trajectory_store.py serve`, e.g.
+// http://127.0.0.1:8765. Any host that honours Range headers works.
+
+import { TrajectoryStoreIndex } from '@/types/normalized';
+
+const STORE_URL = (process.env.NEXT_PUBLIC_TRAJECTORY_STORE_URL ?? '/data/trajectories').replace(/\/$/, '');
+
+export async function fetchTrajectoryIndex(modelId: string): Promise<TrajectoryStoreIndex> {
+  const response = await fetch(`${STORE_URL}/${encodeURIComponent(modelId)}.index.json`);
+  if (!response.ok) {
+    throw new Error(`Failed to load trajectory index for ${modelId}: ${response.status}`);
+  }
+  return response.json();
+}
+
+export function hasTrajectory(index: TrajectoryStoreIndex, taskId: number | string): boolean {
+  return String(taskId) in index.tasks;
+}
+
+// Steps are zlib streams, i.e. the 'deflate' format of DecompressionStream
+async function inflateStep(bytes: Uint8Array): Promise<unknown> {
+  const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('deflate'));
+  return JSON.parse(await new Response(stream).text());
+}
+
+// Steps [start, stop) of one task, fetched with a single range request
+export async function fetchTaskSteps(
+  index: TrajectoryStoreIndex,
+  taskId: number | string,
+  start = 0,
+  stop?: number,
+): Promise<unknown[]> {
+  const entry = index.tasks[String(taskId)];
+  if (!entry) {
+    return [];
+  }
+  const [offset, sizes] = entry;
+  const end = Math.min(stop ?? sizes.length, sizes.length);
+  const first = offset + sizes.slice(0, start).reduce((sum, size) => sum + size, 0);
+  const length = sizes.slice(start, end).reduce((sum, size) => sum + size, 0);
+  if (length === 0) {
+    return [];
+  }
+
+  const response = await fetch(`${STORE_URL}/${encodeURIComponent(index.blob)}`, {
+    headers: { Range: `bytes=${first}-${first + length - 1}` },
+  });
+  if (response.status !== 206) {
+    throw new Error(`Range request for ${index.model} task ${taskId} failed: ${response.status}`);
+  }
+  const bytes = new Uint8Array(await response.arrayBuffer());
+  let position = 0;
+  return Promise.all(sizes.slice(start, end).map((size) => {
+    const step = bytes.subarray(position, position + size);
+    position += size;
+    return inflateStep(step);
+  }));
+}
@@ -60,3 +60,194 @@ export interface HeatmapData {
   task_ids: number[];
   matrix: (number | null)[][];
 }
+
+export interface CompactMatrixMeta {
+  version: number;
+  file: string;        // packed 2-bit cell file, e.g. results_matrix.bin
+  rows: number;
+  cols: number;
+  suite_size: number;  // rows [0, suite_size) are benchmark tasks
+  task_ids: number[];
+  model_ids: string[];
+}
+
+// Lazy-loading shards written by `normalize_data.py --shards`
+
+export interface TaskSummary extends Task {
+  success_count?: number;
+  success_rate?: number;
+  difficulty?: TaskDifficulty['difficulty'];
+}
+
+export interface TaskRecord {
+  task: Task;
+  difficulty: TaskDifficulty | null;
+  results: Omit<Result, 't'>[];
+}
+
+export interface ModelVector {
+  id: string;
+  values: (number | null)[];  // aligned with ShardIndex.task_ids
+}
+
+export interface ShardIndex {
+  version: number;
+  page_size: number;
+  task_count: number;
+  task_ids: number[];
+  pages: { file: string; first_id: number; last_id: number; count: number }[];
+  sites: Record<string, { file: string; count: number }>;
+  task_file: string;  // pattern with an {id} placeholder
+  models: Record<string, string>;
+}
+
+export interface SearchIndexData {
+  version: number;
+  doc_ids: number[];      // task id of each document
+  terms: string[];        // sorted vocabulary
+  postings: number[][];   // per term: [doc delta, score, doc delta, score, ...]
+}
+
+// Multi-benchmark store (benchmarks.json, scripts/benchmark_store.py)
+
+export interface BenchmarkAggregates {
+  models: number;
+  open_models: number;
+  best: { model: string; success_rate: number } | null;
+  best_open: { model: string; success_rate: number } | null;
+  human: number | null;
+  gap_to_human: number | null;
+  mean: number | null;
+  median: number | null;
+}
+
+export interface BenchmarkInfo {
+  id: string;
+  name: string;
+  description: string | null;
+  total_tasks: number | null;
+  updated: string | null;
+  details: Record<string, unknown>;  // environments, applications, domains, ...
+  skipped_rows: number;
+  aggregates: BenchmarkAggregates;
+}
+
+export interface BenchmarkModel {
+  id: string;
+  name: string;
+  aliases: string[];
+  organization: string | null;
+  organization_type: string | null;
+  llm: string | null;
+  open: boolean | null;
+  is_human: boolean;
+  trajectory_model_id: string | null;  // id in models.json, if it has trajectories
+  benchmarks: string[];
+}
+
+export interface BenchmarkEntry {
+  benchmark: string;
+  model: string;        // BenchmarkModel id
+  name: string;         // name as listed on that leaderboard
+  rank: number | null;  // null for human baselines
+  success_rate: number;
+  date: string | null;
+  open: boolean | null;
+  size_b: string | null;
+  note: string | null;
+  is_human: boolean;
+}
+
+export interface BenchmarkComparison {
+  benchmarks: [string, string];
+  models: ({ model: string } & Record<string, number | string>)[];
+  spearman: number | null;
+}
+
+export interface BenchmarkStore {
+  version: number;
+  benchmarks: BenchmarkInfo[];
+  models: BenchmarkModel[];
+  entries: BenchmarkEntry[];
+  index: {
+    by_benchmark: Record<string, number[]>;  // positions in entries
+    by_model: Record<string, number[]>;
+  };
+  scores: Record<string, Record<string, number>>;  // model -> benchmark -> best rate
+  comparisons: BenchmarkComparison[];
+}
+
+// Bootstrap intervals and pairwise significance (analytics.json, scripts/analytics.py)
+
+export type Interval = [number | null, number | null];  // [low, high] success rate %
+
+export interface DomainInterval extends DomainStats {
+  ci: Interval;
+}
+
+export interface ModelAnalytics {
+  id: string;
+  successes: number;
+  total: number;
+  rate: number | null;
+  ci: Interval;
+  domains: Record<string, DomainInterval>;
+}
+
+export interface PairAnalytics {
+  a: string;
+  b: string;
+  rate_diff: number | null;   // a's rate - b's rate, in points
+  ci: Interval;               // paired bootstrap interval of rate_diff
+  bootstrap_p: number | null;
+  a_only: number;             // tasks a passes and b fails
+  b_only: number;
+  mcnemar_p: number;
+  mcnemar_p_holm: number;     // adjusted across all pairs
+  significant: boolean;       // mcnemar_p_holm < alpha
+}
+
+export interface AnalyticsData {
+  version: number;
+  resamples: number;
+  confidence: number;  // percent
+  alpha: number;
+  seed: number;
+  models: ModelAnalytics[];
+  pairs: PairAnalytics[];
+}
+
+// Similarity orders for the heatmap (clusters.json, scripts/clustering.py).
+// Row and column indices refer to heatmap_data.json's task_ids / model_ids.
+
+export interface ClustersData {
+  version: number;
+  task_ids: number[];
+  model_ids: string[];
+  cluster_distance: number;          // tree cut for task_clusters
+  task_order: number[];              // rows, clustered by solve pattern
+  task_clusters: number[];           // per row, numbered along task_order
+  template_order: number[];          // rows grouped by template, in clustered order
+  template_ids: (number | null)[];   // template of each group in template_order
+  template_sizes: number[];          // rows per group
+  neighbors: number;                 // k
+  similarity_scale: number;
+  task_neighbors: number[];          // k most similar rows per row, flattened
+  task_neighbor_similarity: number[];  // similarity × similarity_scale, flattened
+  model_order: number[];             // columns, clustered
+  model_jaccard: (number | null)[][];
+  model_hamming: (number | null)[][];
+}
+
+// Random-access trajectory store (<model>.index.json, scripts/trajectory_store.py)
+
+export interface TrajectoryStoreIndex {
+  version: number;
+  model: string;
+  codec: 'zlib';                 // each step is its own zlib stream of minified JSON
+  max_string_chars: number;      // longer strings became "<omitted N chars>" (0 = kept)
+  generation: number;
+  blob: string;                  // blob file next to the index
+  size: number;                  // indexed bytes of the blob
+  tasks: Record<string, [number, number[]]>;  // task id -> [offset, compressed size of each step]
+}